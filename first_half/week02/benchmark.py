@@ -0,0 +1,139 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from incident_rules import IncidentDetector
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT = os.path.join(BASE_DIR, 'main.py')
+
+EVENTS = ['INFO', 'WARNING', 'ERROR']
+MESSAGES = [
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Navigation systems show nominal performance.',
+    'Second stage burn nominal. Rocket velocity increasing.',
+    'Heat shield performing as expected during reentry.',
+    'Oxygen tank unstable.',
+    'Oxygen tank explosion.',
+]
+
+def generate_synthetic_log(file_path, line_count, seed=42):
+    # 'timestamp,event,message' 형식의 임의 로그를 line_count 줄 생성
+    rng = random.Random(seed)
+    base = time.mktime((2023, 8, 27, 0, 0, 0, 0, 0, -1))
+    chunk = []
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        for _ in range(line_count):
+            ts = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(base + rng.randrange(86400 * 30)))
+            chunk.append(f'{ts},{rng.choice(EVENTS)},{rng.choice(MESSAGES)}\n')
+            if len(chunk) >= 100_000:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+def run_mode(log_path, work_dir, extra_args):
+    # main.py를 자식 프로세스로 실행해 경과 시간과 최대 RSS(MB)를 측정
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, MAIN_SCRIPT, log_path, *extra_args],
+                            cwd=work_dir, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f'main.py {extra_args} 실행 실패 (status={status})')
+    # Linux에서 ru_maxrss 단위는 KB
+    return elapsed, usage.ru_maxrss / 1024
+
+def read_outputs(work_dir):
+    outputs = []
+    for name in ('log_analysis.md', 'fatal_logs.md'):
+        with open(os.path.join(work_dir, name), 'rb') as f:
+            outputs.append(f.read())
+    return outputs
+
+def benchmark_modes(line_counts, include_serial, worker_counts, include_cache):
+    with tempfile.TemporaryDirectory() as work_dir:
+        for line_count in line_counts:
+            log_path = os.path.join(work_dir, f'synthetic_{line_count}.log')
+            generate_synthetic_log(log_path, line_count)
+            size_mb = os.path.getsize(log_path) / (1024 * 1024)
+            print(f'>> {line_count:,} lines ({size_mb:.1f} MB)')
+
+            modes = [('stream', ['--stream'])]
+            if include_serial:
+                modes.insert(0, ('serial', []))
+            for workers in worker_counts:
+                modes.append((f'par x{workers}', ['--workers', str(workers)]))
+            if include_cache:
+                # 첫 실행은 캐시 생성, 두 번째 실행은 캐시 재사용
+                modes.append(('cache-1', ['--cache']))
+                modes.append(('cache-2', ['--cache']))
+
+            expected = None
+            for name, extra_args in modes:
+                elapsed, peak_mb = run_mode(log_path, work_dir, extra_args)
+                # 모든 모드의 결과 파일이 첫 번째 모드와 바이트 단위로 같은지 확인
+                outputs = read_outputs(work_dir)
+                expected = expected or outputs
+                same = 'identical' if outputs == expected else 'DIFFERENT'
+                print(f'   {name:<8} {elapsed:8.2f} s   peak RSS {peak_mb:8.1f} MB   {same}')
+            os.remove(log_path)
+            if os.path.exists(log_path + '.colcache'):
+                os.remove(log_path + '.colcache')
+
+def make_rule_classes(rule_count, class_count=3, seed=7):
+    # rule_count개의 임의 키워드를 class_count개의 분류에 나눠 담는다
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    rule_classes = [{'name': f'class{i}', 'report': f'class{i}.md', 'title': f'class{i}',
+                     'keywords': [], 'patterns': []} for i in range(class_count)]
+    rule_classes[0]['keywords'].append('oxygen tank')
+    for i in range(rule_count - 1):
+        word = ''.join(rng.choice(letters) for _ in range(rng.randint(5, 10)))
+        rule_classes[i % class_count]['keywords'].append(f'{word} {rng.choice(letters)}')
+    return rule_classes
+
+def naive_classify(rule_classes, message):
+    # 키워드마다 부분 문자열 검사를 한 번씩 하는 기존 방식
+    lowered = message.lower()
+    return tuple(i for i, rule_class in enumerate(rule_classes)
+                 if any(keyword in lowered for keyword in rule_class['keywords']))
+
+def benchmark_rules(rule_counts, message_count=200_000):
+    rng = random.Random(1)
+    messages = [rng.choice(MESSAGES) for _ in range(message_count)]
+    for rule_count in rule_counts:
+        rule_classes = make_rule_classes(rule_count)
+        detector = IncidentDetector(rule_classes)
+
+        start = time.perf_counter()
+        naive_result = [naive_classify(rule_classes, message) for message in messages]
+        naive_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detector_result = [detector.classify(message) for message in messages]
+        detector_elapsed = time.perf_counter() - start
+
+        same = 'identical' if naive_result == detector_result else 'DIFFERENT'
+        print(f'>> {rule_count:>4} rules  naive {naive_elapsed:6.3f} s   '
+              f'one-pass {detector_elapsed:6.3f} s   x{naive_elapsed / detector_elapsed:5.1f}   {same}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='로그 분석기 벤치마크')
+    parser.add_argument('--lines', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--serial', action='store_true', help='기존 메모리 정렬 방식도 함께 측정')
+    parser.add_argument('--workers', type=int, nargs='*', default=[],
+                        help='병렬 모드를 측정할 워커 수 목록 (예: 1 2 4 8)')
+    parser.add_argument('--cache', action='store_true', help='컬럼형 캐시 모드(생성/재사용)도 함께 측정')
+    parser.add_argument('--rules', type=int, nargs='*', default=None,
+                        help='로그 분석 대신 규칙 수별 매칭 속도를 측정 (예: 10 100 500)')
+    args = parser.parse_args()
+    if args.rules is not None:
+        benchmark_rules(args.rules or [10, 100, 500])
+    else:
+        benchmark_modes(args.lines, args.serial, args.workers, args.cache)
@@ -0,0 +1,122 @@
+import configparser
+import re
+
+RULES_FILE_NAME = 'incident_rules.ini'
+TABLE_HEADER = [
+    "| 시간 | 이벤트 | 메시지 |",
+    "|------|--------|--------|",
+]
+
+# 규칙 파일이 없을 때 사용하는 기본 규칙 (기존 'oxygen tank' 필터와 동일)
+DEFAULT_RULE_CLASSES = [
+    {
+        'name': 'fatal',
+        'report': 'fatal_logs.md',
+        'title': '산소 탱크 관련 로그 분석',
+        'keywords': ['oxygen tank'],
+        'patterns': [],
+    },
+]
+
+def build_keyword_pattern(keywords):
+    # 키워드들을 접두사 트리(trie)로 묶어 하나의 정규식으로 만든다
+    # 'oxygen tank|oxygen leak' -> 'oxygen\ (?:tank|leak)' 처럼 공통 접두사를 한 번만 비교하게 된다
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[''] = {} # 키워드 끝 표시
+
+    def to_pattern(node):
+        alternatives = []
+        is_end = False
+        for char, child in sorted(node.items()):
+            if char == '':
+                is_end = True
+            else:
+                alternatives.append(re.escape(char) + to_pattern(child))
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if is_end:
+            body = '(?:' + body + ')?'
+        return body
+
+    return to_pattern(trie)
+
+class IncidentDetector:
+    # 여러 심각도 분류(class)의 키워드/정규식을 하나의 정규식으로 합쳐 줄마다 한 번만 검사
+    # 메시지는 한 번만 소문자로 바꾼 뒤 검사한다 (re.IGNORECASE는 합쳐진 정규식을 크게 느리게 만든다)
+    def __init__(self, rule_classes):
+        if not rule_classes:
+            raise ValueError('규칙 분류가 하나 이상 필요합니다.')
+        self.rule_classes = rule_classes
+        class_sources = []
+        for rule_class in rule_classes:
+            if not rule_class['keywords'] and not rule_class['patterns']:
+                raise ValueError(f"'{rule_class['name']}' 분류에 키워드나 정규식이 없습니다.")
+            class_sources.append(self._build_source(rule_class['keywords'], rule_class['patterns']))
+        self.class_patterns = [re.compile(source) for source in class_sources]
+
+        all_keywords = [keyword for rule_class in rule_classes for keyword in rule_class['keywords']]
+        all_patterns = [pattern for rule_class in rule_classes for pattern in rule_class['patterns']]
+        self.combined_pattern = re.compile(self._build_source(all_keywords, all_patterns))
+
+    @staticmethod
+    def _build_source(keywords, patterns):
+        parts = []
+        if keywords:
+            parts.append(build_keyword_pattern(keywords))
+        parts.extend(f'(?:{pattern})' for pattern in patterns)
+        return '|'.join(parts)
+
+    def classify(self, message):
+        # 메시지가 해당하는 분류의 인덱스 튜플을 반환 (대부분의 줄은 합쳐진 정규식 한 번으로 끝난다)
+        lowered = message.lower()
+        if not self.combined_pattern.search(lowered):
+            return ()
+        if len(self.class_patterns) == 1:
+            return (0,)
+        return tuple(i for i, pattern in enumerate(self.class_patterns) if pattern.search(lowered))
+
+    def report_paths(self):
+        return [rule_class['report'] for rule_class in self.rule_classes]
+
+    def report_header(self, class_index):
+        return [f"## {self.rule_classes[class_index]['title']}", ""] + TABLE_HEADER
+
+def _split_lines(value):
+    return [line.strip() for line in value.splitlines() if line.strip()]
+
+def load_rules(file_path):
+    # INI 형식의 규칙 파일을 읽어 IncidentDetector를 만든다
+    # [분류 이름] 섹션마다 report, title, keywords(한 줄에 하나), patterns(한 줄에 하나)를 지정
+    parser = configparser.ConfigParser(interpolation=None)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        parser.read_file(f)
+
+    rule_classes = []
+    for name in parser.sections():
+        section = parser[name]
+        rule_classes.append({
+            'name': name,
+            'report': section.get('report', f'{name}_logs.md'),
+            'title': section.get('title', f'{name} 로그 분석'),
+            'keywords': _split_lines(section.get('keywords', '')),
+            'patterns': _split_lines(section.get('patterns', '')),
+        })
+    return IncidentDetector(rule_classes)
+
+def get_detector(file_path=None):
+    # 규칙 파일을 지정하지 않았고 기본 규칙 파일도 없으면 내장 기본 규칙을 사용
+    try:
+        return load_rules(file_path or RULES_FILE_NAME)
+    except FileNotFoundError:
+        if file_path:
+            print(f'규칙 파일을 찾을 수 없습니다: {file_path}')
+            exit(1)
+        return IncidentDetector(DEFAULT_RULE_CLASSES)
+    except (configparser.Error, re.error, ValueError) as e:
+        print(f'규칙 파일 형식이 올바르지 않습니다: {e}')
+        exit(1)
@@ -0,0 +1,243 @@
+import datetime
+import mmap
+import os
+import struct
+from array import array
+from operator import itemgetter
+
+from log_parser import MarkdownReportWriter, format_markdown_row, get_sort_key, parse_log_line
+
+CACHE_SUFFIX = '.colcache'
+CACHE_MAGIC = b'MLOGCOL1'
+WRITE_BUFFER_SIZE = 1 << 20
+
+# 헤더: magic, 원본 로그 크기, 원본 mtime(ns), inode, 행 수, 이벤트 종류 수, 이벤트 사전 바이트 수, 메시지 blob 바이트 수
+HEADER_FORMAT = '<8sQQQQIIQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+TIME_OF_DAY = [f'{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}' for s in range(86400)]
+
+BATCH_ROWS = 65536
+CLASS_CACHE_SIZE = 100_000
+
+# 컬럼 배치 (모두 8바이트 경계에 맞춤, 행은 timestamp 내림차순으로 저장)
+#   timestamps      int64 epoch 초      (q * rows)
+#   message_offsets 메시지 시작 위치     (Q * (rows + 1))
+#   event_codes     이벤트 사전 번호     (H * rows)
+#   event_table     길이(H) + UTF-8 이벤트 이름
+#   messages        UTF-8 메시지를 이어 붙인 blob
+
+class CacheUnsupported(Exception):
+    # 캐시로 표현할 수 없는 로그 (timestamp 형식이 다르거나 이벤트 종류가 너무 많음)
+    pass
+
+def get_cache_path(log_path):
+    return log_path + CACHE_SUFFIX
+
+def _align(size):
+    return (size + 7) & ~7
+
+def timestamp_to_epoch(timestamp, date_cache):
+    # 'YYYY-MM-DD HH:MM:SS' -> epoch 초 (strptime보다 훨씬 빠르다)
+    if len(timestamp) != 19 or timestamp[10] != ' ' or timestamp[13] != ':' or timestamp[16] != ':':
+        raise CacheUnsupported(f'지원하지 않는 timestamp 형식: {timestamp!r}')
+    date_part = timestamp[:10]
+    days = date_cache.get(date_part)
+    if days is None:
+        try:
+            days = datetime.date.fromisoformat(date_part).toordinal() - EPOCH_ORDINAL
+        except ValueError:
+            raise CacheUnsupported(f'지원하지 않는 timestamp 형식: {timestamp!r}')
+        date_cache[date_part] = days
+    # 다시 출력할 때 원본과 같은 문자열이 나오는 시각만 허용 (24:00:00, 10:61:00, ' 5' 등은 직렬 경로로)
+    digits = timestamp[11:13] + timestamp[14:16] + timestamp[17:19]
+    if not (digits.isascii() and digits.isdigit()):
+        raise CacheUnsupported(f'지원하지 않는 timestamp 형식: {timestamp!r}')
+    hour, minute, second = int(digits[0:2]), int(digits[2:4]), int(digits[4:6])
+    if hour >= 24 or minute >= 60 or second >= 60:
+        raise CacheUnsupported(f'지원하지 않는 timestamp 형식: {timestamp!r}')
+    return days * 86400 + hour * 3600 + minute * 60 + second
+
+def build_cache(log_path, cache_path=None):
+    # 로그를 한 번 파싱해 컬럼형 바이너리 캐시를 만든다
+    cache_path = cache_path or get_cache_path(log_path)
+    rows = []
+    event_ids = {}
+    date_cache = {}
+
+    with open(log_path, 'r', encoding='utf-8') as f:
+        stat = os.fstat(f.fileno())
+        f.readline() # 헤더 건너뛰기
+        for line in f:
+            if not line.strip():
+                continue
+            timestamp, event, message = parse_log_line(line)
+            if timestamp != get_sort_key(line):
+                # 정렬 기준(원본 컬럼)과 출력 값이 다르면 epoch 정렬이 직렬 경로와 달라질 수 있다
+                raise CacheUnsupported(f'timestamp 앞뒤 공백: {timestamp!r}')
+            event_id = event_ids.setdefault(event, len(event_ids))
+            if event_id > 0xFFFF:
+                raise CacheUnsupported('이벤트 종류가 너무 많습니다.')
+            rows.append((timestamp_to_epoch(timestamp, date_cache), event_id, message))
+
+    # 행을 timestamp 내림차순(안정 정렬)으로 저장해 분석 시 순차적으로 읽도록 한다
+    rows.sort(key=itemgetter(0), reverse=True)
+    row_count = len(rows)
+    timestamps = array('q', map(itemgetter(0), rows))
+    event_codes = array('H', map(itemgetter(1), rows))
+    message_offsets = array('Q', [0])
+    messages = bytearray()
+    for _, _, message in rows:
+        messages += message.encode('utf-8')
+        message_offsets.append(len(messages))
+    del rows
+
+    event_table = bytearray()
+    for event in event_ids:
+        encoded = event.encode('utf-8')
+        event_table += struct.pack('<H', len(encoded)) + encoded
+
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+        out.write(struct.pack(HEADER_FORMAT, CACHE_MAGIC, stat.st_size, stat.st_mtime_ns, stat.st_ino,
+                              row_count, len(event_ids), len(event_table), len(messages)))
+        out.write(timestamps.tobytes())
+        out.write(message_offsets.tobytes())
+        codes = event_codes.tobytes()
+        out.write(codes + b'\x00' * (_align(len(codes)) - len(codes)))
+        out.write(event_table + b'\x00' * (_align(len(event_table)) - len(event_table)))
+        out.write(messages)
+    os.replace(temp_path, cache_path)
+    return row_count
+
+class LogColumnCache:
+    # 컬럼형 캐시를 mmap으로 열어 복사 없이 각 컬럼을 배열처럼 사용한다
+    def __init__(self, cache_path):
+        self.file = open(cache_path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # 빈 파일
+            self.file.close()
+            raise CacheUnsupported('손상된 캐시 파일입니다.')
+        (magic, self.log_size, self.log_mtime_ns, self.log_inode, self.row_count,
+         event_count, event_table_size, blob_size) = struct.unpack_from(HEADER_FORMAT, self.buffer, 0)
+        if magic != CACHE_MAGIC:
+            self.close()
+            raise CacheUnsupported('캐시 파일 형식이 아닙니다.')
+
+        view = memoryview(self.buffer)
+        position = HEADER_SIZE
+        rows = self.row_count
+        self.timestamps = view[position:position + rows * 8].cast('q')
+        position += rows * 8
+        self.message_offsets = view[position:position + (rows + 1) * 8].cast('Q')
+        position += (rows + 1) * 8
+        self.event_codes = view[position:position + rows * 2].cast('H')
+        position += _align(rows * 2)
+
+        self.events = []
+        table_end = position + event_table_size
+        for _ in range(event_count):
+            (length,) = struct.unpack_from('<H', self.buffer, position)
+            position += 2
+            self.events.append(bytes(view[position:position + length]).decode('utf-8'))
+            position += length
+        position = _align(table_end)
+        self.messages = view[position:position + blob_size]
+        self._views = [self.timestamps, self.message_offsets, self.event_codes, self.messages, view]
+
+    def matches(self, log_path):
+        # 원본 로그가 캐시를 만든 뒤로 바뀌지 않았는지 확인
+        stat = os.stat(log_path)
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino) == (self.log_size, self.log_mtime_ns, self.log_inode)
+
+    def message(self, i):
+        return str(self.messages[self.message_offsets[i]:self.message_offsets[i + 1]], 'utf-8')
+
+    def iter_sorted_rows(self):
+        # timestamp 내림차순으로 (timestamp, event, message)를 반환 (텍스트 파싱 없음)
+        # BATCH_ROWS 행씩 컬럼을 한 번에 꺼내 순차적으로 처리한다
+        events = self.events
+        day_cache = {}
+        last_epoch, last_timestamp = None, None
+        for start in range(0, self.row_count, BATCH_ROWS):
+            end = min(start + BATCH_ROWS, self.row_count)
+            epochs = self.timestamps[start:end].tolist()
+            codes = self.event_codes[start:end].tolist()
+            offsets = self.message_offsets[start:end + 1].tolist()
+            base = offsets[0]
+            blob = self.messages[base:offsets[-1]]
+            text = str(blob, 'utf-8')
+            if len(text) != len(blob):
+                text = None # ASCII가 아니면 바이트 offset과 문자 위치가 달라 행마다 디코딩
+
+            for j, epoch in enumerate(epochs):
+                if epoch != last_epoch: # 정렬된 순서라 같은 시각이 연속으로 나온다
+                    days, seconds = divmod(epoch, 86400)
+                    day = day_cache.get(days)
+                    if day is None:
+                        day = datetime.date.fromordinal(days + EPOCH_ORDINAL).isoformat() + ' '
+                        day_cache[days] = day
+                    last_epoch, last_timestamp = epoch, day + TIME_OF_DAY[seconds]
+                begin, finish = offsets[j] - base, offsets[j + 1] - base
+                if text is not None:
+                    message = text[begin:finish]
+                else:
+                    message = str(blob[begin:finish], 'utf-8')
+                yield last_timestamp, events[codes[j]], message
+
+    def close(self):
+        for view in getattr(self, '_views', []):
+            view.release()
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def open_valid_cache(log_path, cache_path=None):
+    # 원본 로그와 일치하는 캐시가 있으면 열고, 없거나 오래되었으면 다시 만든다
+    cache_path = cache_path or get_cache_path(log_path)
+    try:
+        cache = LogColumnCache(cache_path)
+        if cache.matches(log_path):
+            return cache
+        cache.close()
+    except (FileNotFoundError, CacheUnsupported, struct.error):
+        pass
+    build_cache(log_path, cache_path)
+    return LogColumnCache(cache_path)
+
+def write_into_markdown_cached(file_path, analysis_path, detector):
+    # 컬럼형 캐시로 보고서를 만든다. 결과 파일은 write_into_markdown()과 바이트 단위로 동일하다
+    try:
+        cache = open_valid_cache(file_path)
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {file_path}')
+        exit(1)
+    except PermissionError:
+        print(f'파일을 열 권한이 없습니다: {file_path}')
+        exit(1)
+    except UnicodeDecodeError:
+        print(f'읽을 수 없는 형식입니다: {file_path}')
+        exit(1)
+    except CacheUnsupported as e:
+        print(f'>> 캐시를 만들 수 없는 로그입니다: {e}')
+        return False
+
+    # 로그 메시지는 반복이 많으므로 분류 결과를 메시지별로 기억해 둔다
+    class_cache = {}
+    with cache, MarkdownReportWriter(analysis_path, detector, WRITE_BUFFER_SIZE) as writer:
+        for timestamp, event, message in cache.iter_sorted_rows():
+            class_indices = class_cache.get(message)
+            if class_indices is None:
+                if len(class_cache) >= CLASS_CACHE_SIZE:
+                    class_cache.clear()
+                class_indices = class_cache[message] = detector.classify(message)
+            writer.write_row(format_markdown_row(timestamp, event, message), class_indices)
+
+    print('>> Markdown 파일 생성 성공! (cache)')
+    return True
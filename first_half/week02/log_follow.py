@@ -0,0 +1,240 @@
+import heapq
+import json
+import os
+import time
+
+from log_parser import ANALYSIS_HEADER, format_markdown_row, parse_log_line
+
+CHECKPOINT_SUFFIX = '.follow' # checkpoint는 로그마다 따로 (<log>.follow)
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_FLUSH_INTERVAL = 10.0 # 보고서를 다시 쓰는 최소 간격 (초)
+MAX_BUFFERED_ROWS = 100000    # 이만큼 쌓이면 간격과 관계없이 보고서에 반영
+MAX_READ_SIZE = 64 * 1024 * 1024 # 한 번에 처리하는 최대 바이트 수
+
+def get_checkpoint_path(log_path):
+    return log_path + CHECKPOINT_SUFFIX
+
+def load_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_checkpoint(checkpoint_path, device, inode, offset, pending=()):
+    # 임시 파일에 쓴 뒤 교체해 중간에 종료되어도 checkpoint가 깨지지 않게 한다
+    # pending: offset까지 반영했지만 아직 제자리로 옮기지 않은 보고서 [(임시 파일, 보고서)]
+    temp_path = checkpoint_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'device': device, 'inode': inode, 'offset': offset,
+                   'pending': [list(item) for item in pending]}, f)
+    os.replace(temp_path, checkpoint_path)
+
+def apply_pending(pending):
+    # checkpoint에 기록된 임시 보고서를 제자리로 옮긴다 (이미 옮겨진 것은 건너뜀)
+    for temp_path, report_path in pending:
+        try:
+            os.replace(temp_path, report_path)
+        except FileNotFoundError:
+            pass
+
+def _row_timestamp(row):
+    # '| timestamp | event | message |' 형식의 행에서 timestamp만 꺼낸다
+    return row[2:].split(' | ', 1)[0]
+
+def merge_rows_into_report(report_path, header, new_rows):
+    # 이미 내림차순으로 정렬된 보고서와 새 행들을 병합해 임시 파일에 쓰고 그 경로를 반환한다
+    # (로그를 다시 읽거나 정렬하지 않음, 보고서 교체는 checkpoint를 남긴 뒤 apply_pending으로)
+    # 같은 timestamp는 기존 행을 먼저 두므로 전체를 다시 분석한 결과와 같다
+    temp_path = report_path + '.tmp'
+    try:
+        existing_file = open(report_path, 'r')
+    except FileNotFoundError:
+        existing_file = None
+    try:
+        existing_rows = ()
+        if existing_file is not None:
+            lines = (line.rstrip('\n') for line in existing_file)
+            for _ in header:
+                next(lines, None)
+            existing_rows = lines
+        with open(temp_path, 'w') as out:
+            out.write('\n'.join(header))
+            for row in heapq.merge(existing_rows, new_rows, key=_row_timestamp, reverse=True):
+                out.write('\n' + row)
+    finally:
+        if existing_file is not None:
+            existing_file.close()
+    return temp_path
+
+class LogFollower:
+    # 로그 파일 뒤에 추가된 줄만 읽어 보고서를 갱신한다
+    # 마지막으로 처리한 위치(device, inode, offset)를 checkpoint 파일에 남겨 재시작/로그 교체에도 이어서 처리
+    # 보고서 병합은 매번 보고서 전체를 다시 쓰므로 (보고서 크기에 비례) 읽은 행은 메모리에 모아 두고
+    # flush_interval초에 한 번(또는 MAX_BUFFERED_ROWS개가 쌓이거나 --once/종료/로그 교체 시) 반영한다
+    # 반영할 때는 모든 보고서의 임시 파일을 만든 뒤 checkpoint(새 offset + 임시 파일 목록)를 남기고 보고서를 교체한다
+    # 그 사이에 멈추면 다시 시작할 때 checkpoint의 임시 파일을 마저 옮기므로 중복 반영되지 않고,
+    # 반영 전에 멈추면 checkpoint가 이전 위치를 가리키므로 그 줄들을 다시 읽는다
+    def __init__(self, log_path, analysis_path, detector, checkpoint_path=None,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.log_path = log_path
+        self.analysis_path = analysis_path
+        self.detector = detector
+        self.checkpoint_path = checkpoint_path or get_checkpoint_path(log_path)
+        self.flush_interval = flush_interval
+        self.log_file = None
+        self.device = None
+        self.inode = None
+        self.offset = 0
+        self.buffered = [[] for _ in self._reports()] # 보고서별 아직 반영하지 않은 행 (로그 순서)
+        self.buffered_count = 0
+        self.dirty = False # checkpoint 이후 offset이 움직였는지
+        self.last_flush = time.monotonic()
+
+    def open_log(self):
+        # checkpoint와 같은 파일이면 이어서, 다른 파일(교체됨)이면 처음부터 읽는다
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            self.reset_reports()
+        elif checkpoint.get('pending'):
+            # 지난번에 checkpoint까지 남기고 보고서를 다 옮기기 전에 멈췄다
+            apply_pending(checkpoint['pending'])
+            save_checkpoint(self.checkpoint_path, checkpoint['device'], checkpoint['inode'], checkpoint['offset'])
+        self._open_current_file()
+        if (checkpoint is not None
+                and (checkpoint['device'], checkpoint['inode']) == (self.device, self.inode)
+                and checkpoint['offset'] <= os.fstat(self.log_file.fileno()).st_size):
+            self.offset = checkpoint['offset']
+            self.log_file.seek(self.offset)
+
+    def _open_current_file(self):
+        if self.log_file is not None:
+            self.log_file.close()
+        self.log_file = open(self.log_path, 'rb')
+        stat = os.fstat(self.log_file.fileno())
+        self.device, self.inode = stat.st_dev, stat.st_ino
+        self.offset = 0
+
+    def reset_reports(self):
+        # checkpoint가 없으면 기존 보고서가 어느 위치까지 반영됐는지 알 수 없으므로 비우고 시작
+        for path, header in self._reports():
+            with open(path, 'w') as f:
+                f.write('\n'.join(header))
+
+    def _reports(self):
+        reports = [(self.analysis_path, ANALYSIS_HEADER)]
+        for i, path in enumerate(self.detector.report_paths()):
+            reports.append((path, self.detector.report_header(i)))
+        return reports
+
+    def read_new_lines(self):
+        # 완전한 줄(줄바꿈으로 끝나는 줄)까지만 읽고 offset을 옮긴다
+        data = self.log_file.read(MAX_READ_SIZE)
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            self.log_file.seek(self.offset)
+            return []
+        self.log_file.seek(self.offset + end)
+        text = data[:end].decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        if self.offset == 0:
+            lines = lines[1:] # 파일 첫 줄은 헤더
+        self.offset += end
+        return [line for line in lines if line.strip()]
+
+    def check_rotation(self):
+        # 파일이 교체(rename 후 새로 생성)되었거나 잘렸으면 새 파일의 처음부터 다시 읽는다
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return False # 교체 도중이면 다음 주기에 다시 확인
+        if (stat.st_dev, stat.st_ino) != (self.device, self.inode):
+            self.flush() # checkpoint가 이전 파일 끝을 가리키도록 먼저 반영
+            self._open_current_file()
+            return True
+        if stat.st_size < self.offset:
+            self.flush()
+            self.log_file.seek(0)
+            self.offset = 0
+            return True
+        return False
+
+    def process_lines(self, lines):
+        # 새 줄을 보고서별 행으로 바꿔 모아 둔다 (보고서에는 flush할 때 반영)
+        analysis_rows = self.buffered[0]
+        incident_rows = self.buffered[1:]
+        for line in lines:
+            timestamp, event, message = parse_log_line(line)
+            row = format_markdown_row(timestamp, event, message)
+            analysis_rows.append(row)
+            for i in self.detector.classify(message):
+                incident_rows[i].append(row)
+        self.buffered_count += len(lines)
+
+    def flush(self):
+        # 모아 둔 행을 보고서에 병합하고 현재 위치를 checkpoint에 남긴다
+        if not self.dirty:
+            return
+        pending = []
+        for (path, header), new_rows in zip(self._reports(), self.buffered):
+            if new_rows:
+                # 안정 정렬이므로 같은 timestamp는 로그에 나온 순서를 유지한다
+                new_rows.sort(key=_row_timestamp, reverse=True)
+                pending.append((merge_rows_into_report(path, header, new_rows), path))
+        # checkpoint가 반영 완료 시점: 이후에 멈춰도 다시 시작할 때 임시 파일을 마저 옮긴다
+        save_checkpoint(self.checkpoint_path, self.device, self.inode, self.offset, pending)
+        if pending:
+            apply_pending(pending)
+            # 다음 반영의 임시 파일을 이번 것으로 착각하지 않도록 목록을 비운다
+            save_checkpoint(self.checkpoint_path, self.device, self.inode, self.offset)
+        self.buffered = [[] for _ in self.buffered]
+        self.buffered_count = 0
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+    def poll(self, force_flush=False):
+        # 새로 추가된 줄을 읽고 읽은 줄 수를 반환 (보고서 반영은 flush_interval마다, force_flush면 바로)
+        processed = 0
+        while True:
+            start_offset = self.offset
+            lines = self.read_new_lines()
+            if lines:
+                self.process_lines(lines)
+                processed += len(lines)
+            if self.offset != start_offset:
+                self.dirty = True
+                if self.buffered_count >= MAX_BUFFERED_ROWS:
+                    self.flush()
+                continue
+            # 교체 직전 기존 파일에 남은 줄까지 모두 읽은 뒤에 새 파일로 넘어간다
+            if not self.check_rotation():
+                break
+            save_checkpoint(self.checkpoint_path, self.device, self.inode, self.offset)
+        if force_flush or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+        return processed
+
+    def follow(self, interval=DEFAULT_POLL_INTERVAL, once=False):
+        try:
+            self.open_log()
+        except FileNotFoundError:
+            print(f'파일을 찾을 수 없습니다: {self.log_path}')
+            exit(1)
+        except PermissionError:
+            print(f'파일을 열 권한이 없습니다: {self.log_path}')
+            exit(1)
+        try:
+            while True:
+                processed = self.poll(force_flush=once)
+                if processed:
+                    print(f'>> {processed}줄 읽음 (offset={self.offset})')
+                if once:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print('Follow stopped....')
+        finally:
+            self.flush() # 종료할 때 모아 둔 행을 반영
+            self.log_file.close()
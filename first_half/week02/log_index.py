@@ -0,0 +1,214 @@
+import argparse
+import bisect
+import mmap
+import os
+import struct
+
+from log_parser import format_markdown_row, parse_log_line
+
+LOG_FILE_PATH = 'mission_computer_main.log'
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'MLOGIDX2'
+BLOCK_SIZE = 64 * 1024 # 인덱스 항목 하나가 담당하는 로그 바이트 수 (희소 인덱스 간격)
+
+# 헤더: magic, 인덱싱한 로그 크기, inode, 항목 수, 시간순 정렬 여부 (모든 줄이 앞 줄보다 늦거나 같은지)
+HEADER_FORMAT = '<8sQQIB'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+# 항목: 블록의 최소 timestamp, 최대 timestamp, 블록 시작 offset
+TIMESTAMP_SIZE = 19 # 'YYYY-MM-DD HH:MM:SS'
+ENTRY_FORMAT = f'<{TIMESTAMP_SIZE}s{TIMESTAMP_SIZE}sQ'
+ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
+
+def get_index_path(log_path):
+    return log_path + INDEX_SUFFIX
+
+def _line_timestamp(line):
+    return line.split(b',', 1)[0].strip()[:TIMESTAMP_SIZE]
+
+def scan_blocks(log_file, start_offset, skip_header, previous=None):
+    # start_offset부터 로그를 읽어 BLOCK_SIZE 단위(줄 경계 기준)로 (min, max, offset) 항목을 만든다
+    # 줄바꿈으로 끝나지 않은 마지막 줄은 다음 갱신 때 인덱싱한다
+    # previous: start_offset 바로 앞 줄의 timestamp (줄 단위 정렬 여부를 이어서 확인)
+    # 반환: (항목 목록, 인덱싱한 끝 offset, 모든 줄이 시간순인지)
+    log_file.seek(start_offset)
+    is_sorted = True
+    offset = start_offset
+    if skip_header:
+        offset += len(log_file.readline())
+
+    entries = []
+    block_offset = offset
+    block_min = block_max = None
+    for line in log_file:
+        if not line.endswith(b'\n'):
+            break
+        timestamp = _line_timestamp(line)
+        if line.strip():
+            if previous is not None and timestamp < previous:
+                is_sorted = False
+            previous = timestamp
+            if block_min is None:
+                block_min = block_max = timestamp
+            else:
+                block_min = min(block_min, timestamp)
+                block_max = max(block_max, timestamp)
+        offset += len(line)
+        if offset - block_offset >= BLOCK_SIZE and block_min is not None:
+            entries.append((block_min, block_max, block_offset))
+            block_offset = offset
+            block_min = block_max = None
+    if block_min is not None:
+        entries.append((block_min, block_max, block_offset))
+    return entries, offset, is_sorted
+
+def _write_index(index_path, indexed_size, inode, entries, is_sorted):
+    temp_path = index_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, INDEX_MAGIC, indexed_size, inode, len(entries), is_sorted))
+        for entry in entries:
+            f.write(struct.pack(ENTRY_FORMAT, *entry))
+    os.replace(temp_path, index_path)
+
+def _read_header(index_path):
+    try:
+        with open(index_path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER_SIZE:
+        return None
+    magic, indexed_size, inode, count, is_sorted = struct.unpack(HEADER_FORMAT, header)
+    if magic != INDEX_MAGIC:
+        return None
+    return indexed_size, inode, count, bool(is_sorted)
+
+def build_index(log_path, index_path=None):
+    # 로그 전체를 한 번 읽어 희소 timestamp -> byte offset 인덱스를 만든다
+    index_path = index_path or get_index_path(log_path)
+    with open(log_path, 'rb') as log_file:
+        inode = os.fstat(log_file.fileno()).st_ino
+        entries, indexed_size, is_sorted = scan_blocks(log_file, 0, skip_header=True)
+    _write_index(index_path, indexed_size, inode, entries, is_sorted)
+    return len(entries)
+
+def update_index(log_path, index_path=None):
+    # 로그 뒤에 추가된 부분만 인덱싱한다 (파일이 교체되었거나 줄어들었으면 다시 만든다)
+    index_path = index_path or get_index_path(log_path)
+    header = _read_header(index_path)
+    stat = os.stat(log_path)
+    if header is None or header[1] != stat.st_ino or header[0] > stat.st_size:
+        return build_index(log_path, index_path)
+
+    indexed_size, inode, count, is_sorted = header
+    if indexed_size == stat.st_size:
+        return count
+
+    with open(index_path, 'rb') as f:
+        f.seek(HEADER_SIZE)
+        entries = [struct.unpack(ENTRY_FORMAT, f.read(ENTRY_SIZE)) for _ in range(count)]
+    # 마지막 블록은 덜 찬 상태일 수 있으므로 그 시작 위치부터 다시 스캔한다
+    resume_offset = indexed_size
+    if entries:
+        resume_offset = entries.pop()[2]
+    # 지금까지 시간순이었다면 앞 블록의 최대값이 곧 그 블록 마지막 줄의 timestamp
+    previous = entries[-1][1].rstrip(b'\x00') if entries else None
+    with open(log_path, 'rb') as log_file:
+        new_entries, indexed_size, new_sorted = scan_blocks(log_file, resume_offset,
+                                                            skip_header=(resume_offset == 0), previous=previous)
+    is_sorted = is_sorted and new_sorted
+    entries.extend(new_entries)
+    _write_index(index_path, indexed_size, inode, entries, is_sorted)
+    return len(entries)
+
+class _EntryColumn:
+    # mmap 위의 인덱스 항목 한 컬럼을 시퀀스처럼 보여준다 (bisect가 필요한 항목만 읽음)
+    def __init__(self, buffer, count, field):
+        self.buffer = buffer
+        self.count = count
+        self.field = field
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        entry = struct.unpack_from(ENTRY_FORMAT, self.buffer, HEADER_SIZE + i * ENTRY_SIZE)
+        value = entry[self.field]
+        return value.rstrip(b'\x00') if isinstance(value, bytes) else value
+
+class LogIndex:
+    # 사이드카 인덱스를 mmap으로 열어 시간 구간에 해당하는 줄만 읽는다
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or get_index_path(log_path)
+        update_index(log_path, self.index_path)
+        self.indexed_size, _, self.count, self.is_sorted = _read_header(self.index_path)
+
+    def _block_ranges(self, buffer, start, end):
+        # 구간과 겹칠 수 있는 (시작 offset, 끝 offset) 블록 범위들을 반환
+        mins = _EntryColumn(buffer, self.count, 0)
+        maxes = _EntryColumn(buffer, self.count, 1)
+        offsets = _EntryColumn(buffer, self.count, 2)
+        if self.is_sorted:
+            # 블록 최대값이 start 이상인 첫 블록부터 순서대로 읽으면 된다 (이진 탐색)
+            first = bisect.bisect_left(maxes, start)
+            if first < self.count:
+                yield offsets[first], self.indexed_size
+            return
+        # 시간순이 아닌 로그는 블록마다 min/max가 구간과 겹치는지 확인
+        for i in range(self.count):
+            if mins[i] <= end and maxes[i] >= start:
+                block_end = offsets[i + 1] if i + 1 < self.count else self.indexed_size
+                yield offsets[i], block_end
+
+    def query(self, start, end):
+        # start <= timestamp <= end 인 줄을 파일 순서대로 반환
+        # end는 접두사로 비교하므로 '2023-08-27 10:30'은 10:30:59까지 포함한다
+        start_key = start.encode('utf-8')
+        end_key = end.encode('utf-8')
+        with open(self.index_path, 'rb') as index_file, open(self.log_path, 'rb') as log_file:
+            if self.count == 0:
+                return
+            with mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for block_start, block_end in self._block_ranges(buffer, start_key, end_key):
+                    log_file.seek(block_start)
+                    position = block_start
+                    for line in log_file:
+                        if position >= block_end:
+                            break
+                        position += len(line)
+                        if not line.strip():
+                            continue
+                        timestamp = _line_timestamp(line)
+                        if self.is_sorted and timestamp[:len(end_key)] > end_key:
+                            return
+                        if timestamp >= start_key and timestamp[:len(end_key)] <= end_key:
+                            yield line.decode('utf-8').rstrip('\r\n')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 로그 시간 구간 조회')
+    parser.add_argument('start', nargs='?', help="시작 시각 (예: '2023-08-27 10:00')")
+    parser.add_argument('end', nargs='?', help="끝 시각, 접두사 포함 (예: '2023-08-27 10:30')")
+    parser.add_argument('--log', default=LOG_FILE_PATH)
+    parser.add_argument('--build', action='store_true', help='인덱스를 처음부터 다시 만든다')
+    parser.add_argument('--raw', action='store_true', help='Markdown 행 대신 원본 줄을 출력')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    try:
+        if args.build:
+            count = build_index(args.log)
+            print(f'>> 인덱스 생성 완료: {get_index_path(args.log)} ({count}개 블록)')
+        if args.start:
+            log_index = LogIndex(args.log)
+            for line in log_index.query(args.start, args.end or args.start):
+                if args.raw:
+                    print(line)
+                else:
+                    print(format_markdown_row(*parse_log_line(line)))
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {args.log}')
+        exit(1)
+    except PermissionError:
+        print(f'파일을 열 권한이 없습니다: {args.log}')
+        exit(1)
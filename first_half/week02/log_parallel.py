@@ -0,0 +1,85 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from log_parser import (
+    MarkdownReportWriter,
+    format_markdown_row,
+    get_sort_key,
+    parse_log_line,
+)
+
+CHUNKS_PER_WORKER = 4 # 작업량 편차를 줄이기 위해 워커 수보다 잘게 나눈다
+WRITE_BUFFER_SIZE = 1 << 20
+
+def find_chunk_boundaries(file_path, chunk_count):
+    # 헤더를 제외한 본문을 줄바꿈에 맞춘 (start, end) 바이트 구간 chunk_count개로 나눈다
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        f.readline() # 헤더 건너뛰기
+        body_start = f.tell()
+        boundaries = [body_start]
+        for i in range(1, chunk_count):
+            f.seek(body_start + (file_size - body_start) * i // chunk_count)
+            f.readline() # 줄 중간이라면 다음 줄 시작까지 이동
+            position = f.tell()
+            if position >= file_size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+        boundaries.append(file_size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def parse_chunk(file_path, start, end, detector):
+    # 워커 프로세스: 바이트 구간을 읽어 파싱/필터링 후 timestamp 내림차순으로 정렬해 반환
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    # 텍스트 모드(universal newlines)로 읽는 직렬 경로와 같은 줄 구분을 사용
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    rows = []
+    for line in text.split('\n'):
+        if not line.strip():
+            continue
+        timestamp, event, message = parse_log_line(line)
+        row = format_markdown_row(timestamp, event, message)
+        rows.append((get_sort_key(line), row, detector.classify(message)))
+    # list.sort는 안정 정렬이므로 같은 timestamp는 원래 순서를 유지한다
+    rows.sort(key=itemgetter(0), reverse=True)
+    return rows
+
+def _parse_chunk_task(task):
+    return parse_chunk(*task)
+
+def write_into_markdown_parallel(file_path, analysis_path, detector, workers=None):
+    # 로그를 바이트 구간으로 나눠 프로세스 풀에서 파싱한 뒤 정렬된 부분 결과를 병합
+    # 결과 파일은 write_into_markdown()과 바이트 단위로 동일하다
+    workers = workers or os.cpu_count() or 1
+    try:
+        chunks = find_chunk_boundaries(file_path, workers * CHUNKS_PER_WORKER)
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {file_path}')
+        exit(1)
+    except PermissionError:
+        print(f'파일을 열 권한이 없습니다: {file_path}')
+        exit(1)
+
+    tasks = [(file_path, start, end, detector) for start, end in chunks]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partial_results = list(executor.map(_parse_chunk_task, tasks))
+    except UnicodeDecodeError:
+        print(f'읽을 수 없는 형식입니다: {file_path}')
+        exit(1)
+
+    # heapq.merge는 같은 키일 때 앞선 구간을 먼저 내보내므로 원래 줄 순서가 유지된다
+    merged_rows = heapq.merge(*partial_results, key=itemgetter(0), reverse=True)
+
+    with MarkdownReportWriter(analysis_path, detector, WRITE_BUFFER_SIZE) as writer:
+        for _, row, class_indices in merged_rows:
+            writer.write_row(row, class_indices)
+
+    print(f'>> Markdown 파일 생성 성공! (parallel, workers={workers})')
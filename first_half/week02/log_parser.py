@@ -0,0 +1,49 @@
+# 미션 컴퓨터 로그('timestamp,event,message') 한 줄을 다루는 공용 함수 모음
+
+ANALYSIS_HEADER = [
+    "## 미션 컴퓨터 로그 분석",
+    "",
+    "| 시간 | 이벤트 | 메시지 |",
+    "|------|--------|--------|",
+]
+
+def get_sort_key(line):
+    # 로그 한 줄의 정렬 기준(timestamp 컬럼)
+    return line.split(',')[0]
+
+def parse_log_line(line):
+    # 한 줄을 timestamp, event, message 세 필드로 분리
+    parts = line.strip().split(',', 2)
+    return parts[0].strip(), parts[1].strip(), parts[2].strip()
+
+def format_markdown_row(timestamp, event, message):
+    return f"| {timestamp} | {event} | {message} |"
+
+class MarkdownReportWriter:
+    # 전체 분석 보고서와 분류별 사고 보고서를 한 줄씩 이어 쓴다
+    # 결과는 줄 목록을 '\n'.join()으로 한 번에 쓴 것과 같다
+    def __init__(self, analysis_path, detector, buffer_size=1 << 20):
+        self.detector = detector
+        self.analysis_file = open(analysis_path, 'w', buffering=buffer_size)
+        self.analysis_file.write('\n'.join(ANALYSIS_HEADER))
+        self.report_files = []
+        for i, report_path in enumerate(detector.report_paths()):
+            report_file = open(report_path, 'w')
+            report_file.write('\n'.join(detector.report_header(i)))
+            self.report_files.append(report_file)
+
+    def write_row(self, row, class_indices):
+        self.analysis_file.write('\n' + row)
+        for i in class_indices:
+            self.report_files[i].write('\n' + row)
+
+    def close(self):
+        self.analysis_file.close()
+        for report_file in self.report_files:
+            report_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
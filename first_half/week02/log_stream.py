@@ -0,0 +1,102 @@
+import heapq
+import os
+import shutil
+import tempfile
+
+from log_parser import (
+    MarkdownReportWriter,
+    format_markdown_row,
+    get_sort_key,
+    parse_log_line,
+)
+
+DEFAULT_RUN_SIZE = 200_000   # 디스크 run 하나에 담는 최대 줄 수 (메모리 상한)
+MAX_MERGE_FAN_IN = 64        # 한 번에 병합하는 run 파일 수 (열린 파일 수 상한)
+WRITE_BUFFER_SIZE = 1 << 20
+
+def _write_run(lines, run_dir, run_number):
+    # 메모리에 모은 줄들을 timestamp 내림차순으로 정렬해 run 파일로 기록
+    lines.sort(key=get_sort_key, reverse=True)
+    run_path = os.path.join(run_dir, f'run_{run_number:06d}.txt')
+    with open(run_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(lines)
+    return run_path
+
+def split_into_sorted_runs(file_path, run_dir, run_size=DEFAULT_RUN_SIZE):
+    # 로그를 한 줄씩 읽으며 run_size 줄 단위로 정렬된 run 파일을 만든다
+    run_paths = []
+    buffer = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        f.readline() # 헤더 건너뛰기
+        for line in f:
+            if not line.strip():
+                continue
+            if not line.endswith('\n'):
+                line += '\n'
+            buffer.append(line)
+            if len(buffer) >= run_size:
+                run_paths.append(_write_run(buffer, run_dir, len(run_paths)))
+                buffer = []
+    if buffer:
+        run_paths.append(_write_run(buffer, run_dir, len(run_paths)))
+    return run_paths
+
+def _merge_runs(run_paths, output_path):
+    files = [open(path, 'r', encoding='utf-8') for path in run_paths]
+    try:
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as out:
+            out.writelines(heapq.merge(*files, key=get_sort_key, reverse=True))
+    finally:
+        for f in files:
+            f.close()
+    for path in run_paths:
+        os.remove(path)
+
+def iter_merged_lines(run_paths, run_dir):
+    # run 수가 MAX_MERGE_FAN_IN을 넘으면 중간 병합을 반복해 줄인 뒤 최종 병합 결과를 한 줄씩 반환
+    # heapq.merge는 같은 키일 때 앞선 run을 먼저 내보내므로 sorted()와 같은 안정 정렬 순서가 유지된다
+    pass_number = 0
+    while len(run_paths) > MAX_MERGE_FAN_IN:
+        merged_paths = []
+        for i in range(0, len(run_paths), MAX_MERGE_FAN_IN):
+            group = run_paths[i:i + MAX_MERGE_FAN_IN]
+            output_path = os.path.join(run_dir, f'merge_{pass_number:03d}_{i:06d}.txt')
+            _merge_runs(group, output_path)
+            merged_paths.append(output_path)
+        run_paths = merged_paths
+        pass_number += 1
+
+    files = [open(path, 'r', encoding='utf-8') for path in run_paths]
+    try:
+        yield from heapq.merge(*files, key=get_sort_key, reverse=True)
+    finally:
+        for f in files:
+            f.close()
+
+def write_into_markdown_streaming(file_path, analysis_path, detector, run_size=None):
+    # 외부 병합 정렬로 로그 전체를 메모리에 올리지 않고 Markdown 보고서를 점진적으로 기록
+    # 결과 파일은 write_into_markdown()과 바이트 단위로 동일하다
+    run_size = run_size or DEFAULT_RUN_SIZE
+    run_dir = tempfile.mkdtemp(prefix='mission_log_runs_', dir=os.path.dirname(os.path.abspath(analysis_path)))
+    try:
+        try:
+            run_paths = split_into_sorted_runs(file_path, run_dir, run_size)
+        except FileNotFoundError:
+            print(f'파일을 찾을 수 없습니다: {file_path}')
+            exit(1)
+        except PermissionError:
+            print(f'파일을 열 권한이 없습니다: {file_path}')
+            exit(1)
+        except UnicodeDecodeError:
+            print(f'읽을 수 없는 형식입니다: {file_path}')
+            exit(1)
+
+        with MarkdownReportWriter(analysis_path, detector, WRITE_BUFFER_SIZE) as writer:
+            for line in iter_merged_lines(run_paths, run_dir):
+                timestamp, event, message = parse_log_line(line)
+                row = format_markdown_row(timestamp, event, message)
+                writer.write_row(row, detector.classify(message))
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    print('>> Markdown 파일 생성 성공! (streaming)')
@@ -1,6 +1,19 @@
+import argparse
+
+from incident_rules import get_detector
+from log_parser import (
+    ANALYSIS_HEADER,
+    format_markdown_row,
+    get_sort_key,
+    parse_log_line,
+)
+from log_cache import write_into_markdown_cached
+from log_follow import DEFAULT_FLUSH_INTERVAL, LogFollower
+from log_parallel import write_into_markdown_parallel
+from log_stream import write_into_markdown_streaming
+
 LOG_FILE_PATH = 'mission_computer_main.log'
 ANALYSIS_LOG_FILE_NAME = 'log_analysis.md'
-FATAL_LOG_FILE_NAME = 'fatal_logs.md'
 
 def open_file(file_path):
     try:
@@ -20,43 +33,78 @@ def open_file(file_path):
         print(f'알 수 없는 에러가 발생했습니다: {e}')
         exit(99) # 예상치 못한 오류
 
-def write_into_markdown(lines):
-    markdown_content = []
-    markdown_content.append("## 미션 컴퓨터 로그 분석")
-    markdown_content.append("")
-    markdown_content.append("| 시간 | 이벤트 | 메시지 |")
-    markdown_content.append("|------|--------|--------|")
-
-    fatal_logs = []
-    fatal_logs.append("## 산소 탱크 관련 로그 분석")
-    fatal_logs.append("")
-    fatal_logs.append("| 시간 | 이벤트 | 메시지 |")
-    fatal_logs.append("|------|--------|--------|")
-    
+def write_into_markdown(lines, detector):
+    markdown_content = list(ANALYSIS_HEADER)
+    # 규칙 분류별 보고서 (기본 규칙은 산소 탱크 관련 fatal_logs.md 하나)
+    incident_logs = [detector.report_header(i) for i in range(len(detector.rule_classes))]
+
     data_lines = lines[1:]
-    sorted_lines = sorted(data_lines, key=lambda x: x.split(',')[0], reverse=True)
-    
+    sorted_lines = sorted(data_lines, key=get_sort_key, reverse=True)
+
     for line in sorted_lines:
         print(line)
-        parts = line.strip().split(',', 2)
-        
-        timestamp = parts[0].strip()
-        event = parts[1].strip()
-        message = parts[2].strip()
-        
-        markdown_content.append(f"| {timestamp} | {event} | {message} |")
-
-        if 'oxygen tank' in message.lower():
-            fatal_logs.append(f"| {timestamp} | {event} | {message} |")
-    
+        timestamp, event, message = parse_log_line(line)
+        row = format_markdown_row(timestamp, event, message)
+
+        markdown_content.append(row)
+
+        for i in detector.classify(message):
+            incident_logs[i].append(row)
+
     with open(ANALYSIS_LOG_FILE_NAME, 'w') as md_file:
         md_file.write('\n'.join(markdown_content))
 
-    with open(FATAL_LOG_FILE_NAME, 'w') as md_file:
-        md_file.write('\n'.join(fatal_logs))
+    for report_path, report_lines in zip(detector.report_paths(), incident_logs):
+        with open(report_path, 'w') as md_file:
+            md_file.write('\n'.join(report_lines))
 
     print('>> Markdown 파일 생성 성공!')
 
-print('Hello Mars')
-log_content = open_file(LOG_FILE_PATH)
-write_into_markdown(log_content)
+def parse_args():
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 로그 분석기')
+    parser.add_argument('log_file', nargs='?', default=LOG_FILE_PATH)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help='외부 병합 정렬로 한 줄씩 처리 (대용량 로그용)')
+    mode.add_argument('--workers', type=int, default=None,
+                      help='프로세스 풀로 구간을 나눠 병렬 파싱 (워커 수, 0이면 CPU 코어 수)')
+    mode.add_argument('--cache', action='store_true',
+                      help='컬럼형 바이너리 캐시(<log>.colcache)로 분석 (로그가 바뀌지 않았으면 텍스트 파싱 생략)')
+    mode.add_argument('--follow', action='store_true',
+                      help='새로 추가된 줄만 읽어 보고서를 계속 갱신 (checkpoint로 재시작 지원)')
+    parser.add_argument('--rules', default=None,
+                        help='사고 분류 규칙 파일 (기본값: incident_rules.ini)')
+    parser.add_argument('--run-size', type=int, default=None,
+                        help='스트리밍 모드에서 디스크 run 하나에 담을 최대 줄 수')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='follow 모드에서 새 줄을 확인하는 주기(초)')
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL,
+                        help='follow 모드에서 읽은 줄을 보고서에 반영하는 최소 간격(초, 보고서 전체를 다시 쓴다)')
+    parser.add_argument('--once', action='store_true',
+                        help='follow 모드에서 새 줄을 한 번만 반영하고 종료')
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 0:
+        parser.error('--workers는 0 이상이어야 합니다 (0이면 CPU 코어 수)')
+    return args
+
+if __name__ == '__main__':
+    args = parse_args()
+    print('Hello Mars')
+    detector = get_detector(args.rules)
+    if args.stream:
+        write_into_markdown_streaming(args.log_file, ANALYSIS_LOG_FILE_NAME, detector,
+                                      run_size=args.run_size)
+    elif args.workers is not None:
+        write_into_markdown_parallel(args.log_file, ANALYSIS_LOG_FILE_NAME, detector,
+                                     workers=args.workers)
+    elif args.cache:
+        # 캐시로 표현할 수 없는 로그면 기존 방식으로 분석
+        if not write_into_markdown_cached(args.log_file, ANALYSIS_LOG_FILE_NAME, detector):
+            write_into_markdown(open_file(args.log_file), detector)
+    elif args.follow:
+        follower = LogFollower(args.log_file, ANALYSIS_LOG_FILE_NAME, detector,
+                               flush_interval=args.flush_interval)
+        follower.follow(interval=args.interval, once=args.once)
+    else:
+        log_content = open_file(args.log_file)
+        write_into_markdown(log_content, detector)
@@ -0,0 +1,260 @@
+import argparse
+import ast
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from file_manager import FileManager
+from inventory_cache import InventoryOutputCache
+from inventory_manager import InventoryManager
+from inventory_pipeline import filter_by_flammability, top_k_by_flammability
+from inventory_query import Between, Equals, InventoryQueryEngine, StartsWith
+from inventory_binary import InventoryBinaryFile, InventoryBinaryView, write_inventory_binary
+
+HEADERS = ['Substance', 'Weight (g/cm³)', 'Specific Gravity', 'Strength', 'Flammability']
+REPR_MAX_ROWS = 200_000 # ast.literal_eval은 이보다 크면 메모리를 너무 많이 쓴다
+STRENGTHS = ['Very weak', 'Weak', 'Low', 'Very low', 'High', 'Very high']
+
+def generate_rows(row_count, seed=42):
+    # 원본 인벤토리와 비슷한 모양의 임의 행 (약 절반은 'Various')
+    rng = random.Random(seed)
+    rows = []
+    for i in range(row_count):
+        if rng.random() < 0.5:
+            weight = gravity = strength = 'Various'
+        else:
+            weight = str(round(rng.uniform(0.001, 20), 3))
+            gravity = weight
+            strength = rng.choice(STRENGTHS)
+        rows.append([f'Substance {i}', weight, gravity, strength, str(round(rng.random(), 2))])
+    return rows
+
+def write_csv(file_path, headers, rows):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(','.join(headers) + '\n')
+        for row in rows:
+            f.write(','.join(row) + '\n')
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def benchmark_formats(row_count):
+    rows = generate_rows(row_count)
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'inventory.csv')
+        repr_path = os.path.join(work_dir, 'inventory_repr.bin')
+        binary_path = os.path.join(work_dir, 'inventory.bin')
+
+        write_csv(csv_path, HEADERS, rows)
+        with open(repr_path, 'wb') as f:
+            f.write(bytes(str(rows), 'utf-8')) # 기존 write_into_binary_file 형식
+        write_inventory_binary(binary_path, HEADERS, rows)
+
+        def load_csv():
+            return FileManager(csv_path, None, None).parse_csv_to_list()[1]
+
+        def load_repr():
+            with open(repr_path, 'rb') as f:
+                return ast.literal_eval(f.read().decode('utf-8'))
+
+        def load_binary():
+            with InventoryBinaryFile(binary_path) as bin_file:
+                return bin_file.read_all()
+
+        def random_access(count=1000):
+            rng = random.Random(0)
+            with InventoryBinaryFile(binary_path) as bin_file:
+                return [bin_file.read_row(rng.randrange(row_count)) for _ in range(count)]
+
+        def scan_projected():
+            # mmap view로 두 컬럼만 읽기
+            with InventoryBinaryView(binary_path) as rows:
+                return sum(1 for _ in rows.project(['Substance', 'Flammability']))
+
+        def slice_tail(count=1000):
+            with InventoryBinaryView(binary_path) as rows:
+                return list(rows[-count:])
+
+        print(f'>> {row_count:,} rows')
+        for name, path, loader in (('csv', csv_path, load_csv), ('repr', repr_path, load_repr),
+                                   ('binary', binary_path, load_binary)):
+            if loader is load_repr and row_count > REPR_MAX_ROWS:
+                print(f'   {name:<7} {os.path.getsize(path) / 1024:10.1f} KB   full load (skipped)')
+                continue
+            elapsed, _ = measure(loader)
+            print(f'   {name:<7} {os.path.getsize(path) / 1024:10.1f} KB   full load {elapsed * 1000:9.1f} ms')
+        elapsed, _ = measure(random_access)
+        print(f'   binary random access: {elapsed / 1000 * 1e6:.1f} us/row')
+        elapsed, _ = measure(scan_projected)
+        print(f'   mmap view, 2-column projection scan: {elapsed * 1000:.1f} ms')
+        elapsed, _ = measure(slice_tail)
+        print(f'   mmap view, last 1000 rows slice: {elapsed * 1000:.1f} ms')
+
+def benchmark_flammability(row_count, thresholds=(0.1, 0.5, 0.7, 0.9, 0.99)):
+    rows = generate_rows(row_count)
+    flammability = HEADERS.index('Flammability')
+    print(f'>> flammability queries on {row_count:,} rows')
+
+    def linear_filter(threshold):
+        # 기존 방식: 호출할 때마다 모든 행을 float로 바꿔 비교
+        return [row for row in rows if float(row[flammability]) >= threshold]
+
+    im = InventoryManager(HEADERS, rows)
+    elapsed, _ = measure(im.build_flammability_order)
+    print(f'   index build (once): {elapsed * 1000:.1f} ms')
+    for threshold in thresholds:
+        linear_elapsed, expected = measure(lambda: linear_filter(threshold))
+        index_elapsed, result = measure(lambda: im.filter_by_flammability(threshold))
+        same = 'identical' if result == expected else 'DIFFERENT'
+        print(f'   >= {threshold:<5} {len(result):>9,} rows   linear {linear_elapsed * 1000:8.1f} ms'
+              f'   index {index_elapsed * 1000:8.2f} ms   {same}')
+
+    im.sort_by_flammability_desc()
+    for threshold in thresholds:
+        elapsed, result = measure(lambda: im.filter_by_flammability(threshold))
+        print(f'   sorted, >= {threshold:<5} {len(result):>9,} rows   index {elapsed * 1000:8.2f} ms')
+
+def benchmark_ingest(row_count):
+    # CSV -> 타입 변환된 컬럼 -> InventoryManager 까지의 처리량 (rows/s)
+    rows = generate_rows(row_count)
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'inventory.csv')
+        write_csv(csv_path, HEADERS, rows)
+        fm = FileManager(csv_path, None, None)
+        print(f'>> ingest {row_count:,} rows ({os.path.getsize(csv_path) / (1024 * 1024):.1f} MB)')
+
+        elapsed, _ = measure(fm.parse_csv_to_list)
+        print(f'   csv module parse        {elapsed:6.2f} s   {row_count / elapsed:12,.0f} rows/s')
+        elapsed, (headers, data_list, numeric_columns) = measure(fm.parse_csv_typed)
+        print(f'   parse + typed columns   {elapsed:6.2f} s   {row_count / elapsed:12,.0f} rows/s')
+        elapsed, _ = measure(lambda: InventoryManager(headers, data_list, numeric_columns).build_flammability_order())
+        print(f'   InventoryManager index  {elapsed:6.2f} s   {row_count / elapsed:12,.0f} rows/s')
+
+def benchmark_query(row_count, repeat=100):
+    rows = generate_rows(row_count)
+    engine = InventoryQueryEngine(HEADERS, rows)
+    queries = [
+        ('substance prefix', [StartsWith('Substance', 'substance 12345')]),
+        ('strength + gravity', [Equals('Strength', 'Very high'), Between('Specific Gravity', 19.9, 19.95)]),
+        ('prefix + strength + flammability', [StartsWith('Substance', 'substance 9999'),
+                                              Equals('Strength', 'High'), Between('Flammability', 0.5)]),
+        ('flammability >= 0.99 + weight', [Between('Flammability', 0.99), Between('Weight (g/cm³)', None, 0.5)]),
+    ]
+    print(f'>> multi-column queries on {row_count:,} rows')
+    start = time.perf_counter()
+    for _, predicates in queries: # 인덱스는 처음 질의할 때 만들어진다
+        engine.query_ids(*predicates)
+    print(f'   index build (once): {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    for name, predicates in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = engine.query(*predicates)
+        elapsed = (time.perf_counter() - start) / repeat
+        scan_elapsed, expected = measure(lambda: [row for row_id, row in enumerate(rows)
+                                                  if all(p.matches(engine, row_id) for p in predicates)])
+        same = 'identical' if result == expected else 'DIFFERENT'
+        print(f'   {name:<34} {len(result):>6,} rows   indexed {elapsed * 1000:8.3f} ms'
+              f'   full scan {scan_elapsed * 1000:9.1f} ms   {same}')
+        print(f'      plan: {" -> ".join(engine.explain(*predicates))}')
+
+def measure_peak_memory(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def benchmark_pipeline(row_count, threshold=0.7, top_k=100):
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'inventory.csv')
+        output_path = os.path.join(work_dir, 'danger.csv')
+        write_csv(csv_path, HEADERS, generate_rows(row_count))
+        fm = FileManager(csv_path, None, output_path)
+
+        def in_memory():
+            headers, data_list, numeric_columns = fm.parse_csv_typed()
+            im = InventoryManager(headers, data_list, numeric_columns)
+            im.sort_by_flammability_desc()
+            fm.write_into_csv_file(headers, im.filter_by_flammability(threshold))
+
+        def streaming():
+            headers, rows = fm.stream_csv_rows()
+            fm.write_into_csv_file(headers, filter_by_flammability(headers, rows, threshold))
+
+        def streaming_top_k():
+            headers, rows = fm.stream_csv_rows()
+            fm.write_into_csv_file(headers, top_k_by_flammability(
+                headers, filter_by_flammability(headers, rows, threshold), top_k))
+
+        print(f'>> danger report pipeline on {row_count:,} rows (tracemalloc peak)')
+        for name, func in (('in-memory', in_memory), ('streaming', streaming), (f'top-{top_k}', streaming_top_k)):
+            elapsed, peak_mb = measure_peak_memory(func)
+            print(f'   {name:<10} {elapsed:6.2f} s   peak {peak_mb:8.2f} MB')
+
+def benchmark_incremental(row_count, changed_rows=10, threshold=0.7):
+    rows = generate_rows(row_count)
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'inventory.csv')
+        fm = FileManager(csv_path, os.path.join(work_dir, 'inventory.bin'), os.path.join(work_dir, 'danger.csv'))
+        cache = InventoryOutputCache(fm, threshold, os.path.join(work_dir, 'manifest.json'))
+        write_csv(csv_path, HEADERS, rows)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()): # 저장 메시지는 출력하지 않는다
+                return cache.run()
+
+        print(f'>> incremental inventory job on {row_count:,} rows')
+        elapsed, result = measure(run)
+        print(f'   first run             {elapsed * 1000:9.1f} ms   ({result})')
+        elapsed, result = measure(run)
+        print(f'   unchanged input       {elapsed * 1000:9.1f} ms   ({result})')
+        os.utime(csv_path) # 내용은 같고 mtime만 바뀐 경우
+        elapsed, result = measure(run)
+        print(f'   touched input         {elapsed * 1000:9.1f} ms   ({result})')
+
+        rng = random.Random(0)
+        for _ in range(changed_rows):
+            rows[rng.randrange(row_count)][-1] = str(round(rng.random(), 2))
+        write_csv(csv_path, HEADERS, rows)
+        elapsed, result = measure(run)
+        print(f'   {changed_rows} rows changed        {elapsed * 1000:9.1f} ms   ({result})')
+        os.remove(cache.manifest_path)
+        elapsed, result = measure(run)
+        print(f'   full regeneration     {elapsed * 1000:9.1f} ms   ({result})')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mars 인벤토리 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[80, 100_000, 1_000_000])
+    parser.add_argument('--flammability', type=int, default=None, metavar='ROWS',
+                        help='포맷 비교 대신 Flammability 임계값 질의를 측정 (예: 1000000)')
+    parser.add_argument('--ingest', type=int, default=None, metavar='ROWS',
+                        help='CSV 적재 처리량(rows/s)을 측정 (예: 1000000)')
+    parser.add_argument('--query', type=int, default=None, metavar='ROWS',
+                        help='다중 컬럼 질의 엔진을 측정 (예: 1000000)')
+    parser.add_argument('--pipeline', type=int, default=None, metavar='ROWS',
+                        help='위험 물질 보고서 파이프라인의 메모리 사용량을 측정 (예: 200000)')
+    parser.add_argument('--incremental', type=int, default=None, metavar='ROWS',
+                        help='변경 감지 캐시(manifest)를 쓰는 반복 실행 시간을 측정 (예: 1000000)')
+    args = parser.parse_args()
+    if args.incremental:
+        benchmark_incremental(args.incremental)
+    elif args.pipeline:
+        benchmark_pipeline(args.pipeline)
+    elif args.query:
+        benchmark_query(args.query)
+    elif args.ingest:
+        benchmark_ingest(args.ingest)
+    elif args.flammability:
+        benchmark_flammability(args.flammability)
+    else:
+        for row_count in args.rows:
+            benchmark_formats(row_count)
@@ -1,3 +1,15 @@
+import csv
+from array import array
+
+from inventory_binary import (
+    TYPE_FLOAT,
+    InventoryBinaryView,
+    infer_column_types,
+    parse_number,
+    row_to_text,
+    write_inventory_binary,
+)
+
 class FileManager:
     def __init__(self, csv_file, binary_file, filtered_csv_file):
         self.csv_file = csv_file
@@ -6,15 +18,16 @@ class FileManager:
 
     def parse_csv_to_list(self):
         # CSV 파일을 읽어 헤더와 데이터 리스트를 반환
+        # csv 모듈을 사용하므로 따옴표로 감싼 필드("a, b")도 올바르게 읽는다
         data_list = []
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as f:
-                first_line = f.readline()
-                headers = [field.strip() for field in first_line.strip().split(',')]
-                for line in f:
-                    row_data = line.strip().split(',')
-                    row_data = [field.strip() for field in row_data]
-                    data_list.append(row_data)
+            with open(self.csv_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                headers = [field.strip() for field in next(reader, [])]
+                for row_data in reader:
+                    if not row_data:
+                        continue # 빈 줄
+                    data_list.append([field.strip() for field in row_data])
             return headers, data_list
         except FileNotFoundError:
             print(f'파일을 찾을 수 없습니다: {self.csv_file}')
@@ -29,11 +42,63 @@ class FileManager:
             print(f'알 수 없는 에러가 발생했습니다: {e}')
             exit(99)
 
-    def write_into_binary_file(self, data):
-        # 정렬된 데이터를 이진 파일에 저장
+    def stream_csv_rows(self):
+        # 헤더와 행 generator를 반환 (파일 전체를 메모리에 올리지 않고 한 행씩 읽는다)
+        # 읽기/형식 오류는 generator 안에서 입력 파일 기준으로 알리고 종료한다 (쓰는 쪽 오류로 보이지 않게)
+        try:
+            f = open(self.csv_file, 'r', encoding='utf-8', newline='')
+            reader = csv.reader(f)
+            headers = [field.strip() for field in next(reader, [])]
+        except FileNotFoundError:
+            print(f'파일을 찾을 수 없습니다: {self.csv_file}')
+            exit(1)
+        except PermissionError:
+            print(f'파일을 열 권한이 없습니다: {self.csv_file}')
+            exit(1)
+        except UnicodeDecodeError:
+            print(f'읽을 수 없는 형식입니다: {self.csv_file}')
+            exit(1)
+
+        def rows():
+            try:
+                with f:
+                    for row_data in reader:
+                        if not row_data:
+                            continue # 빈 줄
+                        if len(row_data) != len(headers):
+                            print(f'열 개수가 헤더와 다릅니다: {self.csv_file} ({reader.line_num}번째 줄)')
+                            exit(1)
+                        yield [field.strip() for field in row_data]
+            except (UnicodeDecodeError, csv.Error):
+                print(f'읽을 수 없는 형식입니다: {self.csv_file}')
+                exit(1)
+
+        return headers, rows()
+
+    def parse_csv_typed(self):
+        # CSV를 읽으면서 숫자 컬럼을 한 번에 float 배열로 변환해 둔다
+        # 숫자가 아닌 값('Various' 등)은 NaN이 되므로 이후 float() 변환 오류가 생기지 않는다
+        headers, data_list = self.parse_csv_to_list()
+        column_types = infer_column_types(headers, data_list)
+        numeric_columns = {}
+        for i, (header, column_type) in enumerate(zip(headers, column_types)):
+            if column_type != TYPE_FLOAT:
+                continue
+            converted = {} # 같은 문자열은 한 번만 변환 ('Various', '0.85' 등 반복이 많다)
+            values = array('d')
+            for row in data_list:
+                text = row[i]
+                value = converted.get(text)
+                if value is None:
+                    value = converted[text] = parse_number(text)
+                values.append(value)
+            numeric_columns[header] = values
+        return headers, data_list, numeric_columns
+
+    def write_into_binary_file(self, headers, data):
+        # 정렬된 데이터를 고정 스키마 이진 형식으로 저장 (숫자 컬럼은 float64, 문자열은 길이 + UTF-8)
         try:
-            with open(self.binary_file, 'wb') as bin_file:
-                bin_file.write(bytes(str(data), 'utf-8'))
+            write_inventory_binary(self.binary_file, headers, data)
             print('>> 바이너리 파일이 저장되었습니다.')
         except Exception as e:
             print(f'>> 바이너리 파일 저장 중 오류 발생: {e}')
@@ -42,23 +107,24 @@ class FileManager:
     def write_into_csv_file(self, headers, filtered_rows):
         # 필터링 된 데이터를 CSV 파일로 저장
         try:
-            with open(self.filtered_csv_file, 'w', encoding='utf-8') as f_out:
-                f_out.write(','.join(headers) + '\n')
-                for row in filtered_rows:
-                    f_out.write(','.join(row) + '\n')
+            with open(self.filtered_csv_file, 'w', encoding='utf-8', newline='') as f_out:
+                # 쉼표나 따옴표가 들어 있는 필드만 따옴표로 감싼다
+                writer = csv.writer(f_out, lineterminator='\n')
+                writer.writerow(headers)
+                writer.writerows(filtered_rows)
             print('>> 필터링 된 CSV 파일이 저장되었습니다.')
         except Exception as e:
             print(f'CSV 파일 저장 중 오류 발생: {e}')
             exit(1)
 
     def read_and_print_binary_file(self, file_path):
-        # 저장된 이진 파일을 읽어 원본 문자열 그대로 출력
+        # 저장된 이진 파일을 mmap으로 열어 파일 전체를 메모리에 올리지 않고 한 행씩 출력
         try:
-            with open(file_path, 'rb') as bin_file:
-                binary_data = bin_file.read()
-                inventory_str = binary_data.decode('utf-8')
+            with InventoryBinaryView(file_path) as rows:
                 print('>> 바이너리 파일')
-                print(inventory_str)
+                print(', '.join(rows.headers))
+                for row in rows:
+                    print(', '.join(row_to_text(row, rows.column_types)))
         except Exception as e:
             print(f'>> 바이너리 파일 읽기 중 오류 발생: {e}')
             exit(1)
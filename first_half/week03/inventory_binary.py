@@ -0,0 +1,280 @@
+import math
+import mmap
+import struct
+from collections.abc import Sequence
+
+# Mars 인벤토리 바이너리 형식
+#   헤더        magic(8s), 행 수(Q), 컬럼 수(H)
+#   컬럼 표     컬럼마다 타입(B), 이름 길이(H), UTF-8 이름
+#   행 위치 표  행마다 시작 offset(Q), 마지막에 파일 끝 offset 하나 더 (행 N을 바로 찾기 위함)
+#   행 데이터   숫자 컬럼은 float64(d), 문자열 컬럼은 길이(H) + UTF-8 바이트
+BINARY_MAGIC = b'MINVBIN1'
+HEADER_FORMAT = '<8sQH'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+COLUMN_FORMAT = '<BH'
+COLUMN_SIZE = struct.calcsize(COLUMN_FORMAT)
+OFFSET_FORMAT = '<Q'
+OFFSET_SIZE = struct.calcsize(OFFSET_FORMAT)
+FLOAT_FORMAT = '<d'
+FLOAT_SIZE = struct.calcsize(FLOAT_FORMAT)
+LENGTH_FORMAT = '<H'
+LENGTH_SIZE = struct.calcsize(LENGTH_FORMAT)
+FLOAT_STRUCT = struct.Struct(FLOAT_FORMAT)
+LENGTH_STRUCT = struct.Struct(LENGTH_FORMAT)
+
+TYPE_STRING = 0
+TYPE_FLOAT = 1
+
+# 숫자 컬럼에서 값이 없거나 숫자가 아닌 항목 ('Various' 등)은 NaN으로 저장하고 이 문자열로 되돌린다
+MISSING_VALUE_TEXT = 'Various'
+MISSING_VALUES = (MISSING_VALUE_TEXT, '')
+
+def parse_number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+def format_number(value):
+    # float를 CSV에 있던 모양으로 되돌린다 (0.0 -> '0', NaN -> 'Various')
+    if math.isnan(value):
+        return MISSING_VALUE_TEXT
+    text = repr(value)
+    return text[:-2] if text.endswith('.0') else text
+
+def is_exact_number(value):
+    # float로 저장했다가 format_number로 되돌려도 같은 문자열인지 ('0.50', '1e2', '' 등은 아님)
+    return format_number(parse_number(value)) == value
+
+def infer_column_types(headers, rows, exact=False):
+    # 모든 값이 숫자이거나 빈 값('Various')인 컬럼은 float, 나머지는 문자열로 저장
+    # exact: 바이너리 파일용. 원래 문자열로 되돌아오지 않는 값이 하나라도 있으면 문자열 컬럼으로 둔다
+    missing_values = (MISSING_VALUE_TEXT,) if exact else MISSING_VALUES
+    types = []
+    for i in range(len(headers)):
+        checked = set(missing_values) # 이미 숫자임을 확인한 값은 다시 변환하지 않는다
+        has_number = False
+        is_numeric = True
+        for row in rows:
+            value = row[i]
+            if value in checked:
+                continue
+            if not is_exact_number(value) if exact else math.isnan(parse_number(value)):
+                is_numeric = False
+                break
+            checked.add(value)
+            has_number = True
+        types.append(TYPE_FLOAT if is_numeric and has_number else TYPE_STRING)
+    return types
+
+def encode_row(row, column_types):
+    parts = []
+    for value, column_type in zip(row, column_types):
+        if column_type == TYPE_FLOAT:
+            number = value if isinstance(value, float) else parse_number(value)
+            parts.append(struct.pack(FLOAT_FORMAT, number))
+        else:
+            encoded = value.encode('utf-8')
+            parts.append(struct.pack(LENGTH_FORMAT, len(encoded)) + encoded)
+    return b''.join(parts)
+
+def write_inventory_binary(file_path, headers, rows, column_types=None):
+    column_types = column_types or infer_column_types(headers, rows, exact=True)
+    write_encoded_rows(file_path, headers, column_types, [encode_row(row, column_types) for row in rows])
+
+def write_encoded_rows(file_path, headers, column_types, encoded_rows):
+    row_offsets = [0]
+    for encoded in encoded_rows:
+        row_offsets.append(row_offsets[-1] + len(encoded))
+    write_row_chunks(file_path, headers, column_types, row_offsets, encoded_rows)
+
+def write_row_chunks(file_path, headers, column_types, row_offsets, chunks):
+    # row_offsets: 행 데이터 영역 안에서의 행 경계 (0으로 시작, 행 수 + 1개)
+    # chunks: 차례로 이어 쓰면 행 데이터 영역이 되는 바이트 조각 (여러 행을 담은 기존 파일 조각도 가능)
+    column_table = bytearray()
+    for name, column_type in zip(headers, column_types):
+        encoded_name = name.encode('utf-8')
+        column_table += struct.pack(COLUMN_FORMAT, column_type, len(encoded_name)) + encoded_name
+
+    row_count = len(row_offsets) - 1
+    data_start = HEADER_SIZE + len(column_table) + OFFSET_SIZE * (row_count + 1)
+    with open(file_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, BINARY_MAGIC, row_count, len(headers)))
+        f.write(column_table)
+        f.write(struct.pack(f'<{row_count + 1}Q', *(data_start + offset for offset in row_offsets)))
+        for chunk in chunks:
+            f.write(chunk)
+
+def read_header(buffer):
+    # 버퍼 앞부분에서 (행 수, 컬럼 이름 목록, 컬럼 타입 목록, 행 위치 표 시작)을 읽는다
+    magic, row_count, column_count = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError('Mars 인벤토리 바이너리 파일이 아닙니다.')
+    position = HEADER_SIZE
+    headers = []
+    column_types = []
+    for _ in range(column_count):
+        column_type, name_length = struct.unpack_from(COLUMN_FORMAT, buffer, position)
+        position += COLUMN_SIZE
+        headers.append(bytes(buffer[position:position + name_length]).decode('utf-8'))
+        column_types.append(column_type)
+        position += name_length
+    return row_count, headers, column_types, position
+
+def decode_row(buffer, position, column_types):
+    # 숫자 컬럼은 float, 문자열 컬럼은 str로 한 행을 읽는다
+    row = []
+    unpack_float = FLOAT_STRUCT.unpack_from
+    unpack_length = LENGTH_STRUCT.unpack_from
+    for column_type in column_types:
+        if column_type == TYPE_FLOAT:
+            row.append(unpack_float(buffer, position)[0])
+            position += FLOAT_SIZE
+        else:
+            length = unpack_length(buffer, position)[0]
+            position += LENGTH_SIZE
+            row.append(str(buffer[position:position + length], 'utf-8'))
+            position += length
+    return row
+
+def row_to_text(row, column_types):
+    return [format_number(value) if column_type == TYPE_FLOAT else value
+            for value, column_type in zip(row, column_types)]
+
+class InventoryBinaryFile:
+    # 파일 전체를 읽지 않고 행 위치 표로 N번째 행만 읽는다
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        prefix = self.file.read(64 * 1024)
+        try:
+            self.row_count, self.headers, self.column_types, self.offset_table = read_header(prefix)
+        except (ValueError, struct.error):
+            self.file.close()
+            raise ValueError('Mars 인벤토리 바이너리 파일이 아닙니다.')
+
+    def __len__(self):
+        return self.row_count
+
+    def read_row(self, index):
+        if not 0 <= index < self.row_count:
+            raise IndexError('행 번호가 범위를 벗어났습니다.')
+        self.file.seek(self.offset_table + index * OFFSET_SIZE)
+        start, end = struct.unpack('<2Q', self.file.read(OFFSET_SIZE * 2))
+        self.file.seek(start)
+        return decode_row(self.file.read(end - start), 0, self.column_types)
+
+    def read_all(self):
+        self.file.seek(self.offset_table)
+        offsets = struct.unpack(f'<{self.row_count + 1}Q', self.file.read(OFFSET_SIZE * (self.row_count + 1)))
+        data = self.file.read(offsets[-1] - offsets[0])
+        base = offsets[0]
+        return [decode_row(data, start - base, self.column_types) for start in offsets[:-1]]
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class _MappedInventory:
+    # mmap으로 연 바이너리 파일 하나를 여러 InventoryBinaryView가 함께 쓴다
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # 빈 파일
+            self.file.close()
+            raise ValueError('Mars 인벤토리 바이너리 파일이 아닙니다.')
+        self.buffer = memoryview(self.mmap)
+        try:
+            self.row_count, self.headers, self.column_types, offset_table = read_header(self.buffer)
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError('Mars 인벤토리 바이너리 파일이 아닙니다.')
+        self.offsets = self.buffer[offset_table:offset_table + OFFSET_SIZE * (self.row_count + 1)].cast('Q')
+
+    def close(self):
+        if getattr(self, 'offsets', None) is not None:
+            self.offsets.release()
+        self.buffer.release()
+        self.mmap.close()
+        self.file.close()
+
+class InventoryBinaryView(Sequence):
+    # 바이너리 인벤토리를 mmap 위의 지연(lazy) 행 시퀀스로 보여준다
+    # 슬라이싱과 컬럼 선택(project)은 새 view만 만들 뿐 데이터를 읽지 않고,
+    # 행을 꺼낼 때도 선택한 컬럼만 디코딩한다 (나머지 컬럼은 길이만 보고 건너뜀)
+    def __init__(self, file_path=None, columns=None, *, _mapped=None, _rows=None):
+        self._mapped = _mapped or _MappedInventory(file_path)
+        self._rows = _rows if _rows is not None else range(self._mapped.row_count)
+        all_headers = self._mapped.headers
+        if columns is None:
+            self._column_indices = list(range(len(all_headers)))
+        else:
+            try:
+                self._column_indices = [all_headers.index(column) for column in columns]
+            except ValueError as e:
+                raise KeyError(f'없는 컬럼입니다: {e}')
+        self.headers = [all_headers[i] for i in self._column_indices]
+        self.column_types = [self._mapped.column_types[i] for i in self._column_indices]
+        self._last_column = max(self._column_indices, default=-1)
+
+    def _derive(self, rows=None, columns=None):
+        return InventoryBinaryView(columns=columns if columns is not None else self.headers,
+                                   _mapped=self._mapped, _rows=rows if rows is not None else self._rows)
+
+    def project(self, columns):
+        # 지정한 컬럼만 읽는 view (예: view.project(['Substance', 'Flammability']))
+        return self._derive(columns=columns)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._derive(rows=self._rows[index])
+        return self._decode(self._rows[index])
+
+    def __iter__(self):
+        for row_number in self._rows:
+            yield self._decode(row_number)
+
+    def raw_rows(self, start, stop):
+        # start~stop-1번째 행을 디코딩하지 않고 (행 경계 offset 목록, 인코딩된 바이트)로 반환
+        rows = self._rows[start:stop]
+        if not isinstance(rows, range) or rows.step != 1:
+            raise ValueError('연속된 행만 읽을 수 있습니다.')
+        offsets = self._mapped.offsets[rows.start:rows.start + len(rows) + 1]
+        return offsets, self._mapped.buffer[offsets[0]:offsets[-1]]
+
+    def _decode(self, row_number):
+        buffer = self._mapped.buffer
+        column_types = self._mapped.column_types
+        position = self._mapped.offsets[row_number]
+        values = {}
+        wanted = set(self._column_indices)
+        for i in range(self._last_column + 1):
+            if column_types[i] == TYPE_FLOAT:
+                if i in wanted:
+                    values[i] = FLOAT_STRUCT.unpack_from(buffer, position)[0]
+                position += FLOAT_SIZE
+            else:
+                length = LENGTH_STRUCT.unpack_from(buffer, position)[0]
+                position += LENGTH_SIZE
+                if i in wanted:
+                    values[i] = str(buffer[position:position + length], 'utf-8')
+                position += length
+        return [values[i] for i in self._column_indices]
+
+    def close(self):
+        # 같은 파일에서 만든 모든 view가 함께 닫힌다
+        self._mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
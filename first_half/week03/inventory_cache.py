@@ -0,0 +1,387 @@
+import bisect
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+from array import array
+from collections import deque
+
+from inventory_binary import (
+    MISSING_VALUE_TEXT,
+    TYPE_FLOAT,
+    TYPE_STRING,
+    InventoryBinaryView,
+    encode_row,
+    is_exact_number,
+    parse_number,
+    write_row_chunks,
+)
+from inventory_manager import InventoryManager
+
+# 인벤토리 CSV 변경 감지 캐시
+# 마지막으로 처리한 입력/출력 파일 정보를 manifest(JSON)에, 행마다의 해시와 정렬 순서를
+# 옆의 '.rows' 파일(array)에 남겨 두고 다음 실행에서 비교한다
+#   입력 크기/mtime이 같거나 내용 해시가 같으면   -> 기존 출력 파일을 그대로 사용 (파싱하지 않음)
+#   바뀐 행이 전체의 MAX_DIFF_RATIO 이하이면    -> 바뀐 행만 파싱/인코딩하고 나머지는 기존 출력 파일의
+#                                                  바이트 조각을 그대로 이어 붙여 갱신 (행 단위 diff)
+#   그 밖의 경우 (헤더/컬럼 타입 변경, 행 순서 변경, 따옴표가 있는 CSV 등) -> 전체 재생성
+MANIFEST_FILE_NAME = '.inventory_manifest.json'
+MANIFEST_VERSION = 2
+ROW_STATE_SUFFIX = '.rows'
+MAX_DIFF_RATIO = 0.2
+DIGEST_SIZE = 8
+
+RESULT_UNCHANGED = 'unchanged'
+RESULT_DIFF = 'diff'
+RESULT_FULL = 'full'
+
+# 컬럼 값 분류 (바이너리 파일의 infer_column_types(exact=True)와 같은 기준)
+VALUE_MISSING = 0
+VALUE_NUMBER = 1
+VALUE_TEXT = 2
+
+def file_fingerprint(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def split_records(data):
+    # CSV 바이트를 (헤더 줄, 행 줄 목록)으로 나눈다
+    # 따옴표가 있으면 한 행이 여러 줄일 수 있으므로 줄 단위 비교를 하지 않는다 (None)
+    if b'"' in data or data.count(b'\r') != data.count(b'\r\n'):
+        return None
+    lines = data.split(b'\n')
+    return lines[0], [line for line in lines[1:] if line not in (b'', b'\r')] # 빈 줄은 csv.reader도 건너뜀
+
+def record_digests(records):
+    return array('Q', b''.join(hashlib.blake2b(line, digest_size=DIGEST_SIZE).digest() for line in records))
+
+def sort_key(value):
+    # InventoryManager와 같은 순서: Flammability 내림차순, NaN은 맨 뒤
+    return math.inf if math.isnan(value) else -value
+
+def classify_value(value):
+    if isinstance(value, float): # 바이너리 파일의 숫자 컬럼
+        return VALUE_MISSING if math.isnan(value) else VALUE_NUMBER
+    if value == MISSING_VALUE_TEXT:
+        return VALUE_MISSING
+    return VALUE_NUMBER if is_exact_number(value) else VALUE_TEXT
+
+def column_stats(headers, rows):
+    # 컬럼마다 [숫자 개수, 숫자가 아닌 값 개수] (diff 후에도 컬럼 타입이 그대로인지 확인하는 데 쓴다)
+    stats = []
+    for i in range(len(headers)):
+        classified = {}
+        counts = [0, 0, 0]
+        for row in rows:
+            value = row[i]
+            kind = classified.get(value)
+            if kind is None:
+                kind = classified[value] = classify_value(value)
+            counts[kind] += 1
+        stats.append([counts[VALUE_NUMBER], counts[VALUE_TEXT]])
+    return stats
+
+def parse_records(lines):
+    return [[field.strip() for field in row] for row in csv.reader(line.decode('utf-8') for line in lines)]
+
+def format_csv_rows(rows):
+    # FileManager.write_into_csv_file과 같은 형식의 CSV 바이트
+    text = io.StringIO()
+    csv.writer(text, lineterminator='\n').writerows(rows)
+    return text.getvalue().encode('utf-8')
+
+class InventoryOutputCache:
+    def __init__(self, fm, threshold, manifest_path=MANIFEST_FILE_NAME):
+        self.fm = fm
+        self.threshold = threshold
+        self.manifest_path = manifest_path
+        self.row_state_path = manifest_path + ROW_STATE_SUFFIX
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('threshold') != self.threshold:
+            return None
+        # 지난 실행 이후 출력 파일이 지워지거나 손으로 고쳐졌으면 쓰지 않는다
+        for path in (self.fm.filtered_csv_file, self.fm.binary_file):
+            try:
+                if manifest['outputs'].get(path) != file_fingerprint(path):
+                    return None
+            except FileNotFoundError:
+                return None
+        return manifest
+
+    def save_manifest(self, manifest):
+        # 임시 파일에 쓴 뒤 교체해 중간에 멈춰도 깨진 manifest가 남지 않게 한다
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def load_row_state(self, manifest):
+        # (행 해시, 정렬 순서의 행 번호, 정렬 순서의 키) 또는 None
+        if manifest.get('row_state') is None:
+            return None
+        row_count = manifest['row_count']
+        try:
+            if file_fingerprint(self.row_state_path) != manifest['row_state']:
+                return None
+            with open(self.row_state_path, 'rb') as f:
+                state = array('Q'), array('Q'), array('d')
+                for values in state:
+                    values.fromfile(f, row_count)
+                return state
+        except (OSError, EOFError):
+            return None
+
+    def save_row_state(self, digests, sorted_ids, sorted_keys):
+        temp_path = self.row_state_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            for values in (digests, sorted_ids, sorted_keys):
+                values.tofile(f)
+        os.replace(temp_path, self.row_state_path)
+        return file_fingerprint(self.row_state_path)
+
+    def read_input(self):
+        try:
+            with open(self.fm.csv_file, 'rb') as f:
+                return file_fingerprint(self.fm.csv_file), f.read()
+        except FileNotFoundError:
+            print(f'파일을 찾을 수 없습니다: {self.fm.csv_file}')
+            exit(1)
+        except PermissionError:
+            print(f'파일을 열 권한이 없습니다: {self.fm.csv_file}')
+            exit(1)
+
+    def run(self):
+        # 출력 파일을 최신 상태로 맞추고 어떤 방식으로 처리했는지 반환
+        manifest = self.load_manifest()
+        if manifest is not None:
+            try:
+                if manifest['input'] == file_fingerprint(self.fm.csv_file):
+                    return RESULT_UNCHANGED
+            except FileNotFoundError:
+                pass # read_input()에서 처리
+
+        input_fingerprint, data = self.read_input()
+        input_hash = hashlib.sha256(data).hexdigest()
+        if manifest is not None and manifest['input_sha256'] == input_hash:
+            # touch 등으로 mtime만 바뀐 경우
+            manifest['input'] = input_fingerprint
+            self.save_manifest(manifest)
+            return RESULT_UNCHANGED
+
+        split = split_records(data)
+        del data
+        digests = record_digests(split[1]) if split is not None else None
+        state = None
+        if manifest is not None and split is not None:
+            state = self.apply_diff(manifest, split[0], split[1], digests)
+        result = RESULT_DIFF if state is not None else RESULT_FULL
+        if state is None:
+            state = self.regenerate()
+            if split is None or len(split[1]) != state['row_count']:
+                digests = None # 줄과 행이 일치하지 않으면 다음 실행에서 diff를 쓰지 않는다
+
+        sorted_ids = state.pop('sorted_ids')
+        sorted_keys = state.pop('sorted_keys')
+        state.update({
+            'version': MANIFEST_VERSION,
+            'threshold': self.threshold,
+            'input': input_fingerprint,
+            'input_sha256': input_hash,
+            'outputs': {path: file_fingerprint(path) for path in (self.fm.filtered_csv_file, self.fm.binary_file)},
+            'row_state': None if digests is None else self.save_row_state(digests, sorted_ids, sorted_keys),
+        })
+        self.save_manifest(state)
+        return result
+
+    def regenerate(self):
+        # main.py와 같은 방식으로 두 출력 파일을 모두 새로 만든다
+        headers, data_list, numeric_columns = self.fm.parse_csv_typed()
+        im = InventoryManager(headers, data_list, numeric_columns)
+        im.ensure_flammability_order()
+        sorted_ids = array('Q', im.flammability_order)
+        stats = column_stats(headers, data_list)
+        im.sort_by_flammability_desc()
+        danger_rows = im.filter_by_flammability(self.threshold)
+        self.fm.write_into_csv_file(headers, danger_rows)
+        self.fm.write_into_binary_file(headers, im.data_list)
+        # flammability_keys는 -Flammability (NaN은 inf) 이므로 sort_key와 같다
+        return {'headers': headers, 'row_count': len(data_list), 'danger_count': len(danger_rows),
+                'column_stats': stats, 'sorted_ids': sorted_ids, 'sorted_keys': array('d', im.flammability_keys)}
+
+    def match_rows(self, old_digests, digests):
+        # 같은 내용의 이전 행과 앞에서부터 짝을 짓는다
+        # 반환: (이전 행 번호 -> 새 행 번호, 짝이 없으면 -1), 짝이 없는 새 행 번호 목록 (추가/수정된 행)
+        old_ids = {}
+        duplicates = {}
+        for old_id, digest in enumerate(old_digests.tolist()):
+            first = old_ids.setdefault(digest, old_id)
+            if first != old_id:
+                duplicates.setdefault(digest, deque([first])).append(old_id)
+        old_to_new = [-1] * len(old_digests)
+        changed = []
+        for new_id, digest in enumerate(digests.tolist()):
+            if digest in duplicates:
+                positions = duplicates[digest]
+                old_id = positions.popleft() if positions else None
+            else:
+                old_id = old_ids.pop(digest, None)
+            if old_id is None:
+                changed.append(new_id)
+            else:
+                old_to_new[old_id] = new_id
+        return old_to_new, changed
+
+    def apply_diff(self, manifest, header_line, records, digests):
+        # 바뀐 행만 반영해 출력 파일을 갱신하고 새 상태를 반환 (diff로 처리할 수 없으면 None)
+        row_state = self.load_row_state(manifest)
+        if row_state is None:
+            return None
+        old_digests, old_sorted_ids, old_sorted_keys = row_state
+        try:
+            headers = parse_records([header_line])[0]
+        except (UnicodeDecodeError, IndexError):
+            return None
+        if headers != manifest['headers'] or 'Flammability' not in headers:
+            return None
+
+        old_to_new, changed = self.match_rows(old_digests, digests)
+        removed = []
+        last = -1
+        for old_id, new_id in enumerate(old_to_new):
+            if new_id < 0:
+                removed.append(old_id)
+            elif new_id < last:
+                return None # 행 순서가 바뀌면 이전 정렬 결과를 재사용할 수 없다
+            else:
+                last = new_id
+        if len(changed) + len(removed) > MAX_DIFF_RATIO * max(len(records), 1):
+            return None
+        try:
+            changed_rows = parse_records(records[new_id] for new_id in changed)
+        except UnicodeDecodeError:
+            return None
+        if any(len(row) != len(headers) for row in changed_rows):
+            return None
+
+        try:
+            old_view = InventoryBinaryView(self.fm.binary_file)
+        except (OSError, ValueError):
+            return None
+        with old_view:
+            if old_view.headers != headers or len(old_view) != len(old_digests):
+                return None
+            column_types = old_view.column_types
+
+            # 지워진 행의 정렬 위치, 바뀐 행 반영 후에도 컬럼 타입이 그대로인지 확인
+            removed_set = set(removed)
+            removed_positions = [position for position, old_id in enumerate(old_sorted_ids) if old_id in removed_set]
+            stats = [list(counts) for counts in manifest['column_stats']]
+            for rows, sign in (((old_view[p] for p in removed_positions), -1), (changed_rows, 1)):
+                for row in rows:
+                    for i, value in enumerate(row):
+                        kind = classify_value(value)
+                        if kind != VALUE_MISSING:
+                            stats[i][kind - 1] += sign
+            if [TYPE_FLOAT if text == 0 and number > 0 else TYPE_STRING for number, text in stats] != column_types:
+                return None
+
+            # 새 행이 들어갈 정렬 위치: 키가 같은 구간 안에서 CSV 순서로 앞선 행들 뒤
+            # 이전 행 번호로 비교하기 위해 새 행 번호 n을 '새 행 n 뒤에 오는 첫 남은 행의 이전 번호'로 바꾼다
+            flammability = headers.index('Flammability')
+            inserts = []
+            skipped = 0
+            for count, (new_id, row) in enumerate(zip(changed, changed_rows)):
+                kept_before = new_id - count
+                while skipped < len(removed) and removed[skipped] <= kept_before + skipped:
+                    skipped += 1
+                bound = kept_before + skipped
+                key = sort_key(parse_number(row[flammability]))
+                low = bisect.bisect_left(old_sorted_keys, key)
+                high = bisect.bisect_right(old_sorted_keys, key, low)
+                position = bisect.bisect_left(old_sorted_ids, bound, low, high)
+                inserts.append((position, 0, key, new_id, row))
+            events = sorted(inserts + [(position, 1) for position in removed_positions])
+
+            # 기존 파일을 이어 붙일 조각과 새 행을 차례로 모은다
+            danger_count = manifest['danger_count']
+            old_danger = self.read_danger_lines(danger_count)
+            if old_danger is None:
+                return None
+            state = {'sorted_ids': array('Q'), 'sorted_keys': array('d'), 'row_offsets': [0],
+                     'chunks': [], 'danger_chunks': [old_danger[0]], 'danger_count': 0}
+
+            cursor = 0
+            for event in events:
+                position = event[0]
+                if cursor < position:
+                    self.copy_rows(state, old_view, old_to_new, old_sorted_ids, old_sorted_keys,
+                                   old_danger, cursor, position)
+                if event[1] == 0:
+                    _, _, key, new_id, row = event
+                    self.add_row(state, column_types, key, new_id, row)
+                    cursor = position
+                else:
+                    cursor = position + 1
+            if cursor < len(old_sorted_ids):
+                self.copy_rows(state, old_view, old_to_new, old_sorted_ids, old_sorted_keys,
+                               old_danger, cursor, len(old_sorted_ids))
+
+            temp_path = self.fm.binary_file + '.tmp'
+            write_row_chunks(temp_path, headers, column_types, state['row_offsets'], state['chunks'])
+            for chunk in state.pop('chunks'):
+                if isinstance(chunk, memoryview):
+                    chunk.release() # mmap을 닫기 전에 풀어야 한다
+        os.replace(temp_path, self.fm.binary_file)
+
+        temp_path = self.fm.filtered_csv_file + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.writelines(state.pop('danger_chunks'))
+        os.replace(temp_path, self.fm.filtered_csv_file)
+        print(f'>> 바뀐 행 {len(changed)}개, 지워진 행 {len(removed)}개만 출력 파일에 반영했습니다.')
+
+        del state['row_offsets']
+        state.update({'headers': headers, 'row_count': len(records), 'column_stats': stats})
+        return state
+
+    def read_danger_lines(self, danger_count):
+        # 이전 위험 물질 CSV를 줄 단위로 읽는다 (헤더 줄 + 정렬 순서의 행 줄들, 줄바꿈 포함)
+        try:
+            with open(self.fm.filtered_csv_file, 'rb') as f:
+                lines = f.read().split(b'\n')
+        except OSError:
+            return None
+        if len(lines) != danger_count + 2 or lines[-1] != b'':
+            return None
+        return [line + b'\n' for line in lines[:-1]]
+
+    def copy_rows(self, state, old_view, old_to_new, old_sorted_ids, old_sorted_keys, old_danger, start, stop):
+        # 바뀌지 않은 정렬 위치 start~stop-1 행을 기존 출력 파일에서 그대로 가져온다
+        state['sorted_ids'].extend(old_to_new[old_id] for old_id in old_sorted_ids[start:stop])
+        state['sorted_keys'].extend(old_sorted_keys[start:stop])
+        offsets, data = old_view.raw_rows(start, stop)
+        base = state['row_offsets'][-1] - offsets[0]
+        state['row_offsets'].extend(base + offset for offset in offsets[1:])
+        offsets.release()
+        state['chunks'].append(data)
+        danger_stop = min(stop, len(old_danger) - 1)
+        if start < danger_stop:
+            state['danger_chunks'].extend(old_danger[start + 1:danger_stop + 1])
+            state['danger_count'] += danger_stop - start
+
+    def add_row(self, state, column_types, key, new_id, row):
+        state['sorted_ids'].append(new_id)
+        state['sorted_keys'].append(key)
+        encoded = encode_row(row, column_types)
+        state['row_offsets'].append(state['row_offsets'][-1] + len(encoded))
+        state['chunks'].append(encoded)
+        if key <= -self.threshold: # Flammability >= threshold (NaN은 inf라 제외)
+            state['danger_chunks'].append(format_csv_rows([row]))
+            state['danger_count'] += 1
@@ -1,8 +1,20 @@
+import bisect
+import math
+from array import array
+
+from inventory_binary import parse_number
+
 class InventoryManager:
-    def __init__(self, headers, data_list):
+    def __init__(self, headers, data_list, numeric_columns=None):
         self.headers = headers
         self.data_list = data_list
+        # FileManager.parse_csv_typed()가 미리 변환한 숫자 컬럼 {헤더: float 배열}
+        self.numeric_columns = numeric_columns or {}
         self.flammability_index = self.get_flammability_index()
+        # Flammability 내림차순 정렬 인덱스 (처음 사용할 때 한 번만 만든다)
+        self.flammability_order = None # 내림차순으로 정렬된 행 번호
+        self.flammability_keys = None  # 위 순서의 Flammability 값에 -를 붙인 오름차순 배열 (bisect용)
+        self.is_sorted_desc = False
 
     def get_flammability_index(self):
         try:
@@ -11,14 +23,45 @@ class InventoryManager:
             print('>> Flammability 헤더를 찾을 수 없습니다.')
             exit(1)
 
+    def get_numeric_column(self, header):
+        # 미리 변환된 숫자 컬럼이 없으면 한 번만 변환해 둔다 (숫자가 아닌 값은 NaN)
+        values = self.numeric_columns.get(header)
+        if values is None or len(values) != len(self.data_list):
+            column = self.headers.index(header)
+            values = array('d', (parse_number(row[column]) for row in self.data_list))
+            self.numeric_columns[header] = values
+        return values
+
+    def build_flammability_order(self):
+        # Flammability 값으로 내림차순(같은 값은 원래 순서) 인덱스를 만든다
+        # 값이 NaN인 행('Various')은 가장 뒤에 두고 어떤 임계값에도 걸리지 않게 한다
+        values = self.get_numeric_column(self.headers[self.flammability_index])
+        keys = [-math.inf if math.isnan(value) else value for value in values]
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+        self.flammability_order = array('Q', order)
+        self.flammability_keys = array('d', (-keys[i] for i in order))
+
+    def ensure_flammability_order(self):
+        if self.flammability_order is None or len(self.flammability_order) != len(self.data_list):
+            self.build_flammability_order()
+
     def sort_by_flammability_desc(self):
         # 데이터 리스트를 Flammability 값을 기준으로 내림차순 정렬
-        self.data_list = sorted(
-            self.data_list,
-            key=lambda row: float(row[self.flammability_index]),
-            reverse=True
-        )
+        self.ensure_flammability_order()
+        order = self.flammability_order
+        self.data_list = [self.data_list[i] for i in order]
+        for header, values in self.numeric_columns.items():
+            self.numeric_columns[header] = array('d', (values[i] for i in order))
+        # 정렬 후에는 행 번호가 곧 내림차순 순서가 된다
+        self.flammability_order = array('Q', range(len(self.data_list)))
+        self.is_sorted_desc = True
 
     def filter_by_flammability(self, threshold):
-        # Flammability 값이 threshold 이상인 행들만 반환
-        return [row for row in self.data_list if float(row[self.flammability_index]) >= threshold]
+        # Flammability 값이 threshold 이상인 행들만 반환 (이진 탐색 + 슬라이스, O(log n + k))
+        self.ensure_flammability_order()
+        count = bisect.bisect_right(self.flammability_keys, -threshold)
+        if self.is_sorted_desc:
+            # 정렬된 상태면 앞에서부터 count개가 곧 결과
+            return self.data_list[:count]
+        # 정렬 전이면 기존처럼 data_list 순서대로 반환
+        return [self.data_list[i] for i in sorted(self.flammability_order[:count])]
@@ -0,0 +1,33 @@
+import heapq
+import math
+
+from inventory_binary import parse_number
+
+# 위험 물질 보고서를 위한 generator 기반 파이프라인 (읽기 -> 파싱 -> 필터 -> 쓰기)
+# 전체 행 목록을 만들지 않으므로 메모리 사용량이 입력 크기와 무관하다
+
+def filter_by_flammability(headers, rows, threshold):
+    # Flammability 값이 threshold 이상인 행만 입력 순서대로 흘려보낸다 (숫자가 아닌 값은 제외)
+    column = headers.index('Flammability')
+    for row in rows:
+        if parse_number(row[column]) >= threshold:
+            yield row
+
+def top_k_by_flammability(headers, rows, k):
+    # Flammability가 가장 큰 K개 행만 힙에 유지해 내림차순으로 반환 (메모리 O(K))
+    # 같은 값이면 먼저 나온 행이 앞에 오므로 전체 정렬 후 앞에서 K개를 자른 결과와 같다
+    if k <= 0:
+        return []
+    column = headers.index('Flammability')
+    heap = [] # (값, -입력 순서, 행) 최소 힙: 가장 작은 값, 같은 값 중에서는 가장 늦게 나온 행이 맨 위
+    for sequence, row in enumerate(rows):
+        value = parse_number(row[column])
+        if math.isnan(value):
+            continue
+        item = (value, -sequence, row)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+    heap.sort(key=lambda item: item[:2], reverse=True)
+    return [row for _, _, row in heap]
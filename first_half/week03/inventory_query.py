@@ -0,0 +1,184 @@
+import bisect
+import math
+import re
+from array import array
+
+from inventory_binary import TYPE_FLOAT, infer_column_types, parse_number
+
+# 인벤토리 다중 컬럼 질의 엔진
+# 컬럼 종류에 맞는 인덱스를 처음 사용할 때 만든다
+#   문자열 컬럼 일치(Equals)        값 -> 행 번호 배열 (hash)
+#   문자열 컬럼 접두사(StartsWith)  소문자 값으로 정렬한 배열 + bisect (trie와 같은 접두사 범위 탐색)
+#   숫자 컬럼 범위(Between)         값으로 정렬한 배열 + bisect (NaN은 제외)
+# 여러 조건은 AND로 묶이며, 예상 결과 수가 가장 적은 조건의 인덱스로 후보를 뽑고
+# 나머지 조건은 후보 행에서만 확인한다
+# 조건 클래스는 모두 estimate(engine) (예상 결과 행 수), candidates(engine) (인덱스로 찾은 행 번호),
+# matches(engine, row_id)를 가진다
+PREDICATE_PATTERN = re.compile(r'^(.+?)(\^=|>=|<=|=)(.*)$')
+
+class Equals:
+    def __init__(self, column, value):
+        self.column = column
+        self.value = value
+
+    def estimate(self, engine):
+        return len(engine.hash_index(self.column).get(self.value, ()))
+
+    def candidates(self, engine):
+        return engine.hash_index(self.column).get(self.value, array('Q'))
+
+    def matches(self, engine, row_id):
+        return engine.data_list[row_id][engine.column_position(self.column)] == self.value
+
+    def __repr__(self):
+        return f'Equals({self.column!r}, {self.value!r})'
+
+class StartsWith:
+    # 대소문자를 구분하지 않는 접두사 조건
+    def __init__(self, column, prefix):
+        self.column = column
+        self.prefix = prefix.lower()
+
+    def _bounds(self, engine):
+        keys, _ = engine.prefix_index(self.column)
+        low = bisect.bisect_left(keys, self.prefix)
+        high = bisect.bisect_left(keys, self.prefix + '\U0010ffff')
+        return low, high
+
+    def estimate(self, engine):
+        low, high = self._bounds(engine)
+        return high - low
+
+    def candidates(self, engine):
+        low, high = self._bounds(engine)
+        return engine.prefix_index(self.column)[1][low:high]
+
+    def matches(self, engine, row_id):
+        return engine.data_list[row_id][engine.column_position(self.column)].lower().startswith(self.prefix)
+
+    def __repr__(self):
+        return f'StartsWith({self.column!r}, {self.prefix!r})'
+
+class Between:
+    # low <= 값 <= high 인 숫자 조건 (None이면 그쪽 범위 제한 없음)
+    def __init__(self, column, low=None, high=None):
+        self.column = column
+        self.low = -math.inf if low is None else low
+        self.high = math.inf if high is None else high
+
+    def _bounds(self, engine):
+        keys, _ = engine.sorted_index(self.column)
+        return bisect.bisect_left(keys, self.low), bisect.bisect_right(keys, self.high)
+
+    def estimate(self, engine):
+        low, high = self._bounds(engine)
+        return max(high - low, 0)
+
+    def candidates(self, engine):
+        low, high = self._bounds(engine)
+        return engine.sorted_index(self.column)[1][low:high]
+
+    def matches(self, engine, row_id):
+        return self.low <= engine.numeric_column(self.column)[row_id] <= self.high
+
+    def __repr__(self):
+        return f'Between({self.column!r}, {self.low!r}, {self.high!r})'
+
+def parse_predicate(text):
+    # '컬럼=값', '컬럼^=접두사', '컬럼>=수', '컬럼<=수' 를 조건으로 바꾼다 (형식이 틀리면 ValueError)
+    match = PREDICATE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f'조건 형식이 아닙니다: {text}')
+    column, operator, value = (part.strip() for part in match.groups())
+    if operator == '=':
+        return Equals(column, value)
+    if operator == '^=':
+        return StartsWith(column, value)
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f'숫자가 아닙니다: {text}')
+    return Between(column, low=number) if operator == '>=' else Between(column, high=number)
+
+class InventoryQueryEngine:
+    def __init__(self, headers, data_list, numeric_columns=None):
+        self.headers = headers
+        self.data_list = data_list
+        self.numeric_columns = dict(numeric_columns or {})
+        self.column_types = dict(zip(headers, infer_column_types(headers, data_list)))
+        self.positions = {header: i for i, header in enumerate(headers)}
+        self._hash_indexes = {}
+        self._prefix_indexes = {}
+        self._sorted_indexes = {}
+
+    def column_position(self, column):
+        try:
+            return self.positions[column]
+        except KeyError:
+            raise KeyError(f'없는 컬럼입니다: {column}')
+
+    def numeric_column(self, column):
+        values = self.numeric_columns.get(column)
+        if values is None:
+            position = self.column_position(column)
+            if self.column_types[column] != TYPE_FLOAT:
+                raise ValueError(f'숫자 컬럼이 아닙니다: {column}')
+            values = array('d', (parse_number(row[position]) for row in self.data_list))
+            self.numeric_columns[column] = values
+        return values
+
+    def hash_index(self, column):
+        index = self._hash_indexes.get(column)
+        if index is None:
+            position = self.column_position(column)
+            index = {}
+            for row_id, row in enumerate(self.data_list):
+                row_ids = index.get(row[position])
+                if row_ids is None:
+                    row_ids = index[row[position]] = array('Q')
+                row_ids.append(row_id)
+            self._hash_indexes[column] = index
+        return index
+
+    def prefix_index(self, column):
+        index = self._prefix_indexes.get(column)
+        if index is None:
+            position = self.column_position(column)
+            lowered = [row[position].lower() for row in self.data_list]
+            order = sorted(range(len(lowered)), key=lowered.__getitem__)
+            index = ([lowered[i] for i in order], array('Q', order))
+            self._prefix_indexes[column] = index
+        return index
+
+    def sorted_index(self, column):
+        index = self._sorted_indexes.get(column)
+        if index is None:
+            values = self.numeric_column(column)
+            order = sorted((i for i in range(len(values)) if not math.isnan(values[i])), key=values.__getitem__)
+            index = (array('d', (values[i] for i in order)), array('Q', order))
+            self._sorted_indexes[column] = index
+        return index
+
+    def plan(self, predicates):
+        # 예상 결과 수가 가장 적은 조건을 먼저 인덱스로 사용
+        estimates = sorted(((predicate.estimate(self), i) for i, predicate in enumerate(predicates)))
+        return [(predicates[i], estimate) for estimate, i in estimates]
+
+    def explain(self, *predicates):
+        return [f'{predicate!r} ~{estimate} rows' for predicate, estimate in self.plan(list(predicates))]
+
+    def query_ids(self, *predicates):
+        # 모든 조건을 만족하는 행 번호를 data_list 순서로 반환
+        if not predicates:
+            return list(range(len(self.data_list)))
+        planned = self.plan(list(predicates))
+        driver, _ = planned[0]
+        rest = [predicate for predicate, _ in planned[1:]]
+        row_ids = list(driver.candidates(self))
+        for predicate in rest:
+            row_ids = [row_id for row_id in row_ids if predicate.matches(self, row_id)]
+        row_ids.sort()
+        return row_ids
+
+    def query(self, *predicates):
+        return [self.data_list[row_id] for row_id in self.query_ids(*predicates)]
@@ -1,9 +1,15 @@
+import argparse
+
 from file_manager import FileManager
+from inventory_cache import RESULT_UNCHANGED, InventoryOutputCache
 from inventory_manager import InventoryManager
+from inventory_pipeline import filter_by_flammability, top_k_by_flammability
+from inventory_query import InventoryQueryEngine, parse_predicate
 
 INVENTORY_LIST_FILE_NAME = 'Mars_Base_Inventory_List.csv'
 FILTERED_CSV_FILE_NAME = 'Mars_Base_Inventory_danger.csv'
 BINARY_OUTPUT_FILE_NAME = 'Mars_Base_Inventory_List.bin'
+FLAMMABILITY_THRESHOLD = 0.7 # 인화성 임계값
 
 def print_list(headers, list):
     print(', '.join(headers))
@@ -11,22 +17,86 @@ def print_list(headers, list):
         print(', '.join(row))
     print()
 
+def run_streaming(fm, threshold, top_k=None):
+    # 전체 목록을 메모리에 올리지 않고 위험 물질 CSV만 만든다
+    # top_k를 주면 인화성 상위 K개만 힙에 유지해 내림차순으로 저장 (메모리 O(K))
+    headers, rows = fm.stream_csv_rows()
+    if 'Flammability' not in headers:
+        print('>> Flammability 헤더를 찾을 수 없습니다.')
+        exit(1)
+    dangerous_rows = filter_by_flammability(headers, rows, threshold)
+    if top_k is not None:
+        dangerous_rows = top_k_by_flammability(headers, dangerous_rows, top_k)
+    fm.write_into_csv_file(headers, dangerous_rows)
+
+def run_query(fm, conditions):
+    # 인덱스를 쓰는 질의 엔진으로 모든 조건(AND)을 만족하는 행을 출력
+    try:
+        predicates = [parse_predicate(condition) for condition in conditions]
+        headers, data_list, numeric_columns = fm.parse_csv_typed()
+        engine = InventoryQueryEngine(headers, data_list, numeric_columns)
+        plan = engine.explain(*predicates)
+        rows = engine.query(*predicates)
+    except (KeyError, ValueError) as e:
+        print(f'>> 질의 오류: {e.args[0]}')
+        exit(1)
+    print('>> Query plan')
+    for line in plan:
+        print(line)
+    print()
+    print(f'>> Query result ({len(rows)} rows)')
+    print_list(headers, rows)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Mars 기지 인벤토리 관리')
+    parser.add_argument('--stream', action='store_true',
+                        help='읽기-필터-쓰기를 한 행씩 처리해 위험 물질 CSV만 생성')
+    parser.add_argument('--top-k', type=int, default=None,
+                        help='인화성 상위 K개만 내림차순으로 저장 (--stream 모드로 실행)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='입력 CSV가 바뀌지 않았으면 기존 출력을 그대로 쓰고, 일부 행만 바뀌었으면 그 행만 반영')
+    parser.add_argument('--query', nargs='+', default=None, metavar='CONDITION',
+                        help="조건을 모두 만족하는 행 출력 (예: 'Strength=Weak' 'Substance^=so' 'Flammability>=0.5')")
+    args = parser.parse_args()
+    if args.query is not None and (args.stream or args.incremental or args.top_k is not None):
+        parser.error('--query는 다른 모드와 함께 쓸 수 없습니다.')
+    if args.top_k is not None:
+        if args.top_k < 1:
+            parser.error('--top-k는 1 이상이어야 합니다.')
+        if args.incremental:
+            parser.error('--top-k는 --incremental과 함께 쓸 수 없습니다.')
+        args.stream = True # 상위 K개는 스트리밍 모드에서만 만든다
+    return args
+
 if __name__ == '__main__':
+    args = parse_args()
     fm = FileManager(INVENTORY_LIST_FILE_NAME, BINARY_OUTPUT_FILE_NAME, FILTERED_CSV_FILE_NAME)
-    headers, data_list = fm.parse_csv_to_list()
+    if args.query is not None:
+        run_query(fm, args.query)
+        exit(0)
+    if args.stream:
+        run_streaming(fm, FLAMMABILITY_THRESHOLD, args.top_k)
+        exit(0)
+    if args.incremental:
+        result = InventoryOutputCache(fm, FLAMMABILITY_THRESHOLD).run()
+        if result == RESULT_UNCHANGED:
+            print('>> 입력 파일이 바뀌지 않아 기존 출력 파일을 그대로 사용합니다.')
+        exit(0)
+
+    headers, data_list, numeric_columns = fm.parse_csv_typed()
 
     print('>> Inventory List')
     print_list(headers, data_list)
 
-    im = InventoryManager(headers, data_list)
+    im = InventoryManager(headers, data_list, numeric_columns)
     im.sort_by_flammability_desc()
 
-    threshold = 0.7 # 인화성 임계값
+    threshold = FLAMMABILITY_THRESHOLD
     filtered_rows = im.filter_by_flammability(threshold)
 
     print('>> Flammability over', threshold)
     print_list(headers, filtered_rows)
 
     fm.write_into_csv_file(headers, filtered_rows)
-    fm.write_into_binary_file(im.data_list)
+    fm.write_into_binary_file(headers, im.data_list)
     fm.read_and_print_binary_file(BINARY_OUTPUT_FILE_NAME)
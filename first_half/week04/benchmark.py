@@ -0,0 +1,118 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from mars_mission_computer import DummySensor
+from random_time import RandomTimeGenerator, format_time
+from sensor_log import SensorLogWriter, read_binary_log
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def benchmark_generate(readings, loop_readings):
+    ds = DummySensor(seed=42)
+
+    def per_call_loop():
+        # 기존 방식: 측정마다 set_env()로 random을 6번 호출
+        rows = []
+        for _ in range(loop_readings):
+            ds.set_env()
+            rows.append(dict(ds.env_values))
+        return rows
+
+    print('>> sensor generation')
+    elapsed, _ = measure(per_call_loop)
+    print(f'   set_env loop     {loop_readings:>12,} readings {elapsed:8.3f} s   {loop_readings / elapsed:14,.0f} readings/s')
+    for count in readings:
+        elapsed, _ = measure(lambda: ds.generate(count))
+        print(f'   generate(n)      {count:>12,} readings {elapsed:8.3f} s   {count / elapsed:14,.0f} readings/s')
+
+def benchmark_logging(records):
+    ds = DummySensor(seed=42)
+    ds.set_env()
+    epoch = RandomTimeGenerator(seed=42).get_random_epoch()
+    timestamp = format_time(epoch)
+    with tempfile.TemporaryDirectory() as work_dir:
+        def open_per_record():
+            # 기존 log_sensor_data 방식: 측정마다 append 모드로 열어 6줄을 쓴다
+            path = os.path.join(work_dir, 'per_record.log')
+            for _ in range(records):
+                with open(path, 'a', encoding='utf-8') as f:
+                    for key, value in ds.env_values.items():
+                        f.write(f'[{timestamp}] {key}: {value}\n')
+            return path
+
+        def buffered(binary):
+            path = os.path.join(work_dir, 'buffered.bin' if binary else 'buffered.log')
+            with SensorLogWriter(path, binary=binary) as writer:
+                for _ in range(records):
+                    writer.write(epoch, ds.env_values) # DummySensor와 같이 epoch 초를 넘긴다
+            return path
+
+        print(f'>> sensor log writer ({records:,} records)')
+        for name, func in (('open per record', open_per_record), ('buffered text', lambda: buffered(False)),
+                           ('buffered binary', lambda: buffered(True))):
+            elapsed, path = measure(func)
+            print(f'   {name:<16} {elapsed:8.3f} s   {records / elapsed:12,.0f} records/s'
+                  f'   {os.path.getsize(path) / records:6.1f} bytes/record')
+        with open(os.path.join(work_dir, 'per_record.log'), 'rb') as f1, \
+             open(os.path.join(work_dir, 'buffered.log'), 'rb') as f2:
+            same = f1.read() == f2.read()
+        decoded = next(read_binary_log(os.path.join(work_dir, 'buffered.bin')))
+        same_binary = decoded == (epoch, ds.env_values)
+        print(f'   text output {"identical" if same else "DIFFERENT"},'
+              f' binary round trip {"ok" if same_binary else "DIFFERENT"}')
+
+def legacy_random_time():
+    # 기존 get_random_time: 달을 먼저 균등하게 고른 뒤 날짜를 고른다 (2월의 하루가 31일 달의 하루보다 자주 나온다)
+    month = random.randint(1, 12)
+    if month in (1, 3, 5, 7, 8, 10, 12):
+        day_max = 31
+    elif month == 2:
+        day_max = 28
+    else:
+        day_max = 30
+    day = random.randint(1, day_max)
+    hour = random.randint(0, 23)
+    minute = random.randint(0, 59)
+    second = random.randint(0, 59)
+    return f'2025-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}'
+
+def benchmark_timestamps(count):
+    generator = RandomTimeGenerator(seed=42)
+    print(f'>> random timestamps ({count:,})')
+    elapsed, legacy = measure(lambda: [legacy_random_time() for _ in range(count)])
+    print(f'   legacy get_random_time    {elapsed:8.3f} s   {count / elapsed:14,.0f} timestamps/s')
+    elapsed, _ = measure(lambda: [generator.get_random_time() for _ in range(count)])
+    print(f'   get_random_time           {elapsed:8.3f} s   {count / elapsed:14,.0f} timestamps/s')
+    elapsed, epochs = measure(lambda: generator.generate(count))
+    print(f'   generate (epoch)          {elapsed:8.3f} s   {count / elapsed:14,.0f} timestamps/s')
+    elapsed, _ = measure(lambda: list(map(format_time, epochs)))
+    print(f'   format all (lazy step)    {elapsed:8.3f} s   {count / elapsed:14,.0f} timestamps/s')
+
+    # 2월 비율: 날짜 기준 균등이면 28/365 = 7.67%, 기존 방식은 1/12 = 8.33%
+    february = sum(1 for text in legacy if text[5:7] == '02') / count
+    february_new = sum(1 for epoch in epochs if format_time(epoch)[5:7] == '02') / count
+    print(f'   February share: legacy {february:.2%}, generate {february_new:.2%} (expected {28 / 365:.2%})')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='DummySensor 벤치마크')
+    parser.add_argument('--readings', type=int, nargs='+', default=[100_000, 6_307_200], # 6,307,200 = 1년 (5초 간격)
+                        help='generate()로 만들 측정 횟수')
+    parser.add_argument('--loop-readings', type=int, default=100_000,
+                        help='set_env() 반복으로 만들 측정 횟수')
+    parser.add_argument('--logging', type=int, default=None, metavar='RECORDS',
+                        help='생성 대신 센서 로그 기록 속도(records/s)를 측정 (예: 200000)')
+    parser.add_argument('--timestamps', type=int, default=None, metavar='COUNT',
+                        help='임의 시각 생성 속도를 측정 (예: 1000000)')
+    args = parser.parse_args()
+    if args.timestamps:
+        benchmark_timestamps(args.timestamps)
+    elif args.logging:
+        benchmark_logging(args.logging)
+    else:
+        benchmark_generate(args.readings, args.loop_readings)
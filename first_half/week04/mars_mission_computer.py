@@ -1,9 +1,38 @@
 import random
+from array import array
+
+from random_time import RandomTimeGenerator
+from sensor_log import SensorLogWriter
 
 LOG_FILE_PATH = 'dummy_sensor.log'
 
+# generate()에서 쓰는 채널별 값 (set_env와 같은 분포)
+ILLUMINANCE_MIN = 500
+CO2_VALUES = tuple(round(0.02 + 0.01 * i, 2) for i in range(9)) # 0.02 ~ 0.1
+# round(uniform(0.02, 0.1), 2)는 양 끝 값(0.02, 0.1)이 나올 확률이 나머지의 절반이다
+# 16칸 중 양 끝은 1칸, 나머지는 2칸씩 차지하도록 한 CO2_VALUES 인덱스
+CO2_INDICES = tuple((i + 1) // 2 for i in range(16))
+
+def draw_bytes(rng, values, count):
+    # values(0~255 정수들) 중 하나를 균등하게 count개 뽑아 bytes로 반환
+    # randbytes로 받은 바이트를 translate로 한 번에 변환하고, 치우침이 없도록 나누어떨어지지 않는 구간은 버린다
+    span = len(values)
+    limit = 256 - 256 % span
+    table = bytes(values[v % span] for v in range(limit)) + bytes(256 - limit)
+    rejected = bytes(range(limit, 256))
+    drawn = bytearray()
+    while len(drawn) < count:
+        needed = count - len(drawn)
+        drawn += rng.randbytes(needed * 256 // limit + 64).translate(table, rejected)
+    return bytes(drawn[:count])
+
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None, log_writer=None):
+        self.rng = random.Random(seed) # generate()용 (seed를 주면 같은 값이 다시 나온다)
+        self.log_writer = log_writer # 없으면 처음 기록할 때 LOG_FILE_PATH로 만든다
+        # 기록할 때마다 새로 만들지 않는다 (seed를 그대로 쓰면 generate()와 같은 난수열이 되므로 따로 뽑는다)
+        time_seed = self.rng.getrandbits(64) if seed is not None else None
+        self.time_generator = RandomTimeGenerator(seed=time_seed)
         self.env_values = {
             'mars_base_internal_temperature': 0,
             'mars_base_external_temperature': 0,
@@ -21,34 +50,30 @@ class DummySensor:
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 2)  # 0.02~0.1%
         self.env_values['mars_base_internal_oxygen'] = random.randint(4, 7)              # 4~7%
 
+    def generate(self, count):
+        # count번 측정한 6개 채널 값을 한 번에 만들어 {key: array}로 반환 (set_env를 count번 부르는 것과 같은 분포)
+        def draw(values):
+            return draw_bytes(self.rng, values, count)
+
+        return {
+            'mars_base_internal_temperature': array('B', draw(range(18, 31))),
+            'mars_base_external_temperature': array('B', draw(range(0, 22))),
+            'mars_base_internal_humidity': array('B', draw(range(50, 61))),
+            'mars_base_external_illuminance': array('H', map(ILLUMINANCE_MIN.__add__, draw(range(216)))),
+            'mars_base_internal_co2': array('d', map(CO2_VALUES.__getitem__, draw(CO2_INDICES))),
+            'mars_base_internal_oxygen': array('B', draw(range(4, 8))),
+        }
+
     def get_env(self):
         self.log_sensor_data()
         return self.env_values
 
     def log_sensor_data(self):
-        current_time = RandomTimeGenerator().get_random_time() # 난수로 현재 시간 생성
-        with open(LOG_FILE_PATH, 'a', encoding='utf-8') as f:
-            for key, value in self.env_values.items():
-                f.write(f'[{current_time}] {key}: {value}\n')
-
-class RandomTimeGenerator:
-    def get_random_time(self):
-        year = 2025
-        month = random.randint(1, 12)
-        if month in (1, 3, 5, 7, 8, 10, 12):
-            day_max = 31
-        elif month == 2:
-            day_max = 28
-        else:
-            day_max = 30
-
-        day = random.randint(1, day_max)
-        hour = random.randint(0, 23)
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-
-        time_str = f'{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}'
-        return time_str
+        current_time = self.time_generator.get_random_epoch() # 난수로 현재 시간 생성 (문자열 변환은 기록기가 한다)
+        # 측정마다 파일을 여닫지 않고 버퍼에 모았다가 한 번에 쓴다 (종료 시 자동 flush)
+        if self.log_writer is None:
+            self.log_writer = SensorLogWriter(LOG_FILE_PATH)
+        self.log_writer.write(current_time, self.env_values)
 
 if __name__ == '__main__':
     ds = DummySensor()
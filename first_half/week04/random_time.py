@@ -0,0 +1,63 @@
+import calendar
+import random
+import time
+from array import array
+
+# 1년 안의 임의 시각을 epoch 초(UTC 기준 정수)로 만든다
+# 1년의 모든 초 중에서 균등하게 뽑으므로 날짜 수가 많은 달일수록 자주 나온다
+# 문자열('YYYY-MM-DD HH:MM:SS')은 실제로 쓸 때만 format_time()으로 만든다
+SECONDS_PER_DAY = 24 * 60 * 60
+DEFAULT_YEAR = 2025
+
+_day_prefixes = {} # 날짜 번호 -> 'YYYY-MM-DD ' (연도별로 처음 쓸 때 만든다)
+_time_of_day = []  # 하루 안의 초 -> 'HH:MM:SS'
+
+def year_range(year):
+    # (그 해 1월 1일 0시의 epoch, 그 해의 초 수)
+    start = calendar.timegm((year, 1, 1, 0, 0, 0))
+    return start, (366 if calendar.isleap(year) else 365) * SECONDS_PER_DAY
+
+def format_time(epoch):
+    day, second = divmod(epoch, SECONDS_PER_DAY)
+    prefix = _day_prefixes.get(day)
+    if prefix is None:
+        year = time.gmtime(epoch).tm_year
+        start, length = year_range(year)
+        for offset in range(length // SECONDS_PER_DAY):
+            _day_prefixes[start // SECONDS_PER_DAY + offset] = time.strftime(
+                '%Y-%m-%d ', time.gmtime(start + offset * SECONDS_PER_DAY))
+        prefix = _day_prefixes[day]
+    if not _time_of_day:
+        _time_of_day.extend(f'{h:02d}:{m:02d}:{s:02d}' for h in range(24) for m in range(60) for s in range(60))
+    return prefix + _time_of_day[second]
+
+def parse_time(text):
+    return calendar.timegm(time.strptime(text, '%Y-%m-%d %H:%M:%S'))
+
+class RandomTimeGenerator:
+    def __init__(self, year=DEFAULT_YEAR, seed=None):
+        self.rng = random.Random(seed)
+        self.start, self.length = year_range(year)
+
+    def get_random_epoch(self):
+        return self.start + self.rng.randrange(self.length)
+
+    def get_random_time(self):
+        return format_time(self.get_random_epoch())
+
+    def generate(self, count):
+        # count개의 임의 시각을 epoch 초 배열로 반환
+        # randbytes로 32비트 정수를 한 번에 받아, 나누어떨어지지 않는 위쪽 구간은 버리고(치우침 방지) 나머지를 취한다
+        limit = (1 << 32) - (1 << 32) % self.length
+        epochs = array('q')
+        while len(epochs) < count:
+            needed = count - len(epochs)
+            drawn = array('I', self.rng.randbytes(4 * (needed + needed // 64 + 16)))
+            offsets = map(self.length.__rmod__, filter(limit.__gt__, drawn))
+            epochs.extend(map(self.start.__add__, offsets))
+        del epochs[count:]
+        return epochs
+
+    def generate_strings(self, count):
+        # 문자열은 꺼낼 때마다 하나씩 만든다
+        return map(format_time, self.generate(count))
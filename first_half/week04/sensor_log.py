@@ -0,0 +1,87 @@
+import atexit
+import struct
+import time
+
+from random_time import format_time, parse_time
+
+# DummySensor 측정값을 버퍼에 모았다가 한 번에 쓰는 로그 기록기
+# 파일은 한 번만 열어 두고, 모인 레코드 수(max_records)나 마지막 flush 후 지난 시간(flush_interval)이
+# 기준을 넘을 때와 close()/프로그램 종료 시에 flush한다
+#   text   [시간] key: value 줄 6개 (기존 dummy_sensor.log 형식)
+#   binary 헤더(BINARY_MAGIC) 뒤에 측정 1번당 고정 길이 레코드 하나 (시간은 epoch 초로 저장)
+SENSOR_KEYS = (
+    'mars_base_internal_temperature',
+    'mars_base_external_temperature',
+    'mars_base_internal_humidity',
+    'mars_base_external_illuminance',
+    'mars_base_internal_co2',
+    'mars_base_internal_oxygen',
+)
+BINARY_MAGIC = b'MSENLOG2'
+# 시간(epoch 초), 내부/외부 온도, 습도, 조도, CO2, 산소
+RECORD_STRUCT = struct.Struct('<qhhBHdB')
+
+DEFAULT_MAX_RECORDS = 1000
+DEFAULT_FLUSH_INTERVAL = 1.0 # 초
+
+class SensorLogWriter:
+    def __init__(self, file_path, max_records=DEFAULT_MAX_RECORDS, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 binary=False):
+        self.file_path = file_path
+        self.max_records = max_records
+        self.flush_interval = flush_interval
+        self.binary = binary
+        if binary:
+            self.file = open(file_path, 'ab')
+            if self.file.tell() == 0:
+                self.file.write(BINARY_MAGIC)
+            self.buffer = bytearray()
+        else:
+            self.file = open(file_path, 'a', encoding='utf-8')
+            self.buffer = []
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        atexit.register(self.close) # 종료할 때 남은 레코드를 잃지 않도록
+
+    def write(self, timestamp, env_values):
+        # timestamp는 epoch 초 또는 'YYYY-MM-DD HH:MM:SS' 문자열 (문자열 변환은 text 형식일 때만 한다)
+        if self.binary:
+            epoch = parse_time(timestamp) if isinstance(timestamp, str) else timestamp
+            self.buffer += RECORD_STRUCT.pack(epoch, *(env_values[key] for key in SENSOR_KEYS))
+        else:
+            if not isinstance(timestamp, str):
+                timestamp = format_time(timestamp)
+            self.buffer.append(''.join(f'[{timestamp}] {key}: {value}\n' for key, value in env_values.items()))
+        self.pending += 1
+        if self.pending >= self.max_records or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.buffer if self.binary else ''.join(self.buffer))
+            self.buffer.clear()
+            self.pending = 0
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def read_binary_log(file_path):
+    # binary 형식 로그를 (epoch 초, {key: value}) 순서로 읽는다
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError('센서 바이너리 로그 파일이 아닙니다.')
+    for record in RECORD_STRUCT.iter_unpack(memoryview(data)[len(BINARY_MAGIC):]):
+        yield record[0], dict(zip(SENSOR_KEYS, record[1:]))
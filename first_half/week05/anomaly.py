@@ -0,0 +1,130 @@
+import math
+
+# 센서 값 이상 감지 (이력을 저장하지 않고 샘플마다 O(1))
+# 채널마다 지수 가중 이동 평균(EWMA)과 분산을 유지하면서
+#   band    값이 허용 범위(low~high)를 벗어남
+#   zscore  값이 EWMA 평균에서 z_threshold 표준편차보다 멀리 떨어짐 (warmup 샘플 이후)
+# 을 확인하고, 감지하면 AnomalyEvent를 callback 또는 queue(put_nowait)로 보낸다
+DEFAULT_ALPHA = 0.05
+DEFAULT_Z_THRESHOLD = 4.0
+DEFAULT_WARMUP = 30
+MIN_STDEV = 1e-9
+
+# 채널별 허용 범위 (DummySensor의 정상 범위)
+DEFAULT_BANDS = {
+    'mars_base_internal_oxygen': (4, 7),
+    'mars_base_internal_co2': (0.02, 0.1),
+}
+
+class AnomalyEvent:
+    __slots__ = ('timestamp', 'key', 'value', 'kind', 'detail')
+
+    def __init__(self, timestamp, key, value, kind, detail):
+        self.timestamp = timestamp
+        self.key = key
+        self.value = value
+        self.kind = kind     # 'band' 또는 'zscore'
+        self.detail = detail # band면 벗어난 경계값, zscore면 z 값
+
+    def __repr__(self):
+        return f'AnomalyEvent({self.timestamp!r}, {self.key!r}, {self.value!r}, {self.kind!r}, {self.detail!r})'
+
+class ChannelState:
+    def __init__(self, low=None, high=None, alpha=DEFAULT_ALPHA, z_threshold=DEFAULT_Z_THRESHOLD,
+                 warmup=DEFAULT_WARMUP):
+        self.low = -math.inf if low is None else low
+        self.high = math.inf if high is None else high
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+class AnomalyDetector:
+    def __init__(self, bands=None, callback=None, queue=None, **channel_options):
+        # bands: {key: (low, high)} 감시할 채널과 허용 범위 (범위 없이 zscore만 보려면 (None, None))
+        self.channels = {key: ChannelState(low, high, **channel_options)
+                         for key, (low, high) in (DEFAULT_BANDS if bands is None else bands).items()}
+        self.callback = callback
+        self.queue = queue
+        self.event_count = 0
+
+    def emit(self, event):
+        self.event_count += 1
+        if self.callback is not None:
+            self.callback(event)
+        if self.queue is not None:
+            self.queue.put_nowait(event)
+
+    def check(self, state, key, value, timestamp):
+        # 한 샘플을 확인하고 EWMA를 갱신한 뒤 이벤트(없으면 None)를 반환
+        event = None
+        if value < state.low:
+            event = AnomalyEvent(timestamp, key, value, 'band', state.low)
+        elif value > state.high:
+            event = AnomalyEvent(timestamp, key, value, 'band', state.high)
+        delta = value - state.mean
+        if event is None and state.count >= state.warmup:
+            stdev = math.sqrt(state.variance)
+            if stdev > MIN_STDEV and abs(delta) > state.z_threshold * stdev:
+                event = AnomalyEvent(timestamp, key, value, 'zscore', delta / stdev)
+        if state.count == 0:
+            state.mean = value
+        else:
+            state.mean += state.alpha * delta
+            state.variance = (1 - state.alpha) * (state.variance + state.alpha * delta * delta)
+        state.count += 1
+        return event
+
+    def process(self, env_values, timestamp=None):
+        # 측정 1회(여러 채널)를 확인하고 감지한 이벤트 목록을 반환
+        events = []
+        for key, state in self.channels.items():
+            value = env_values.get(key)
+            if value is None:
+                continue
+            event = self.check(state, key, value, timestamp)
+            if event is not None:
+                events.append(event)
+                self.emit(event)
+        return events
+
+    def process_batch(self, readings, timestamps=None):
+        # {key: 값 배열} 형태의 여러 측정을 한 번에 확인 (DummySensor.generate 결과)
+        # 채널마다 지역 변수로 반복해 process()보다 빠르며, 결과는 process()를 차례로 부른 것과 같다
+        found = []
+        for key, state in self.channels.items():
+            values = readings.get(key)
+            if values is None:
+                continue
+            low, high, alpha = state.low, state.high, state.alpha
+            start = 0
+            if state.count == 0 and len(values):
+                # 첫 샘플은 평균의 시작값 (범위만 확인)
+                value = values[0]
+                if value < low or value > high:
+                    found.append((0, key, value, 'band', low if value < low else high))
+                state.mean, state.count, start = value, 1, 1
+            count, mean, variance = state.count, state.mean, state.variance
+            z_from = start + max(state.warmup - count, 0) # 이 인덱스부터 zscore 확인
+            z_squared = state.z_threshold * state.z_threshold
+            for index in range(start, len(values)):
+                value = values[index]
+                delta = value - mean
+                if value < low or value > high:
+                    found.append((index, key, value, 'band', low if value < low else high))
+                elif index >= z_from and variance > MIN_STDEV * MIN_STDEV and delta * delta > z_squared * variance:
+                    found.append((index, key, value, 'zscore', delta / math.sqrt(variance)))
+                mean += alpha * delta
+                variance = (1 - alpha) * (variance + alpha * delta * delta)
+            state.count = count + len(values) - start
+            state.mean, state.variance = mean, variance
+
+        found.sort(key=lambda item: item[0]) # 샘플 순서대로
+        events = []
+        for index, key, value, kind, detail in found:
+            event = AnomalyEvent(None if timestamps is None else timestamps[index], key, value, kind, detail)
+            events.append(event)
+            self.emit(event)
+        return events
@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import tempfile
+import time
+
+from anomaly import AnomalyDetector, DEFAULT_BANDS
+from dummysensor import DummySensor
+from fan_in import BLOCK, DROP_OLDEST, FanIn, format_summary
+from rolling_stats import RollingStats
+from sampler import AsyncSampler, make_sensors
+from telemetry_store import TelemetryStore, get_raw_capacity
+
+WINDOW_SECONDS = {'1m': 60, '5m': 300, '1h': 3600}
+
+def benchmark_sampler(sensor_count, interval, ticks, latency):
+    sensors = make_sensors(sensor_count, latency, latency / 2, seed=42)
+    print(f'>> sampler: {sensor_count} sensors, {interval * 1000:.0f} ms interval, {ticks} ticks, '
+          f'~{latency * 1000:.0f} ms per read')
+
+    def sleep_after_work():
+        # 기존 방식: 센서를 하나씩 읽은 뒤 interval만큼 sleep (읽는 시간만큼 매 주기가 밀린다)
+        start = time.monotonic()
+        for _ in range(ticks):
+            for sensor in sensors.values():
+                time.sleep(latency)
+                sensor.set_env()
+            time.sleep(interval)
+        return time.monotonic() - start
+
+    async def async_sampler():
+        sampler = AsyncSampler(sensors, interval, lambda tick, values: None)
+        start = time.monotonic()
+        await sampler.run(ticks)
+        return time.monotonic() - start, sampler.stats
+
+    expected = ticks * interval
+    if sensor_count * latency * ticks <= 30: # 너무 오래 걸리면 생략
+        elapsed = sleep_after_work()
+        print(f'   sleep after work   {elapsed:8.2f} s   drift {(elapsed - expected) * 1000:10.1f} ms')
+    else:
+        print('   sleep after work   (skipped, would take too long)')
+    # tick마다 예정 시각 대비 늦은 정도(lateness)가 쌓이지 않고 일정하게 유지되어야 한다
+    elapsed, stats = asyncio.run(async_sampler())
+    print(f'   async sampler      {elapsed:8.2f} s   {stats}')
+
+def benchmark_rolling(samples, interval):
+    readings = DummySensor(seed=42).generate(samples)
+    keys = list(readings)
+    rows = [dict(zip(keys, values)) for values in zip(*readings.values())]
+    window_sizes = {name: seconds // interval for name, seconds in WINDOW_SECONDS.items()}
+    print(f'>> sliding averages at every tick ({samples:,} samples, {interval} s interval, windows {window_sizes})')
+
+    def resum_lists():
+        # 기존 방식처럼 샘플을 리스트에 모으고, 매 tick 윈도우마다 다시 합산
+        history = {key: [] for key in keys}
+        for row in rows:
+            for key, value in row.items():
+                history[key].append(value)
+            for size in window_sizes.values():
+                averages = {key: sum(values[-size:]) / len(values[-size:]) for key, values in history.items()}
+        return averages
+
+    def rolling():
+        stats = RollingStats(keys, window_sizes)
+        for row in rows:
+            stats.add(row)
+            for name in window_sizes:
+                averages = stats.averages(name)
+        return averages
+
+    for name, func in (('list re-sum', resum_lists), ('RollingStats', rolling)):
+        start = time.perf_counter()
+        averages = func()
+        elapsed = time.perf_counter() - start
+        print(f'   {name:<13} {elapsed:8.3f} s   {samples / elapsed:12,.0f} ticks/s'
+              f'   last 1h avg temperature {averages["mars_base_internal_temperature"]:.4f}')
+
+def benchmark_store(samples, step=150):
+    # step초 간격 samples개 (기본 200,000 x 150초 = 약 1년)를 저장한 뒤 범위 질의
+    readings = DummySensor(seed=42).generate(samples)
+    keys = list(readings)
+    rows = [dict(zip(keys, values)) for values in zip(*readings.values())]
+    start_time = 1_735_689_600 # 2025-01-01 00:00:00 UTC
+    end_time = start_time + (samples - 1) * step
+    with tempfile.TemporaryDirectory() as work_dir, \
+            TelemetryStore(work_dir, raw_capacity=get_raw_capacity(step)) as store:
+        print(f'>> telemetry store ({samples:,} samples, {step} s apart, {samples * step / 86400:.0f} days)')
+        start = time.perf_counter()
+        for i, row in enumerate(rows):
+            store.add(start_time + i * step, row)
+        elapsed = time.perf_counter() - start
+        print(f'   ingest             {elapsed:8.2f} s   {samples / elapsed:10,.0f} samples/s')
+
+        queries = [
+            ('last hour', end_time - 3600, end_time, None),
+            ('last day', end_time - 86400, end_time, None),
+            ('last 90 days', end_time - 90 * 86400, end_time, None),
+            ('last 90 days @1d', end_time - 90 * 86400, end_time, 86400),
+            ('whole year', start_time, end_time, None),
+        ]
+        for name, query_start, query_end, resolution in queries:
+            begin = time.perf_counter()
+            tier_name, result = store.query(query_start, query_end, resolution)
+            elapsed = time.perf_counter() - begin
+            print(f'   {name:<18} {tier_name:>4} tier {len(result):>6,} rows   {elapsed * 1000:8.2f} ms')
+
+def benchmark_anomaly(samples):
+    # 여섯 채널 모두 감시 (범위가 없는 채널은 EWMA z-score만)
+    readings = DummySensor(seed=42).generate(samples)
+    for i in range(0, samples, 10_000): # 1만 샘플마다 산소 0% 주입 (band 이벤트)
+        readings['mars_base_internal_oxygen'][i] = 0
+    keys = list(readings)
+    rows = [dict(zip(keys, values)) for values in zip(*readings.values())]
+    bands = {key: DEFAULT_BANDS.get(key, (None, None)) for key in keys}
+    print(f'>> anomaly detection ({samples:,} samples x {len(keys)} channels, target 100,000 samples/s)')
+
+    def per_sample():
+        detector = AnomalyDetector(bands)
+        for i, row in enumerate(rows):
+            detector.process(row, i)
+        return detector.event_count
+
+    def batch():
+        detector = AnomalyDetector(bands)
+        detector.process_batch(readings, range(samples))
+        return detector.event_count
+
+    for name, func in (('process()', per_sample), ('process_batch()', batch)):
+        start = time.perf_counter()
+        events = func()
+        elapsed = time.perf_counter() - start
+        print(f'   {name:<16} {elapsed:8.3f} s   {samples / elapsed:12,.0f} samples/s   {events} events')
+
+def benchmark_fan_in(sensor_count, interval, duration, queue_size=1024, work=0.0):
+    # producer 스레드 sensor_count개 -> 큐 -> RollingStats에 반영
+    # (interval 0이면 producer가 쉬지 않아 GIL을 두고 소비자와 경쟁하므로 짧은 interval + --work로 과부하를 흉내 낸다)
+    # work: batch 하나 처리에 더 걸리는 시간 (느린 소비자 흉내, 초)
+    print(f'>> fan-in: {sensor_count} producers, {interval * 1000:.1f} ms interval, queue {queue_size}, '
+          f'{duration} s, extra {work * 1000:.1f} ms per batch')
+    for policy in (DROP_OLDEST, BLOCK):
+        fan_in = FanIn(sensor_count, interval, queue_size, policy, seed=42)
+        stats = RollingStats(fan_in.producers[0].sensor.env_values.keys(), {'5m': 300})
+        end = time.monotonic() + duration
+        with fan_in:
+            while time.monotonic() < end:
+                for reading in fan_in.get_batch(timeout=0.1):
+                    stats.add(reading.values)
+                if work:
+                    time.sleep(work)
+        summary = fan_in.summary()
+        print(f'   {policy:<12} {summary["consumed"] / duration:10,.0f} readings/s   {format_summary(summary)}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MissionComputer 벤치마크')
+    parser.add_argument('--sensors', type=int, default=40)
+    parser.add_argument('--interval', type=float, default=0.1)
+    parser.add_argument('--ticks', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--rolling', type=int, default=None, metavar='SAMPLES',
+                        help='샘플러 대신 슬라이딩 윈도우 통계를 측정 (예: 100000)')
+    parser.add_argument('--store', type=int, default=None, metavar='SAMPLES',
+                        help='해상도별 저장소의 기록/범위 질의를 측정 (예: 200000)')
+    parser.add_argument('--anomaly', type=int, default=None, metavar='SAMPLES',
+                        help='이상 감지 처리량을 측정 (예: 1000000)')
+    parser.add_argument('--fan-in', dest='fan_in', type=float, default=None, metavar='SECONDS',
+                        help='producer 스레드 -> 큐 -> 소비자 처리량/지연/버림을 측정 (--sensors, --interval 사용)')
+    parser.add_argument('--work', type=float, default=0.0, help='--fan-in 소비자가 batch마다 더 쓰는 시간(초)')
+    args = parser.parse_args()
+    if args.fan_in:
+        benchmark_fan_in(args.sensors, args.interval, args.fan_in, work=args.work)
+    elif args.anomaly:
+        benchmark_anomaly(args.anomaly)
+    elif args.store:
+        benchmark_store(args.store)
+    elif args.rolling:
+        for interval in (5, 1):
+            benchmark_rolling(args.rolling, interval)
+    else:
+        benchmark_sampler(args.sensors, args.interval, args.ticks, args.latency)
@@ -1,7 +1,29 @@
 import random
+from array import array
+
+# generate()에서 쓰는 채널별 값 (set_env와 같은 분포)
+ILLUMINANCE_MIN = 500
+CO2_VALUES = tuple(round(0.02 + 0.01 * i, 2) for i in range(9)) # 0.02 ~ 0.1
+# round(uniform(0.02, 0.1), 2)는 양 끝 값(0.02, 0.1)이 나올 확률이 나머지의 절반이다
+# 16칸 중 양 끝은 1칸, 나머지는 2칸씩 차지하도록 한 CO2_VALUES 인덱스
+CO2_INDICES = tuple((i + 1) // 2 for i in range(16))
+
+def draw_bytes(rng, values, count):
+    # values(0~255 정수들) 중 하나를 균등하게 count개 뽑아 bytes로 반환
+    # randbytes로 받은 바이트를 translate로 한 번에 변환하고, 치우침이 없도록 나누어떨어지지 않는 구간은 버린다
+    span = len(values)
+    limit = 256 - 256 % span
+    table = bytes(values[v % span] for v in range(limit)) + bytes(256 - limit)
+    rejected = bytes(range(limit, 256))
+    drawn = bytearray()
+    while len(drawn) < count:
+        needed = count - len(drawn)
+        drawn += rng.randbytes(needed * 256 // limit + 64).translate(table, rejected)
+    return bytes(drawn[:count])
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed) # generate()용 (seed를 주면 같은 값이 다시 나온다)
         self.env_values = {
             'mars_base_internal_temperature': 0,
             'mars_base_external_temperature': 0,
@@ -19,5 +41,19 @@ class DummySensor:
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 2)  # 0.02~0.1%
         self.env_values['mars_base_internal_oxygen'] = random.randint(4, 7)              # 4~7%
 
+    def generate(self, count):
+        # count번 측정한 6개 채널 값을 한 번에 만들어 {key: array}로 반환 (set_env를 count번 부르는 것과 같은 분포)
+        def draw(values):
+            return draw_bytes(self.rng, values, count)
+
+        return {
+            'mars_base_internal_temperature': array('B', draw(range(18, 31))),
+            'mars_base_external_temperature': array('B', draw(range(0, 22))),
+            'mars_base_internal_humidity': array('B', draw(range(50, 61))),
+            'mars_base_external_illuminance': array('H', map(ILLUMINANCE_MIN.__add__, draw(range(216)))),
+            'mars_base_internal_co2': array('d', map(CO2_VALUES.__getitem__, draw(CO2_INDICES))),
+            'mars_base_internal_oxygen': array('B', draw(range(4, 8))),
+        }
+
     def get_env(self):
         return self.env_values
\ No newline at end of file
@@ -0,0 +1,230 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from dummysensor import DummySensor
+
+# 여러 센서 -> 제한된 크기의 큐 -> MissionComputer
+# 센서마다 producer 스레드 하나가 interval마다 값을 읽어 큐에 넣고, 소비자는 batch 단위로 꺼낸다
+# 큐는 deque(maxlen) 하나 (CPython에서 append/popleft는 원자적이라 drop_oldest는 락을 잡지 않는다)
+#   drop_oldest  가득 차 있으면 가장 오래된 값을 버리고 넣는다 (producer는 멈추지 않음)
+#   block        가득 차 있으면 자리가 날 때까지 producer가 기다린다 (backpressure, 버리는 값 없음)
+#                자리 확인과 append는 Condition 락 안에서 하고, 소비자는 꺼낸 뒤 기다리는 producer를 깨운다
+# 카운터도 producer마다 따로 두고 (스레드 하나만 갱신) 버린 개수 = 넣은 수 - 꺼낸 수 - 남은 수로 구한다
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+QUEUE_SIZE = 1024
+BATCH_SIZE = 256
+LATENCY_SAMPLES = 10000 # 지연 시간 백분위 계산에 쓰는 최근 측정 수
+
+class Reading:
+    __slots__ = ('source', 'values', 'timestamp', 'created')
+
+    def __init__(self, source, values, timestamp, created):
+        self.source = source
+        self.values = values
+        self.timestamp = timestamp # time.time() (저장소 기록용)
+        self.created = created     # time.perf_counter() (지연 시간 계산용)
+
+class ReadingQueue:
+    def __init__(self, maxsize=QUEUE_SIZE, policy=DROP_OLDEST):
+        if policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f'알 수 없는 정책입니다: {policy}')
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = deque(maxlen=maxsize)
+        self.not_empty = threading.Event()
+        # block 정책에서 자리 확인과 append를 한 번에 하는 락 (drop_oldest는 잡지 않음)
+        self.not_full = threading.Condition()
+        self.put_counts = {} # producer 이름 -> 넣은 수 (register로 미리 등록, 각 producer만 갱신)
+        self.get_count = 0   # 소비자(하나)만 갱신
+        self.blocked_times = {} # producer 이름 -> 자리가 나길 기다린 시간 (초, 각 producer만 갱신)
+
+    def register(self, source):
+        # producer 스레드를 시작하기 전에 카운터를 등록한다 (이후에는 각자 자기 항목만 바꾼다)
+        self.put_counts.setdefault(source, 0)
+        self.blocked_times.setdefault(source, 0.0)
+
+    def put(self, source, item, timeout=None):
+        # block 정책에서 timeout 안에 자리가 나지 않으면 False
+        items = self.items
+        if self.policy == BLOCK:
+            not_full = self.not_full
+            with not_full:
+                if len(items) >= self.maxsize:
+                    start = time.perf_counter()
+                    full = not not_full.wait_for(lambda: len(items) < self.maxsize, timeout)
+                    self.blocked_times[source] += time.perf_counter() - start
+                    if full:
+                        return False
+                items.append(item) # 락 안에서 확인하고 넣으므로 밀려나는 값이 없다
+        else:
+            items.append(item)
+        self.put_counts[source] += 1
+        self.not_empty.set()
+        return True
+
+    def get_batch(self, max_items=BATCH_SIZE, timeout=None):
+        # 최대 max_items개를 넣은 순서대로 꺼낸다 (timeout 동안 하나도 없으면 빈 목록)
+        items = self.items
+        if not items:
+            self.not_empty.clear()
+            if not items and not self.not_empty.wait(timeout):
+                return []
+        batch = []
+        popleft = items.popleft
+        try:
+            for _ in range(max_items):
+                batch.append(popleft())
+        except IndexError:
+            pass
+        self.get_count += len(batch)
+        if self.policy == BLOCK:
+            self.wake_producers()
+        return batch
+
+    def wake_producers(self):
+        with self.not_full:
+            self.not_full.notify_all()
+
+    def depth(self):
+        return len(self.items)
+
+    def drops(self):
+        # drop_oldest로 밀려난 개수 (block 정책은 밀어내지 않으므로 항상 0)
+        if self.policy == BLOCK:
+            return 0
+        return max(sum(self.put_counts.values()) - self.get_count - len(self.items), 0)
+
+class FanInMetrics:
+    def __init__(self):
+        self.batches = 0
+        self.consumed = 0
+        self.max_depth = 0
+        self.total_depth = 0 # batch를 꺼내기 직전 깊이의 합
+        self.latency_count = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_batch(self, depth, batch, now):
+        self.batches += 1
+        self.consumed += len(batch)
+        self.total_depth += depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+        latencies = self.latencies
+        total = 0.0
+        longest = self.latency_max
+        for reading in batch:
+            latency = now - reading.created
+            total += latency
+            if latency > longest:
+                longest = latency
+            latencies.append(latency)
+        self.latency_total += total
+        self.latency_count += len(batch)
+        self.latency_max = longest
+
+    def mean_depth(self):
+        return self.total_depth / self.batches if self.batches else 0.0
+
+    def latency_percentile(self, percent):
+        # 최근 LATENCY_SAMPLES개 기준
+        if not self.latencies:
+            return math.nan
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+    def summary(self, queue):
+        produced = sum(queue.put_counts.values())
+        return {
+            'produced': produced,
+            'consumed': self.consumed,
+            'dropped': queue.drops(),
+            'depth': queue.depth(),
+            'max_depth': self.max_depth,
+            'mean_depth': self.mean_depth(),
+            'batches': self.batches,
+            'blocked_time': sum(queue.blocked_times.values()),
+            'latency_mean': self.latency_total / self.latency_count if self.latency_count else math.nan,
+            'latency_p99': self.latency_percentile(99),
+            'latency_max': self.latency_max,
+        }
+
+def format_summary(summary):
+    return (f"produced={summary['produced']} consumed={summary['consumed']} dropped={summary['dropped']} "
+            f"depth max={summary['max_depth']} mean={summary['mean_depth']:.1f} "
+            f"blocked={summary['blocked_time']:.2f}s latency mean={summary['latency_mean'] * 1000:.2f}ms "
+            f"p99={summary['latency_p99'] * 1000:.2f}ms max={summary['latency_max'] * 1000:.2f}ms")
+
+class SensorProducer(threading.Thread):
+    # 센서 하나를 interval마다 읽어 큐에 넣는 스레드 (예정 시각 = 시작 + k * interval, 주기가 밀리지 않음)
+    def __init__(self, name, sensor, queue, interval, latency=0.0, stop_event=None):
+        super().__init__(name=name, daemon=True)
+        self.sensor = sensor
+        self.queue = queue
+        self.interval = interval
+        self.latency = latency # 센서 한 번 읽는 데 걸리는 시간 (모의)
+        self.stop_event = stop_event or threading.Event()
+        queue.register(name) # 스레드 시작 전에 카운터 등록
+
+    def run(self):
+        sensor, queue, name = self.sensor, self.queue, self.name
+        stop_event = self.stop_event
+        start = time.monotonic()
+        tick = 0
+        while not stop_event.is_set():
+            if self.latency:
+                time.sleep(self.latency)
+            sensor.set_env()
+            reading = Reading(name, dict(sensor.get_env()), time.time(), time.perf_counter())
+            while not queue.put(name, reading, timeout=0.1): # block 정책에서 멈출 때 빠져나오도록
+                if stop_event.is_set():
+                    return
+            if self.interval <= 0:
+                continue
+            tick = max(tick + 1, math.floor((time.monotonic() - start) / self.interval))
+            delay = start + tick * self.interval - time.monotonic()
+            if delay > 0 and stop_event.wait(delay):
+                return
+
+class FanIn:
+    def __init__(self, sensor_count, interval, queue_size=QUEUE_SIZE, policy=DROP_OLDEST,
+                 latency=0.0, seed=None):
+        rng = random.Random(seed)
+        self.queue = ReadingQueue(queue_size, policy)
+        self.stop_event = threading.Event()
+        self.producers = [SensorProducer(f'sensor-{i:02d}', DummySensor(rng.random()), self.queue, interval,
+                                         latency, self.stop_event)
+                          for i in range(sensor_count)]
+        self.metrics = FanInMetrics()
+
+    def start(self):
+        for producer in self.producers:
+            producer.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.queue.wake_producers() # block 정책으로 기다리는 producer를 깨운다
+        for producer in self.producers:
+            producer.join()
+
+    def get_batch(self, max_items=BATCH_SIZE, timeout=None):
+        depth = self.queue.depth()
+        batch = self.queue.get_batch(max_items, timeout)
+        if batch:
+            self.metrics.record_batch(depth, batch, time.perf_counter())
+        return batch
+
+    def summary(self):
+        return self.metrics.summary(self.queue)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -1,9 +1,22 @@
+from anomaly import AnomalyDetector
 from dummysensor import DummySensor
+from fan_in import BATCH_SIZE, DROP_OLDEST, QUEUE_SIZE, FanIn, format_summary
+from rolling_stats import RollingStats
+from sampler import AsyncSampler, make_sensors
+from telemetry_store import TelemetryStore, get_raw_capacity
 
+import argparse
+import asyncio
 import time
 
+SAMPLE_INTERVAL = 5   # 초
+# 동시에 유지하는 슬라이딩 윈도우 (초)
+WINDOW_SECONDS = {'1m': 60, '5m': 300, '1h': 3600}
+AVERAGE_WINDOW = '5m' # 이 윈도우 길이(5분)마다 평균 출력 (주기 수는 interval로 구한다)
+
 class MissionComputer:
-    def __init__(self):
+    def __init__(self, interval=SAMPLE_INTERVAL, readings_per_cycle=1, store=None, detector=None,
+                 on_cycle=None, echo=True):
         self.env_values = {
             'mars_base_internal_temperature': 0,
             'mars_base_external_temperature': 0,
@@ -12,10 +25,19 @@ class MissionComputer:
             'mars_base_internal_co2': 0,
             'mars_base_internal_oxygen': 0
         }
-        # 각 key 별 수집된 데이터 저장을 위한 리스트
-        self.collected_data = {key: [] for key in self.env_values.keys()}
+        # 각 key 별 1분/5분/1시간 슬라이딩 통계 (샘플을 윈도우마다 따로 저장하지 않음)
+        # 와 평균을 출력할 주기 수 (5초 주기에서 60회)
+        self.configure(interval, readings_per_cycle)
         # 주기 카운터
         self.counter = 0
+        # 측정값을 1분/1시간/1일 단위로 요약해 디스크에 남기는 저장소 (TelemetryStore, 없으면 저장하지 않음)
+        self.store = store
+        # 측정값마다 이상 여부를 확인하는 감지기 (AnomalyDetector, 없으면 확인하지 않음)
+        self.detector = detector
+        # 주기가 끝날 때마다 on_cycle(self) 호출 (슬라이딩 윈도우 집계를 메트릭으로 내보내는 등)
+        self.on_cycle = on_cycle
+        # 센서 값/평균을 화면에 출력할지 (다른 곳으로 내보내기만 할 때는 False)
+        self.echo = echo
 
     def get_sensor_data(self):
         ds = DummySensor()
@@ -24,37 +46,168 @@ class MissionComputer:
                 # 센서 데이터 생성 및 출력
                 ds.set_env()
                 self.env_values = ds.get_env()
-                print(self.env_values)
+                if self.echo:
+                    print(self.env_values)
 
-                # 수집한 데이터를 저장
-                for key, value in self.env_values.items():
-                    self.collected_data[key].append(value)
-                
-                # 카운터 증가
-                self.counter += 1
-                
-                # 카운터가 60회(5분)에 도달하면 평균 계산 및 출력
-                if self.counter >= 60:
-                    self.calculate_and_print_averages()
-
-                    # 새로운 5분 주기를 위해 리스트 및 카운터 초기화
-                    self.collected_data = {key: [] for key in self.env_values.keys()}
-                    self.counter = 0
+                self.record_env_values(self.env_values)
+                self.finish_cycle()
 
                 # 5초 대기
-                time.sleep(5)
+                time.sleep(SAMPLE_INTERVAL)
         except KeyboardInterrupt: # Ctrl+C로 종료 시
             print('System stopped....')
 
+    def configure(self, interval, readings_per_cycle):
+        # 샘플링 주기에 맞춰 슬라이딩 윈도우 크기와 평균 출력 주기를 정한다
+        self.rolling = self.make_rolling_stats(interval, readings_per_cycle)
+        self.average_cycles = max(round(WINDOW_SECONDS[AVERAGE_WINDOW] / interval), 1)
+
+    def make_rolling_stats(self, interval, readings_per_cycle):
+        # 윈도우 시간을 샘플 수로 바꾼다 (한 주기에 센서 여러 개를 읽으면 그만큼 곱한다)
+        window_sizes = {name: max(round(seconds / interval), 1) * readings_per_cycle
+                        for name, seconds in WINDOW_SECONDS.items()}
+        return RollingStats(self.env_values.keys(), window_sizes)
+
+    def record_env_values(self, env_values, timestamp=None):
+        # 수집한 데이터를 슬라이딩 윈도우에 반영 (O(1))하고 저장소에 기록, 이상 감지
+        if timestamp is None:
+            timestamp = time.time()
+        self.rolling.add(env_values)
+        if self.store is not None:
+            self.store.add(timestamp, env_values)
+        if self.detector is not None:
+            self.detector.process(env_values, timestamp)
+
+    def get_averages(self, window=AVERAGE_WINDOW):
+        # 매 주기 언제든 최근 window 동안의 평균
+        return self.rolling.averages(window)
+
+    def get_summaries(self):
+        # {윈도우 이름: {key: {'count', 'mean', 'min', 'max', 'stdev'}}} (모든 슬라이딩 윈도우)
+        return {window: self.rolling.summary(window) for window in self.rolling.window_sizes}
+
+    def finish_cycle(self):
+        # 카운터 증가
+        self.counter += 1
+
+        # 카운터가 평균 윈도우(5분)만큼의 주기 수에 도달하면 평균 출력
+        if self.counter >= self.average_cycles:
+            if self.echo:
+                self.calculate_and_print_averages()
+            self.counter = 0
+        if self.on_cycle is not None:
+            self.on_cycle(self)
+
+    def get_sensor_data_async(self, sensors, interval=SAMPLE_INTERVAL, ticks=None):
+        # 여러 센서를 asyncio로 동시에 읽는다
+        # tick은 monotonic 시계 기준 고정 시각에 시작하므로 처리 시간만큼 주기가 밀리지 않는다
+        self.configure(interval, len(sensors))
+        def on_sample(tick, values):
+            now = time.time()
+            for env_values in values.values():
+                self.env_values = env_values
+                self.record_env_values(env_values, now)
+            if len(sensors) == 1 and self.echo:
+                print(self.env_values)
+            self.finish_cycle()
+
+        def on_missed(tick, names):
+            print(f'>> tick {tick}: deadline을 놓친 센서 {len(names)}개 ({", ".join(names)})')
+
+        sampler = AsyncSampler(sensors, interval, on_sample, on_missed)
+        try:
+            asyncio.run(sampler.run(ticks))
+        except KeyboardInterrupt: # Ctrl+C로 종료 시
+            print('System stopped....')
+        print(f'>> sampler: {sampler.stats}')
+        return sampler.stats
+
+    def get_sensor_data_fan_in(self, fan_in, interval=SAMPLE_INTERVAL, cycles=None, batch_size=BATCH_SIZE):
+        # 센서마다 스레드가 값을 큐에 넣고, 여기서는 batch 단위로 꺼내 처리한다
+        # interval마다 한 주기로 보고 주기 카운터를 올린다
+        self.configure(interval, len(fan_in.producers))
+        cycle_end = time.monotonic() + interval
+        cycle = 0
+        fan_in.start()
+        try:
+            while cycles is None or cycle < cycles:
+                batch = fan_in.get_batch(batch_size, max(cycle_end - time.monotonic(), 0))
+                for reading in batch:
+                    self.env_values = reading.values
+                    self.record_env_values(reading.values, reading.timestamp)
+                if time.monotonic() >= cycle_end:
+                    if len(fan_in.producers) == 1 and self.echo:
+                        print(self.env_values)
+                    self.finish_cycle()
+                    cycle += 1
+                    cycle_end += interval
+        except KeyboardInterrupt: # Ctrl+C로 종료 시
+            print('System stopped....')
+        finally:
+            fan_in.stop()
+        summary = fan_in.summary()
+        print(f'>> fan-in: {format_summary(summary)}')
+        return summary
+
     def calculate_and_print_averages(self):
         print("\n===== Last 5 minutes avg =====")
-        # 각 key 별 평균 계산 및 출력
-        for key, values in self.collected_data.items():
-            if values:
-                avg_value = sum(values) / len(values)
+        # 각 key 별 최근 5분 슬라이딩 윈도우 평균 출력 (다시 합산하지 않음)
+        for key, avg_value in self.get_averages().items():
+            if avg_value == avg_value: # 아직 샘플이 없으면 NaN
                 print(f"{key}: {avg_value:.2f}")
         print("===========================\n")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Mars 기지 미션 컴퓨터')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='asyncio 샘플러로 여러 센서를 동시에 읽기 (주기 밀림 없음)')
+    parser.add_argument('--sensors', type=int, default=1, help='--async에서 읽을 모의 센서 수')
+    parser.add_argument('--interval', type=float, default=SAMPLE_INTERVAL, help='--async 샘플링 주기(초)')
+    parser.add_argument('--latency', type=float, default=0.0, help='모의 센서 한 번 읽는 데 걸리는 시간(초)')
+    parser.add_argument('--fan-in', dest='fan_in', action='store_true',
+                        help='센서마다 스레드가 큐에 넣고 batch로 꺼내 처리 (--sensors, --interval, --latency 사용)')
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help='--fan-in 큐 크기')
+    parser.add_argument('--block', dest='policy', action='store_const', const='block', default=DROP_OLDEST,
+                        help='--fan-in 큐가 가득 차면 오래된 값을 버리는 대신 producer가 기다림')
+    parser.add_argument('--ticks', type=int, default=None, help='--async/--fan-in에서 이 횟수만큼만 샘플링')
+    parser.add_argument('--store', default=None, metavar='DIR',
+                        help='측정값을 해상도별 저장소(DIR)에 기록 (telemetry_store.py로 범위 질의)')
+    parser.add_argument('--anomaly', action='store_true',
+                        help='측정값 이상 감지(범위/EWMA z-score)를 켜고 감지될 때마다 출력')
+    return parser.parse_args()
+
+def print_anomaly(event):
+    moment = time.strftime('%H:%M:%S', time.localtime(event.timestamp))
+    if event.kind == 'band':
+        print(f'>> [{moment}] 이상 감지: {event.key} = {event.value} (허용 범위 밖, 경계 {event.detail})')
+    else:
+        print(f'>> [{moment}] 이상 감지: {event.key} = {event.value} (z = {event.detail:.1f})')
+
 if __name__ == '__main__':
-    RunComputer = MissionComputer()
-    RunComputer.get_sensor_data()
\ No newline at end of file
+    args = parse_args()
+    store = None
+    if args.store:
+        # raw tier가 1시간을 담도록 주기와 한 주기의 측정 수로 슬롯 수를 정한다
+        if args.fan_in or args.use_async:
+            raw_capacity = get_raw_capacity(args.interval, args.sensors)
+        else:
+            raw_capacity = get_raw_capacity(SAMPLE_INTERVAL)
+        try:
+            store = TelemetryStore(args.store, raw_capacity=raw_capacity)
+        except ValueError as error: # 다른 주기/센서 수로 만든 저장소
+            print(f'{error} (raw tier 슬롯 수 {raw_capacity})')
+            exit(1)
+    detector = AnomalyDetector(callback=print_anomaly) if args.anomaly else None
+    RunComputer = MissionComputer(store=store, detector=detector)
+    try:
+        if args.fan_in:
+            fan_in = FanIn(args.sensors, args.interval, args.queue_size, args.policy, args.latency)
+            RunComputer.get_sensor_data_fan_in(fan_in, args.interval, args.ticks)
+        elif args.use_async:
+            RunComputer.get_sensor_data_async(make_sensors(args.sensors, args.latency, args.latency / 2),
+                                              args.interval, args.ticks)
+        else:
+            RunComputer.get_sensor_data()
+    finally:
+        if store is not None:
+            store.close()
\ No newline at end of file
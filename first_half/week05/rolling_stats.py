@@ -0,0 +1,127 @@
+import math
+from collections import deque
+
+# 슬라이딩 윈도우 통계 (샘플마다 O(1))
+# 채널마다 가장 큰 윈도우 크기의 원형 버퍼 하나만 두고, 윈도우마다
+#   평균     합계/개수 (합계에서 빠지는 샘플을 빼 준다)
+#   분산     Welford 방식으로 샘플 추가/제거 시 평균과 M2 갱신
+#   최소/최대 단조(monotonic) deque (앞쪽이 현재 윈도우의 최소/최대)
+# 를 유지한다. 윈도우 크기는 샘플 수 기준이다 (5초 주기에서 5분 = 60)
+# 더하고 빼기를 반복하며 쌓이는 부동소수점 오차는 size개를 뺄 때마다 버퍼의 샘플로 다시 계산해 없앤다 (분할 상환 O(1))
+
+class RollingWindow:
+    def __init__(self, size):
+        self.size = size
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.evictions = 0 # 마지막으로 다시 계산한 뒤 뺀 샘플 수
+        self.min_deque = deque() # (샘플 번호, 값), 값이 증가하는 순서
+        self.max_deque = deque() # (샘플 번호, 값), 값이 감소하는 순서
+
+    def add(self, index, value, removed=None):
+        # index번 샘플을 넣고, 윈도우가 가득 찼으면 가장 오래된 샘플(removed)을 뺀다
+        count = self.count
+        mean = self.mean
+        if removed is not None:
+            self.evictions += 1
+            count -= 1
+            self.total -= removed
+            if count:
+                delta = removed - mean
+                mean -= delta / count
+                self.m2 -= delta * (removed - mean)
+            else:
+                mean = self.m2 = 0.0
+        count += 1
+        self.total += value
+        delta = value - mean
+        mean += delta / count
+        self.m2 = max(self.m2 + delta * (value - mean), 0.0)
+        self.count = count
+        self.mean = mean
+
+        oldest = index - self.size # 이 번호 이하의 샘플은 윈도우를 벗어났다
+        min_deque = self.min_deque
+        while min_deque and min_deque[-1][1] >= value:
+            min_deque.pop()
+        min_deque.append((index, value))
+        if min_deque[0][0] <= oldest:
+            min_deque.popleft()
+        max_deque = self.max_deque
+        while max_deque and max_deque[-1][1] <= value:
+            max_deque.pop()
+        max_deque.append((index, value))
+        if max_deque[0][0] <= oldest:
+            max_deque.popleft()
+
+    def recompute(self, values):
+        # 현재 윈도우의 샘플들(values)로 합계/평균/M2를 다시 구한다
+        total = math.fsum(values)
+        mean = total / len(values)
+        self.total = total
+        self.mean = mean
+        self.m2 = math.fsum((value - mean) ** 2 for value in values)
+        self.evictions = 0
+
+    def average(self):
+        return self.total / self.count if self.count else math.nan
+
+    def variance(self):
+        return self.m2 / self.count if self.count else math.nan
+
+    def minimum(self):
+        return self.min_deque[0][1] if self.min_deque else math.nan
+
+    def maximum(self):
+        return self.max_deque[0][1] if self.max_deque else math.nan
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.average(), 'min': self.minimum(), 'max': self.maximum(),
+                'stdev': math.sqrt(self.variance()) if self.count else math.nan}
+
+class ChannelStats:
+    # 한 채널의 여러 윈도우가 원형 버퍼 하나를 함께 쓴다
+    def __init__(self, window_sizes):
+        self.windows = {name: RollingWindow(size) for name, size in window_sizes.items()}
+        self.window_list = list(self.windows.values())
+        self.capacity = max(window_sizes.values())
+        self.buffer = [0] * self.capacity
+        self.index = 0 # 지금까지 들어온 샘플 수
+
+    def add(self, value):
+        index = self.index
+        buffer = self.buffer
+        capacity = self.capacity
+        for window in self.window_list:
+            size = window.size
+            window.add(index, value, buffer[(index - size) % capacity] if index >= size else None)
+        buffer[index % capacity] = value
+        self.index = index = index + 1
+        for window in self.window_list:
+            if window.evictions >= window.size:
+                # 최근 size개 샘플 (버퍼에서 index - size부터)
+                size = window.size
+                start = (index - size) % capacity
+                end = start + size
+                window.recompute(buffer[start:end] if end <= capacity else buffer[start:] + buffer[:end - capacity])
+
+class RollingStats:
+    def __init__(self, keys, window_sizes):
+        # window_sizes: {이름: 샘플 수} (예: {'1m': 12, '5m': 60, '1h': 720})
+        self.window_sizes = dict(window_sizes)
+        self.channels = {key: ChannelStats(self.window_sizes) for key in keys}
+
+    def add(self, env_values):
+        for key, value in env_values.items():
+            channel = self.channels.get(key)
+            if channel is None:
+                channel = self.channels[key] = ChannelStats(self.window_sizes)
+            channel.add(value)
+
+    def averages(self, window):
+        return {key: channel.windows[window].average() for key, channel in self.channels.items()}
+
+    def summary(self, window):
+        return {key: channel.windows[window].summary() for key, channel in self.channels.items()}
@@ -0,0 +1,107 @@
+import asyncio
+import inspect
+import math
+import random
+
+from dummysensor import DummySensor
+
+# asyncio 기반 주기 샘플러
+# tick k는 항상 '시작 시각 + k * interval' (이벤트 루프의 monotonic 시계)에 시작하므로
+# 처리 시간이 쌓여 주기가 밀리지 않는다
+# tick마다 모든 센서를 동시에 읽고, 다음 tick 전까지 값을 주지 못한 센서는 deadline miss로 보고한다
+# (느린 센서는 끝날 때까지 다시 읽지 않으며 다른 센서를 기다리게 하지 않는다)
+
+class SamplerStats:
+    def __init__(self):
+        self.ticks = 0
+        self.readings = 0
+        self.missed_deadlines = 0 # tick 안에 값을 주지 못한 센서 수 (누적)
+        self.skipped_ticks = 0    # 처리가 늦어 아예 건너뛴 tick 수
+        self.max_lateness = 0.0   # tick 예정 시각보다 늦게 깨어난 최대 시간 (초)
+        self.total_lateness = 0.0
+
+    def mean_lateness(self):
+        return self.total_lateness / self.ticks if self.ticks else 0.0
+
+    def __repr__(self):
+        return (f'ticks={self.ticks} readings={self.readings} missed={self.missed_deadlines} '
+                f'skipped={self.skipped_ticks} lateness mean={self.mean_lateness() * 1000:.2f}ms '
+                f'max={self.max_lateness * 1000:.2f}ms')
+
+class SimulatedSensor(DummySensor):
+    # 읽을 때마다 latency초(±jitter) 걸리는 비동기 센서
+    def __init__(self, latency=0.0, jitter=0.0, seed=None):
+        super().__init__(seed)
+        self.latency = latency
+        self.jitter = jitter
+
+    async def read(self):
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.set_env()
+        return dict(self.env_values)
+
+async def read_sensor(sensor):
+    # read()가 코루틴이면 await, 아니면 get_env()를 바로 호출 (DummySensor)
+    read = getattr(sensor, 'read', None)
+    if read is not None and inspect.iscoroutinefunction(read):
+        return await read()
+    sensor.set_env()
+    return dict(sensor.get_env())
+
+class AsyncSampler:
+    def __init__(self, sensors, interval, on_sample, on_missed=None):
+        # sensors: {이름: 센서}, on_sample(tick, {이름: 값}), on_missed(tick, [이름])
+        self.sensors = sensors
+        self.interval = interval
+        self.on_sample = on_sample
+        self.on_missed = on_missed
+        self.stats = SamplerStats()
+
+    async def run(self, ticks=None):
+        # ticks번(None이면 취소될 때까지) 샘플링
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending = {} # 이름 -> 아직 끝나지 않은 읽기 task
+        tick = 0
+        try:
+            while ticks is None or tick < ticks:
+                lateness = loop.time() - (start + tick * self.interval)
+                self.stats.ticks += 1
+                self.stats.total_lateness += lateness
+                self.stats.max_lateness = max(self.stats.max_lateness, lateness)
+
+                for name, sensor in self.sensors.items():
+                    if name not in pending:
+                        pending[name] = asyncio.ensure_future(read_sensor(sensor))
+                deadline = start + (tick + 1) * self.interval
+                if pending:
+                    await asyncio.wait(pending.values(), timeout=max(deadline - loop.time(), 0))
+
+                values = {}
+                for name, task in list(pending.items()):
+                    if task.done():
+                        del pending[name]
+                        values[name] = task.result()
+                self.stats.readings += len(values)
+                self.on_sample(tick, values)
+                if pending:
+                    self.stats.missed_deadlines += len(pending)
+                    if self.on_missed is not None:
+                        self.on_missed(tick, list(pending))
+
+                # 다음 tick 시각까지 대기 (조금 늦었으면 바로 시작하고, 한 주기 이상 지난 tick은 건너뛴다)
+                next_tick = max(tick + 1, math.floor((loop.time() - start) / self.interval))
+                self.stats.skipped_ticks += next_tick - tick - 1
+                tick = next_tick
+                if ticks is not None and tick >= ticks:
+                    break
+                await asyncio.sleep(max(start + tick * self.interval - loop.time(), 0))
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+def make_sensors(count, latency=0.0, jitter=0.0, seed=None):
+    rng = random.Random(seed)
+    return {f'sensor-{i:02d}': SimulatedSensor(latency, jitter, rng.random()) for i in range(count)}
@@ -0,0 +1,231 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import time
+
+# 해상도별 센서 값 저장소
+#   raw  최근 1시간의 측정값 원형 버퍼 (측정 시각 + 채널 값, 슬롯 수 = 1시간 동안의 측정 수)
+#   1m / 1h / 1d  구간(bucket)마다 채널별 개수/최소/최대/합계 (평균 = 합계/개수)
+# tier마다 슬롯 수가 고정된 파일 하나를 mmap으로 열어 두고, 측정값이 들어올 때마다
+# 해당 구간 슬롯을 바로 갱신한다 (bucket 번호 % 슬롯 수 위치, 오래된 구간은 덮어씀)
+# 범위 질의는 요청한 해상도를 만족하면서 범위를 모두 담고 있는 가장 성긴 tier 하나만 읽는다
+SENSOR_KEYS = (
+    'mars_base_internal_temperature',
+    'mars_base_external_temperature',
+    'mars_base_internal_humidity',
+    'mars_base_external_illuminance',
+    'mars_base_internal_co2',
+    'mars_base_internal_oxygen',
+)
+TIER_MAGIC = b'MTELTIR1'
+HEADER_STRUCT = struct.Struct('<8sIII') # magic, 해상도(초, raw는 0), 슬롯 수, 채널 수
+RAW_SECONDS = 3600                      # raw tier가 담는 시간 (초)
+RAW_CAPACITY = 720                      # 새 저장소의 기본 슬롯 수 (5초 주기, 센서 1개로 1시간)
+# (이름, 해상도(초), 슬롯 수)
+ROLLUP_TIERS = (
+    ('1m', 60, 7 * 24 * 60),  # 1주
+    ('1h', 3600, 366 * 24),   # 1년
+    ('1d', 86400, 3660),      # 10년
+)
+QUERY_POINTS = 1000 # 해상도를 주지 않으면 범위를 이 개수로 나눈 간격을 요청한 해상도로 본다
+
+def get_raw_capacity(interval, readings_per_cycle=1):
+    # RAW_SECONDS 동안의 측정 수 (한 주기에 센서 여러 개를 읽으면 그만큼 곱한다)
+    return max(round(RAW_SECONDS / interval), 1) * readings_per_cycle
+
+def read_slot_count(path):
+    # 이미 있는 tier 파일의 슬롯 수 (없거나 형식이 다르면 None)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_STRUCT.size)
+    if len(header) != HEADER_STRUCT.size or header[:len(TIER_MAGIC)] != TIER_MAGIC:
+        return None
+    return HEADER_STRUCT.unpack(header)[2]
+
+class TierFile:
+    # 고정 크기 슬롯 파일 (슬롯 맨 앞 q는 '구간 번호 + 1', 0이면 빈 슬롯)
+    def __init__(self, path, resolution, slots, channel_count, record_struct):
+        self.path = path
+        self.resolution = resolution
+        self.slots = slots
+        self.record = record_struct
+        size = HEADER_STRUCT.size + slots * record_struct.size
+        header = HEADER_STRUCT.pack(TIER_MAGIC, resolution, slots, channel_count)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(header)
+                f.truncate(size)
+        self.file = open(path, 'r+b')
+        if os.path.getsize(path) != size or self.file.read(HEADER_STRUCT.size) != header:
+            self.file.close()
+            raise ValueError(f'저장소 파일의 형식이 맞지 않습니다: {path}')
+        self.mmap = mmap.mmap(self.file.fileno(), size)
+
+    def read(self, slot):
+        return self.record.unpack_from(self.mmap, HEADER_STRUCT.size + slot * self.record.size)
+
+    def write(self, slot, values):
+        self.record.pack_into(self.mmap, HEADER_STRUCT.size + slot * self.record.size, *values)
+
+    def close(self):
+        self.mmap.flush()
+        self.mmap.close()
+        self.file.close()
+
+class RollupTier:
+    def __init__(self, directory, name, resolution, slots, keys):
+        self.name = name
+        self.resolution = resolution
+        self.slots = slots
+        self.keys = keys
+        self.file = TierFile(os.path.join(directory, f'{name}.tier'), resolution, slots, len(keys),
+                             struct.Struct('<q' + 'Iddd' * len(keys)))
+        self.bucket = None # 지금 갱신 중인 구간 번호와 값 (디스크와 같은 내용)
+        self.values = None
+        self.latest_bucket = max((self.file.read(slot)[0] - 1 for slot in range(slots)), default=-1)
+
+    def add(self, timestamp, env_values):
+        bucket = int(timestamp // self.resolution)
+        if bucket != self.bucket:
+            stored = list(self.file.read(bucket % self.slots))
+            if stored[0] != bucket + 1: # 빈 슬롯이거나 예전 구간
+                stored = [bucket + 1] + [0, math.inf, -math.inf, 0.0] * len(self.keys)
+            self.bucket, self.values = bucket, stored
+            self.latest_bucket = max(self.latest_bucket, bucket)
+        values = self.values
+        for i, key in enumerate(self.keys):
+            value = env_values.get(key)
+            if value is None:
+                continue
+            base = 1 + i * 4
+            values[base] += 1
+            if value < values[base + 1]:
+                values[base + 1] = value
+            if value > values[base + 2]:
+                values[base + 2] = value
+            values[base + 3] += value
+        self.file.write(bucket % self.slots, values)
+
+    def covers(self, start):
+        # start 시각의 구간이 아직 덮어써지지 않았는지
+        return self.latest_bucket >= 0 and start // self.resolution > self.latest_bucket - self.slots
+
+    def query(self, start, end):
+        # [start, end] 구간과 겹치는 bucket들을 (구간 시작 시각, {key: 요약}) 목록으로 반환
+        rows = []
+        for bucket in range(int(start // self.resolution), int(end // self.resolution) + 1):
+            stored = self.file.read(bucket % self.slots)
+            if stored[0] != bucket + 1:
+                continue
+            summary = {}
+            for i, key in enumerate(self.keys):
+                count, minimum, maximum, total = stored[1 + i * 4:5 + i * 4]
+                if count:
+                    summary[key] = {'count': count, 'min': minimum, 'max': maximum, 'mean': total / count}
+            rows.append((bucket * self.resolution, summary))
+        return rows
+
+class RawTier:
+    name = 'raw'
+    resolution = 0
+
+    def __init__(self, directory, capacity, keys):
+        # capacity가 None이면 기존 파일의 슬롯 수 (파일이 없으면 RAW_CAPACITY)
+        path = os.path.join(directory, 'raw.tier')
+        if capacity is None:
+            capacity = read_slot_count(path) or RAW_CAPACITY
+        self.keys = keys
+        self.slots = capacity
+        # 측정 순번 + 1, 측정 시각, 채널 값 (없는 값은 NaN)
+        self.file = TierFile(path, 0, capacity, len(keys),
+                             struct.Struct('<qd' + 'd' * len(keys)))
+        self.sequence = max(self.file.read(slot)[0] for slot in range(capacity)) # 다음 측정 순번
+
+    def add(self, timestamp, env_values):
+        values = [env_values.get(key, math.nan) for key in self.keys]
+        self.file.write(self.sequence % self.slots, [self.sequence + 1, timestamp] + values)
+        self.sequence += 1
+
+    def oldest_timestamp(self):
+        if self.sequence == 0:
+            return None
+        oldest = max(self.sequence - self.slots, 0)
+        return self.file.read(oldest % self.slots)[1]
+
+    def covers(self, start):
+        oldest = self.oldest_timestamp()
+        return oldest is not None and (start >= oldest or self.sequence <= self.slots)
+
+    def query(self, start, end):
+        rows = []
+        for sequence in range(max(self.sequence - self.slots, 0), self.sequence):
+            stored = self.file.read(sequence % self.slots)
+            if start <= stored[1] <= end:
+                rows.append((stored[1], {key: {'count': 1, 'min': value, 'max': value, 'mean': value}
+                                         for key, value in zip(self.keys, stored[2:]) if value == value}))
+        return rows
+
+class TelemetryStore:
+    def __init__(self, directory, keys=SENSOR_KEYS, raw_capacity=None):
+        # raw_capacity: raw tier 슬롯 수 (get_raw_capacity로 구함, None이면 기존 저장소를 그대로 연다)
+        os.makedirs(directory, exist_ok=True)
+        self.keys = tuple(keys)
+        self.tiers = [RawTier(directory, raw_capacity, self.keys)] # 촘촘한 것부터 성긴 순서
+        self.tiers += [RollupTier(directory, name, resolution, slots, self.keys)
+                       for name, resolution, slots in ROLLUP_TIERS]
+
+    def add(self, timestamp, env_values):
+        for tier in self.tiers:
+            tier.add(timestamp, env_values)
+
+    def choose_tier(self, start, end, resolution=None):
+        # 해상도가 resolution 이하인 tier 중 start까지 담고 있는 가장 성긴 tier
+        # 그런 tier가 없으면 범위를 담고 있는 가장 촘촘한 tier, 그것도 없으면 가장 성긴 tier
+        if resolution is None:
+            resolution = (end - start) / QUERY_POINTS
+        covering = [tier for tier in self.tiers if tier.covers(start)]
+        fine_enough = [tier for tier in covering if tier.resolution <= resolution]
+        if fine_enough:
+            return fine_enough[-1]
+        return covering[0] if covering else self.tiers[-1]
+
+    def query(self, start, end, resolution=None):
+        # (사용한 tier 이름, [(시각, {key: {'count', 'min', 'max', 'mean'}})])
+        tier = self.choose_tier(start, end, resolution)
+        return tier.name, tier.query(start, end)
+
+    def close(self):
+        for tier in self.tiers:
+            tier.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def parse_time(text):
+    return time.mktime(time.strptime(text, '%Y-%m-%d %H:%M:%S'))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='센서 값 저장소 범위 질의')
+    parser.add_argument('directory')
+    parser.add_argument('start', help="'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument('end', help="'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument('--resolution', type=float, default=None, help='원하는 최대 해상도(초)')
+    parser.add_argument('--key', default='mars_base_internal_temperature')
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        print(f'디렉터리를 찾을 수 없습니다: {args.directory}')
+        exit(1)
+    with TelemetryStore(args.directory) as store:
+        tier_name, rows = store.query(parse_time(args.start), parse_time(args.end), args.resolution)
+        print(f'>> {tier_name} tier, {len(rows)} rows')
+        for timestamp, summary in rows:
+            if args.key in summary:
+                value = summary[args.key]
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}  "
+                      f"min {value['min']:g}  max {value['max']:g}  mean {value['mean']:.2f}  ({value['count']})")
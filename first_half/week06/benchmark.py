@@ -0,0 +1,152 @@
+import argparse
+import http.client
+import subprocess
+import threading
+import time
+
+import psutil
+
+from load_sampler import LoadSampler
+from mars_mission_computer import MissionComputer
+from process_profiler import PROCESS_ATTRS, ProcessProfiler
+from metrics_server import MetricsExporter, MetricsServer, render_load
+
+def benchmark_load(duration, intervals, reads):
+    print('>> get load')
+    start = time.perf_counter()
+    psutil.cpu_percent(interval=1)
+    psutil.virtual_memory()
+    print(f'   cpu_percent(interval=1)   {(time.perf_counter() - start) * 1000:10.3f} ms per call')
+
+    with LoadSampler(interval=min(intervals)) as sampler:
+        sampler.get_latest(timeout=min(intervals) * 2)
+        start = time.perf_counter()
+        for _ in range(reads):
+            sampler.get_latest()
+        print(f'   LoadSampler.get_latest()  {(time.perf_counter() - start) / reads * 1000:10.6f} ms per call')
+
+    # 샘플러 스레드가 쓰는 CPU 시간 (목표 < 1%)
+    print(f'>> sampler overhead ({duration} s each)')
+    for interval in intervals:
+        with LoadSampler(interval=interval) as sampler:
+            time.sleep(duration)
+            overhead = sampler.overhead()
+            count = sampler.count
+        print(f'   interval {interval:5.2f} s   {count:5} samples   {overhead:6.3f}% CPU'
+              f'   ({sampler.cpu_time / max(count, 1) * 1000:.3f} ms per sample)')
+
+    with LoadSampler(interval=min(intervals)) as sampler:
+        time.sleep(duration)
+        start = time.perf_counter()
+        stats = sampler.percentiles(duration / 60)
+        print(f'>> percentiles over {sampler.count} samples   {(time.perf_counter() - start) * 1000:.3f} ms'
+              f'   cpu {stats.get("cpu_percent")}')
+
+def benchmark_info(calls):
+    # 매번 새 MissionComputer (설정 파일을 다시 읽고 모든 항목을 다시 조회) vs 캐시
+    print(f'>> get_mission_computer_info_json ({calls:,} calls)')
+    for name, get_computer in (('uncached', MissionComputer), ('cached', lambda computer=MissionComputer(): computer)):
+        start = time.perf_counter()
+        for _ in range(calls):
+            info = get_computer().get_mission_computer_info_json()
+        elapsed = time.perf_counter() - start
+        print(f'   {name:<9} {elapsed / calls * 1e6:10.2f} us per call   {len(info)} bytes')
+
+def benchmark_scrape(scrapes, clients=4):
+    # clients개 연결(keep-alive)이 나눠서 GET /metrics
+    exporter = MetricsExporter()
+    with LoadSampler(interval=0.1, on_sample=exporter.update_load) as sampler:
+        sampler.get_latest(timeout=1)
+        start = time.perf_counter()
+        for _ in range(1000):
+            render_load(sampler.latest)
+        print(f'>> render on every scrape would cost {(time.perf_counter() - start) / 1000 * 1000:.3f} ms per scrape')
+
+        server = MetricsServer(exporter, port=0)
+        server.start()
+        host, port = server.server_address
+
+        def scrape(count):
+            connection = http.client.HTTPConnection(host, port)
+            for _ in range(count):
+                connection.request('GET', '/metrics')
+                response = connection.getresponse()
+                response.read()
+            connection.close()
+
+        threads = [threading.Thread(target=scrape, args=(scrapes // clients,)) for _ in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        server.stop()
+    done = scrapes // clients * clients
+    print(f'>> {done:,} scrapes over {clients} connections   {elapsed:.2f} s   {done / elapsed:10,.0f} scrapes/s'
+          f'   ({len(exporter.response):,} bytes, {exporter.updates} updates)')
+
+def benchmark_profiler(extra_processes, samples=5, duration=30):
+    # 잠자는 프로세스 extra_processes개를 더 띄워 두고 샘플 한 번의 비용을 잰다
+    children = [subprocess.Popen(['sleep', '120']) for _ in range(extra_processes)]
+    try:
+        def per_method():
+            # 비교용: 프로세스마다 Process 객체를 만들고 항목을 따로 조회 (oneshot 없이 파일을 여러 번 읽음)
+            rows = []
+            for pid in psutil.pids():
+                try:
+                    process = psutil.Process(pid)
+                    rows.append((process.pid, process.name(), process.create_time(), process.cpu_times(),
+                                 process.memory_info()))
+                except psutil.Error:
+                    pass
+            return rows
+
+        def process_iter():
+            return [process.info for process in psutil.process_iter(PROCESS_ATTRS, ad_value=None)]
+
+        profiler = ProcessProfiler(top=10)
+        profiler.sample()
+        print(f'>> process profiling ({profiler.process_count:,} processes, {samples} samples each)')
+        for name, func in (('Process() per pid', per_method), ('process_iter(attrs)', process_iter),
+                           ('ProcessProfiler', profiler.sample)):
+            start_cpu = time.thread_time()
+            start = time.perf_counter()
+            for _ in range(samples):
+                func()
+            elapsed = (time.perf_counter() - start) / samples
+            cpu = (time.thread_time() - start_cpu) / samples
+            print(f'   {name:<20} {elapsed * 1000:8.1f} ms per sample   {cpu * 1000:8.1f} ms CPU'
+                  f'   = {cpu / profiler.interval * 100:5.2f}% CPU at {profiler.interval:g} s interval')
+
+        # 백그라운드로 돌리면 샘플 비용에 맞춰 interval이 늘어나 CPU 사용이 max_overhead 근처로 유지된다
+        with ProcessProfiler(interval=profiler.interval, top=10) as background:
+            time.sleep(duration)
+        print(f'   background {duration:g} s   {background.samples} samples   interval -> {background.interval:.1f} s'
+              f'   {background.overhead():.2f}% CPU')
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MissionComputer 부하 샘플러 벤치마크')
+    parser.add_argument('--duration', type=float, default=10.0, help='간격마다 샘플러를 돌리는 시간(초)')
+    parser.add_argument('--intervals', type=float, nargs='+', default=[1.0, 0.1])
+    parser.add_argument('--reads', type=int, default=100000)
+    parser.add_argument('--info', type=int, default=None, metavar='CALLS',
+                        help='부하 대신 시스템 정보 캐시를 측정 (예: 10000)')
+    parser.add_argument('--scrape', type=int, default=None, metavar='REQUESTS',
+                        help='메트릭 엔드포인트 처리량을 측정 (예: 20000)')
+    parser.add_argument('--profile', type=int, default=None, metavar='PROCESSES',
+                        help='잠자는 프로세스를 PROCESSES개 더 띄우고 프로세스 프로파일러 비용을 측정 (예: 2000)')
+    args = parser.parse_args()
+    if args.profile is not None:
+        benchmark_profiler(args.profile)
+    elif args.scrape:
+        benchmark_scrape(args.scrape)
+    elif args.info:
+        benchmark_info(args.info)
+    else:
+        benchmark_load(args.duration, args.intervals, args.reads)
@@ -0,0 +1,135 @@
+import math
+import threading
+import time
+
+import psutil
+
+# 백그라운드 시스템 부하 샘플러
+# 스레드 하나가 interval마다 CPU(코어별)/메모리/디스크/네트워크 값을 읽어 원형 버퍼에 넣는다
+# CPU 사용률은 직전 측정 이후의 값(psutil.cpu_percent(interval=None))이라 기다리지 않고,
+# 디스크/네트워크는 누적 카운터의 차이를 초당 바이트로 바꿔 저장한다
+# 최신 스냅샷은 참조 하나로 바꿔 끼우므로 읽는 쪽은 락 없이 바로 가져간다
+DEFAULT_INTERVAL = 1.0     # 초
+DEFAULT_HISTORY = 15 * 60  # 원형 버퍼에 유지하는 시간 (초)
+PERCENTILES = (50, 90, 99)
+METRICS = ('cpu_percent', 'mem_percent', 'disk_read_rate', 'disk_write_rate', 'net_sent_rate', 'net_recv_rate')
+
+class LoadSnapshot:
+    __slots__ = ('timestamp', 'cpu_percent', 'per_cpu', 'mem_percent', 'mem_used',
+                 'disk_read_rate', 'disk_write_rate', 'net_sent_rate', 'net_recv_rate')
+
+    def __init__(self, timestamp, per_cpu, memory, disk_rates, net_rates):
+        self.timestamp = timestamp
+        self.per_cpu = per_cpu
+        self.cpu_percent = sum(per_cpu) / len(per_cpu) if per_cpu else math.nan
+        self.mem_percent = memory.percent
+        self.mem_used = memory.used
+        self.disk_read_rate, self.disk_write_rate = disk_rates # 초당 바이트 (카운터가 없으면 NaN)
+        self.net_sent_rate, self.net_recv_rate = net_rates
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+def counter_rates(previous, current, elapsed, read_name, write_name):
+    if previous is None or current is None or elapsed <= 0:
+        return math.nan, math.nan
+    return ((getattr(current, read_name) - getattr(previous, read_name)) / elapsed,
+            (getattr(current, write_name) - getattr(previous, write_name)) / elapsed)
+
+def read_disk_counters():
+    try:
+        return psutil.disk_io_counters()
+    except (RuntimeError, OSError): # 디스크 통계를 주지 않는 환경 (컨테이너 등)
+        return None
+
+class LoadSampler(threading.Thread):
+    def __init__(self, interval=DEFAULT_INTERVAL, history=DEFAULT_HISTORY, on_sample=None):
+        super().__init__(name='load-sampler', daemon=True)
+        self.interval = interval
+        self.on_sample = on_sample # 스냅샷마다 샘플러 스레드에서 호출 on_sample(snapshot)
+        self.capacity = max(int(history / interval), 1)
+        self.buffer = [None] * self.capacity
+        self.count = 0         # 지금까지 넣은 스냅샷 수
+        self.latest = None     # 가장 최근 스냅샷
+        self.cpu_time = 0.0    # 샘플링에 쓴 CPU 시간 (초, 이 스레드만)
+        self.started_at = None
+        self.stop_event = threading.Event()
+        self.first_sample = threading.Event()
+
+    def run(self):
+        # 첫 호출은 기준값만 잡는다 (cpu_percent는 직전 호출 이후의 사용률)
+        begin = time.thread_time()
+        psutil.cpu_percent(percpu=True)
+        disk, net = read_disk_counters(), psutil.net_io_counters()
+        last = time.monotonic()
+        self.started_at = last
+        self.cpu_time += time.thread_time() - begin
+
+        tick = 0
+        while True:
+            # 예정 시각 = 시작 + k * interval (샘플링 시간만큼 주기가 밀리지 않음)
+            tick = max(tick + 1, math.floor((time.monotonic() - self.started_at) / self.interval))
+            if self.stop_event.wait(max(self.started_at + tick * self.interval - time.monotonic(), 0)):
+                break
+            begin = time.thread_time()
+            now = time.monotonic()
+            per_cpu = tuple(psutil.cpu_percent(percpu=True))
+            memory = psutil.virtual_memory()
+            new_disk, new_net = read_disk_counters(), psutil.net_io_counters()
+            elapsed = now - last
+            snapshot = LoadSnapshot(time.time(), per_cpu, memory,
+                                    counter_rates(disk, new_disk, elapsed, 'read_bytes', 'write_bytes'),
+                                    counter_rates(net, new_net, elapsed, 'bytes_sent', 'bytes_recv'))
+            disk, net, last = new_disk, new_net, now
+            self.buffer[self.count % self.capacity] = snapshot
+            self.count += 1
+            self.latest = snapshot
+            self.first_sample.set()
+            if self.on_sample is not None:
+                self.on_sample(snapshot)
+            self.cpu_time += time.thread_time() - begin
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def get_latest(self, timeout=None):
+        # 최신 스냅샷 (아직 없으면 첫 샘플을 timeout초까지 기다린다, 그래도 없으면 None)
+        if self.latest is None and timeout:
+            self.first_sample.wait(timeout)
+        return self.latest
+
+    def snapshots(self, seconds=None):
+        # 최근 seconds초(None이면 버퍼 전체)의 스냅샷, 오래된 것부터
+        count, capacity, buffer = self.count, self.capacity, self.buffer
+        items = [buffer[i % capacity] for i in range(max(count - capacity, 0), count)]
+        if seconds is not None:
+            since = time.time() - seconds
+            items = [snapshot for snapshot in items if snapshot.timestamp >= since]
+        return items
+
+    def percentiles(self, minutes, metrics=METRICS, percents=PERCENTILES):
+        # {metric: {'p50': 값, ...}} (최근 minutes분, 샘플이 없거나 값이 NaN뿐이면 빈 dict)
+        items = self.snapshots(minutes * 60)
+        result = {}
+        for metric in metrics:
+            values = sorted(value for value in (getattr(snapshot, metric) for snapshot in items) if value == value)
+            if values:
+                result[metric] = {f'p{percent}': values[min(int(len(values) * percent / 100), len(values) - 1)]
+                                  for percent in percents}
+        return result
+
+    def overhead(self):
+        # 샘플링 스레드가 쓴 CPU 시간 / 경과 시간 (%, 코어 하나 기준)
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.cpu_time / elapsed * 100 if elapsed > 0 else 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -1,5 +1,12 @@
+import argparse
+import json
+import os
 import platform
 import psutil
+import time
+
+from load_sampler import LoadSampler
+from process_profiler import DEFAULT_TOP, ProcessProfiler
 
 SETTINGS_FILE_NAME = 'setting.txt'
 NOT_AVAILABLE = 'N/A'
@@ -10,39 +17,78 @@ SYS_CPU_CORES = 'cpu_cores'
 SYS_MEM_SIZE = 'mem_size'
 ERR_MSG_COMPUTER_INFO = 'Error: failed to load computer info.'
 ERR_MSG_COMPUTER_LOAD = 'Error: failed to load computer load info.'
+LOAD_PERCENTILE_MINUTES = 5
+ALL_INFO_KEYS = [SYS_OS, SYS_OS_VERSION, SYS_CPU_TYPE, SYS_CPU_CORES, SYS_MEM_SIZE]
+# 항목별로 값을 구하는 함수 (프로세스가 살아 있는 동안 바뀌지 않으므로 처음 요청될 때 한 번만 호출)
+INFO_PROBES = {
+    SYS_OS: platform.system,
+    SYS_OS_VERSION: platform.version,
+    SYS_CPU_TYPE: platform.processor,
+    SYS_CPU_CORES: lambda: psutil.cpu_count() if psutil else NOT_AVAILABLE,
+    SYS_MEM_SIZE: lambda: f"{round(psutil.virtual_memory().total / (1024**3), 2)} GB" if psutil else NOT_AVAILABLE,
+}
 
 class MissionComputer:
+    def __init__(self, sampler=None, profiler=None):
+        # 백그라운드 부하 샘플러 (LoadSampler, 없으면 부하를 물을 때마다 1초 동안 측정)
+        self.sampler = sampler
+        # 프로세스별 자원 사용 프로파일러 (ProcessProfiler, 프로파일링 모드에서만)
+        self.profiler = profiler
+        # 시스템 정보 캐시
+        self.settings_stamp = None # setting.txt (수정 시각, 크기) (파일이 바뀔 때만 다시 읽음)
+        self.setting_keys = None
+        self.info_values = {}      # 한 번 구한 항목 값
+        self.info_json = None      # (항목 목록, JSON 문자열)
+
     def read_settings(self):
+        try:
+            stat = os.stat(SETTINGS_FILE_NAME)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if self.setting_keys is not None and stamp == self.settings_stamp:
+            return self.setting_keys
         try:
             with open(SETTINGS_FILE_NAME, 'r', encoding='utf-8') as f:
                 keys = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-                return keys
         except FileNotFoundError:
             # 파일이 없으면 전체 항목 반환
-            return [SYS_OS, SYS_OS_VERSION, SYS_CPU_TYPE, SYS_CPU_CORES, SYS_MEM_SIZE]
+            keys = list(ALL_INFO_KEYS)
+        self.settings_stamp, self.setting_keys = stamp, keys
+        return keys
+
+    def get_mission_computer_info_json(self):
+        # 설정 파일에 정의된 항목만 JSON 문자열로 (항목 목록이 같으면 만들어 둔 문자열을 그대로 반환)
+        setting_keys = tuple(self.read_settings())
+        if self.info_json is not None and self.info_json[0] == setting_keys:
+            return self.info_json[1]
+        filtered_info = {}
+        for key in setting_keys:
+            if key not in INFO_PROBES:
+                continue
+            if key not in self.info_values:
+                self.info_values[key] = INFO_PROBES[key]()
+            filtered_info[key] = self.info_values[key]
+        info_json = json.dumps(filtered_info, ensure_ascii=False)
+        self.info_json = (setting_keys, info_json)
+        return info_json
 
     def get_mission_computer_info(self):
-        setting_keys = self.read_settings()
         try:
-            data = {
-                SYS_OS: platform.system(),
-                SYS_OS_VERSION: platform.version(),
-                SYS_CPU_TYPE: platform.processor(),
-                SYS_CPU_CORES: psutil.cpu_count() if psutil else NOT_AVAILABLE,
-                SYS_MEM_SIZE: f"{round(psutil.virtual_memory().total / (1024**3), 2)} GB" if psutil else NOT_AVAILABLE
-            }
-
-            # 설정 파일에 정의된 키만 필터링
-            filtered_info = { key: data[key] for key in setting_keys if key in data }
-            
-            print(str(filtered_info).replace("'", '"'))
+            print(self.get_mission_computer_info_json())
         except Exception as e:
             print(ERR_MSG_COMPUTER_INFO)
 
     def get_mission_computer_load(self):
         try:
-            cpu_usage = psutil.cpu_percent(interval=1) if psutil else NOT_AVAILABLE
-            mem_usage = psutil.virtual_memory().percent if psutil else NOT_AVAILABLE
+            snapshot = self.sampler.get_latest(timeout=self.sampler.interval * 2) if self.sampler else None
+            if snapshot is not None:
+                # 샘플러의 최신 스냅샷을 바로 사용 (기다리지 않음)
+                cpu_usage = round(snapshot.cpu_percent, 1)
+                mem_usage = snapshot.mem_percent
+            else:
+                cpu_usage = psutil.cpu_percent(interval=1) if psutil else NOT_AVAILABLE
+                mem_usage = psutil.virtual_memory().percent if psutil else NOT_AVAILABLE
 
             # 정수나 실수라면 % 기호 추가
             if isinstance(cpu_usage, (int, float)):
@@ -59,7 +105,58 @@ class MissionComputer:
         except Exception as e:
             print(ERR_MSG_COMPUTER_LOAD)
 
+    def get_mission_computer_load_percentiles(self, minutes=LOAD_PERCENTILE_MINUTES):
+        # 최근 minutes분 동안의 부하 백분위 (샘플러가 있을 때만)
+        try:
+            if not self.sampler:
+                print(ERR_MSG_COMPUTER_LOAD)
+                return
+            load_stats = {metric: {name: round(value, 2) for name, value in values.items()}
+                          for metric, values in self.sampler.percentiles(minutes).items()}
+            print(str(load_stats).replace("'", '"'))
+        except Exception as e:
+            print(ERR_MSG_COMPUTER_LOAD)
+
+    def get_mission_computer_processes(self):
+        # 프로파일러의 최근 샘플에서 CPU/RSS 상위 프로세스
+        try:
+            latest = self.profiler.latest if self.profiler else None
+            if latest is None:
+                print(ERR_MSG_COMPUTER_LOAD)
+                return
+            print(json.dumps([sample.to_dict() for sample in latest[1]], ensure_ascii=False))
+        except Exception as e:
+            print(ERR_MSG_COMPUTER_LOAD)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 정보/부하')
+    parser.add_argument('--profile', type=float, default=None, metavar='SECONDS',
+                        help='SECONDS 동안 프로세스별 자원 사용을 주기적으로 기록 (프로파일링 모드)')
+    parser.add_argument('--profile-interval', type=float, default=2.0, help='프로파일링 주기(초)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='CPU/RSS 상위 몇 개 프로세스를 남길지')
+    parser.add_argument('--timeline', default=None, metavar='FILE',
+                        help='프로파일링 결과를 FILE에 기록 (process_profiler.py FILE로 재생)')
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    runComputer = MissionComputer()
-    runComputer.get_mission_computer_info()
-    runComputer.get_mission_computer_load()
+    args = parse_args()
+    sampler = LoadSampler()
+    sampler.start()
+    if args.profile:
+        profiler = ProcessProfiler(args.profile_interval, args.top, args.timeline,
+                                   on_sample=lambda timestamp, samples: runComputer.get_mission_computer_processes())
+        runComputer = MissionComputer(sampler, profiler)
+        profiler.start()
+        try:
+            time.sleep(args.profile)
+        except KeyboardInterrupt: # Ctrl+C로 종료 시
+            print('System stopped....')
+        profiler.stop()
+        print(f'>> profiler: {profiler.samples} samples of {profiler.process_count} processes, '
+              f'{profiler.overhead():.2f}% CPU')
+    else:
+        runComputer = MissionComputer(sampler)
+        runComputer.get_mission_computer_info()
+        runComputer.get_mission_computer_load()
+        runComputer.get_mission_computer_load_percentiles()
+    sampler.stop()
@@ -0,0 +1,170 @@
+import argparse
+import importlib.util
+import math
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from load_sampler import LoadSampler
+
+# Prometheus 텍스트 형식(0.0.4) 메트릭 엔드포인트
+# 부하 샘플러/센서 집계가 갱신될 때마다 HTTP 응답 전체(상태 줄 + 헤더 + 본문)를 미리 bytes로 만들어 두고,
+# GET /metrics는 그 bytes를 그대로 쓰기만 한다 (요청마다 문자열을 만들지 않음)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9100
+METRICS_PATH = '/metrics'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+WEEK05_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'week05')
+SENSOR_STATS = ('mean', 'min', 'max', 'stdev')
+LABEL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+NOT_FOUND_RESPONSE = (b'HTTP/1.1 404 Not Found\r\nContent-Type: text/plain; charset=utf-8\r\n'
+                      b'Content-Length: 10\r\n\r\nnot found\n')
+
+def format_value(value):
+    if value != value:
+        return 'NaN'
+    if value in (math.inf, -math.inf):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+def format_labels(labels):
+    # {"key": "value"} -> {key="value"} (역슬래시/따옴표/줄바꿈 이스케이프)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{str(value).translate(LABEL_ESCAPES)}"' for name, value in labels.items()) + '}'
+
+def render_metric(name, help_text, samples, metric_type='gauge'):
+    # samples: [(labels, 값)]
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    lines += [f'{name}{format_labels(labels)} {format_value(value)}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
+
+def render_load(snapshot):
+    return ''.join((
+        render_metric('mars_cpu_usage_percent', 'CPU usage of all cores (%)', [({}, snapshot.cpu_percent)]),
+        render_metric('mars_cpu_core_usage_percent', 'CPU usage per core (%)',
+                      [({'core': core}, value) for core, value in enumerate(snapshot.per_cpu)]),
+        render_metric('mars_memory_usage_percent', 'Memory usage (%)', [({}, snapshot.mem_percent)]),
+        render_metric('mars_memory_used_bytes', 'Memory used (bytes)', [({}, snapshot.mem_used)]),
+        render_metric('mars_disk_bytes_per_second', 'Disk I/O rate (bytes/s)',
+                      [({'direction': 'read'}, snapshot.disk_read_rate),
+                       ({'direction': 'write'}, snapshot.disk_write_rate)]),
+        render_metric('mars_network_bytes_per_second', 'Network I/O rate (bytes/s)',
+                      [({'direction': 'sent'}, snapshot.net_sent_rate),
+                       ({'direction': 'recv'}, snapshot.net_recv_rate)]),
+        render_metric('mars_load_sample_timestamp_seconds', 'Time of the latest load sample (unix)',
+                      [({}, snapshot.timestamp)]),
+    ))
+
+def render_sensors(summaries):
+    # summaries: {윈도우 이름: {센서 key: {'count', 'mean', 'min', 'max', 'stdev'}}} (week05 MissionComputer.get_summaries 결과)
+    parts = [render_metric('mars_sensor_samples', 'Mission computer sensor samples in the sliding window',
+                           [({'sensor': key, 'window': window}, summary['count'])
+                            for window, by_key in summaries.items() for key, summary in by_key.items()])]
+    for stat in SENSOR_STATS:
+        parts.append(render_metric(f'mars_sensor_{stat}', f'Mission computer sensor {stat} over the sliding window',
+                                   [({'sensor': key, 'window': window}, summary[stat])
+                                    for window, by_key in summaries.items() for key, summary in by_key.items()]))
+    return ''.join(parts)
+
+class MetricsExporter:
+    def __init__(self):
+        self.sections = {'load': '', 'sensors': ''}
+        self.lock = threading.Lock() # 갱신하는 스레드끼리만 (읽는 쪽은 self.response 참조 하나만 본다)
+        self.updates = 0
+        self.response = self.render()
+
+    def render(self):
+        body = ''.join(self.sections.values()).encode('utf-8')
+        header = (f'HTTP/1.1 200 OK\r\nContent-Type: {CONTENT_TYPE}\r\n'
+                  f'Content-Length: {len(body)}\r\n\r\n').encode('ascii')
+        return header + body
+
+    def update(self, section, text):
+        with self.lock:
+            self.sections[section] = text
+            self.updates += 1
+            self.response = self.render()
+
+    def update_load(self, snapshot):
+        self.update('load', render_load(snapshot))
+
+    def update_sensors(self, summaries):
+        self.update('sensors', render_sensors(summaries))
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive (스크레이퍼가 연결을 재사용)
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] == METRICS_PATH:
+            self.wfile.write(self.server.exporter.response)
+        else:
+            self.wfile.write(NOT_FOUND_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass # 요청마다 stderr에 쓰지 않음
+
+class MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, exporter, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), MetricsHandler)
+        self.exporter = exporter
+
+    def start(self):
+        # 별도 스레드에서 요청 처리 (server_address로 실제 포트 확인, port=0이면 빈 포트)
+        thread = threading.Thread(target=self.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def load_week05_mission_computer():
+    # week05 mars_mission_computer.py를 다른 이름으로 불러온다 (week06에도 같은 이름의 모듈이 있다)
+    # week05의 다른 모듈(sampler, rolling_stats 등)을 찾을 수 있도록 경로도 추가한다
+    if WEEK05_DIR not in sys.path:
+        sys.path.append(WEEK05_DIR)
+    spec = importlib.util.spec_from_file_location('week05_mission_computer',
+                                                  os.path.join(WEEK05_DIR, 'mars_mission_computer.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_sensor_feed(exporter, interval):
+    # week05 MissionComputer를 비동기 샘플러로 interval마다 돌리고 (모의 센서 1개),
+    # 주기가 끝날 때마다 그 슬라이딩 윈도우 집계를 그대로 내보낸다
+    week05 = load_week05_mission_computer()
+    computer = week05.MissionComputer(interval, echo=False,
+                                      on_cycle=lambda computer: exporter.update_sensors(computer.get_summaries()))
+    computer.get_sensor_data_async(week05.make_sensors(1), interval)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 메트릭 엔드포인트 (Prometheus 텍스트 형식)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--interval', type=float, default=1.0, help='부하 샘플링 주기(초)')
+    parser.add_argument('--sensors', type=float, default=None, metavar='INTERVAL',
+                        help='week05 MissionComputer를 INTERVAL초 주기로 돌려 그 슬라이딩 윈도우 집계도 내보냄')
+    args = parser.parse_args()
+    if args.sensors and not os.path.isdir(WEEK05_DIR):
+        print(f'디렉터리를 찾을 수 없습니다: {WEEK05_DIR}')
+        exit(1)
+
+    exporter = MetricsExporter()
+    sampler = LoadSampler(args.interval, on_sample=exporter.update_load)
+    server = MetricsServer(exporter, args.host, args.port)
+    sampler.start()
+    if args.sensors:
+        # 데몬 스레드라 서버가 끝나면 함께 종료된다
+        threading.Thread(target=run_sensor_feed, args=(exporter, args.sensors), daemon=True).start()
+    print(f'>> http://{server.server_address[0]}:{server.server_address[1]}{METRICS_PATH}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt: # Ctrl+C로 종료 시
+        print('System stopped....')
+    finally:
+        sampler.stop()
+        server.server_close()
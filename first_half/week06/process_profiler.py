@@ -0,0 +1,212 @@
+import argparse
+import heapq
+import os
+import struct
+import threading
+import time
+
+import psutil
+
+# 프로세스별 자원 사용 프로파일러
+# interval마다 psutil.process_iter(attrs=...)로 필요한 항목만 한 번에 읽고 (Linux에서는 프로세스마다
+# /proc/<pid>/stat, statm 두 파일), 직전 샘플과의 CPU 시간 차이로 CPU 사용률을, RSS 차이로 메모리 변화를 구한다
+# CPU 상위 top개와 RSS 상위 top개(합집합)만 남기고 타임라인 파일에 기록한다
+# 샘플 한 번에 쓴 CPU 시간(지수 이동 평균)이 interval의 max_overhead%를 넘으면 interval을 늘려 프로파일러가
+# 상위 소비자가 되지 않게 하고, 비용이 다시 줄면 처음 정한 interval로 돌아온다
+#
+# 타임라인 파일: magic 뒤에 레코드가 이어진다
+#   NAME  '<BIdH' (종류 2, pid, 생성 시각, 이름 길이) + 이름(utf-8)  pid가 처음 (또는 재사용되어) 나올 때 한 번
+#   FRAME '<BdH'  (종류 1, 측정 시각, 프로세스 수) + 프로세스마다 '<IfQq' (pid, CPU %, RSS, RSS 변화)
+TIMELINE_MAGIC = b'MPROCTL1'
+FRAME_HEADER = struct.Struct('<BdH')
+FRAME_ENTRY = struct.Struct('<IfQq')
+NAME_HEADER = struct.Struct('<BIdH')
+RECORD_FRAME = 1
+RECORD_NAME = 2
+PROCESS_ATTRS = ['pid', 'name', 'create_time', 'cpu_times', 'memory_info']
+DEFAULT_INTERVAL = 2.0  # 초
+DEFAULT_TOP = 10
+MAX_OVERHEAD = 1.0      # 샘플링에 쓸 수 있는 CPU 시간 (interval 대비 %)
+COST_SMOOTHING = 0.3    # 샘플 비용 지수 이동 평균에서 최근 샘플의 비중
+
+class ProcessSample:
+    __slots__ = ('pid', 'name', 'create_time', 'cpu_percent', 'rss', 'rss_delta')
+
+    def __init__(self, pid, name, create_time, cpu_percent, rss, rss_delta):
+        self.pid = pid
+        self.name = name
+        self.create_time = create_time
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+        self.rss_delta = rss_delta
+
+    def to_dict(self):
+        return {'pid': self.pid, 'name': self.name, 'cpu_percent': round(self.cpu_percent, 1),
+                'rss_mb': round(self.rss / 1024 ** 2, 1), 'rss_delta_kb': self.rss_delta // 1024}
+
+class TimelineWriter:
+    def __init__(self, file_path):
+        self.file = open(file_path, 'wb')
+        self.file.write(TIMELINE_MAGIC)
+        self.named = {} # pid -> 이름을 기록한 프로세스의 생성 시각
+
+    def write(self, timestamp, samples):
+        parts = []
+        for sample in samples:
+            if self.named.get(sample.pid) != sample.create_time:
+                name = sample.name.encode('utf-8')[:0xFFFF]
+                parts.append(NAME_HEADER.pack(RECORD_NAME, sample.pid, sample.create_time, len(name)) + name)
+                self.named[sample.pid] = sample.create_time
+        parts.append(FRAME_HEADER.pack(RECORD_FRAME, timestamp, len(samples)))
+        parts += [FRAME_ENTRY.pack(sample.pid, sample.cpu_percent, sample.rss, sample.rss_delta)
+                  for sample in samples]
+        self.file.write(b''.join(parts))
+        self.file.flush() # 도중에 멈춰도 그때까지의 타임라인은 재생할 수 있게
+
+    def close(self):
+        self.file.close()
+
+def read_timeline(file_path):
+    # (측정 시각, [ProcessSample]) 를 기록된 순서대로 (재생용)
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if data[:len(TIMELINE_MAGIC)] != TIMELINE_MAGIC:
+        raise ValueError(f'타임라인 파일 형식이 아닙니다: {file_path}')
+    names = {} # pid -> (생성 시각, 이름)
+    offset = len(TIMELINE_MAGIC)
+    while offset < len(data):
+        kind = data[offset]
+        if kind == RECORD_NAME:
+            _, pid, create_time, length = NAME_HEADER.unpack_from(data, offset)
+            offset += NAME_HEADER.size
+            names[pid] = (create_time, data[offset:offset + length].decode('utf-8', 'replace'))
+            offset += length
+        elif kind == RECORD_FRAME:
+            _, timestamp, count = FRAME_HEADER.unpack_from(data, offset)
+            offset += FRAME_HEADER.size
+            samples = []
+            for pid, cpu_percent, rss, rss_delta in FRAME_ENTRY.iter_unpack(
+                    data[offset:offset + count * FRAME_ENTRY.size]):
+                create_time, name = names.get(pid, (0.0, '?'))
+                samples.append(ProcessSample(pid, name, create_time, cpu_percent, rss, rss_delta))
+            offset += count * FRAME_ENTRY.size
+            yield timestamp, samples
+        else:
+            raise ValueError(f'타임라인 파일이 손상되었습니다: {file_path} (offset {offset})')
+
+class ProcessProfiler(threading.Thread):
+    def __init__(self, interval=DEFAULT_INTERVAL, top=DEFAULT_TOP, timeline_path=None,
+                 max_overhead=MAX_OVERHEAD, on_sample=None):
+        super().__init__(name='process-profiler', daemon=True)
+        self.base_interval = interval # 비용이 작을 때 쓰는 interval
+        self.interval = interval
+        self.top = top
+        self.max_overhead = max_overhead
+        self.on_sample = on_sample # 샘플마다 on_sample(timestamp, [ProcessSample])
+        self.timeline = TimelineWriter(timeline_path) if timeline_path else None
+        self.previous = {}       # pid -> (생성 시각, CPU 시간 합, RSS)
+        self.previous_time = None
+        self.latest = None       # (측정 시각, [ProcessSample])
+        self.samples = 0
+        self.process_count = 0
+        self.cpu_time = 0.0      # 샘플링에 쓴 CPU 시간 (초)
+        self.last_cost = 0.0     # 직전 샘플에 쓴 CPU 시간 (초)
+        self.smoothed_cost = None # 샘플 비용의 지수 이동 평균 (초)
+        self.started_at = None
+        self.stop_event = threading.Event()
+
+    def sample(self):
+        # 모든 프로세스를 한 번 읽고 상위 프로세스 목록을 반환 (첫 샘플은 기준값만 잡으므로 CPU %가 0)
+        begin = time.thread_time()
+        now = time.monotonic()
+        elapsed = now - self.previous_time if self.previous_time is not None else 0.0
+        previous = self.previous
+        current = {}
+        rows = []
+        for process in psutil.process_iter(PROCESS_ATTRS, ad_value=None):
+            info = process.info
+            cpu_times, memory = info['cpu_times'], info['memory_info']
+            if cpu_times is None or memory is None: # 권한이 없거나 그 사이 종료
+                continue
+            pid, create_time = info['pid'], info['create_time'] or 0.0
+            cpu_total = cpu_times.user + cpu_times.system
+            rss = memory.rss
+            current[pid] = (create_time, cpu_total, rss)
+            before = previous.get(pid)
+            if before is not None and before[0] == create_time and elapsed > 0:
+                cpu_percent = (cpu_total - before[1]) / elapsed * 100
+                rss_delta = rss - before[2]
+            else: # 새 프로세스 (또는 pid 재사용)
+                cpu_percent, rss_delta = 0.0, 0
+            rows.append((cpu_percent, rss, pid, info['name'] or '?', create_time, rss_delta))
+
+        top_rows = {row[2]: row for row in heapq.nlargest(self.top, rows)}
+        top_rows.update((row[2], row) for row in heapq.nlargest(self.top, rows, key=lambda row: row[1]))
+        samples = [ProcessSample(pid, name, create_time, cpu_percent, rss, rss_delta)
+                   for cpu_percent, rss, pid, name, create_time, rss_delta
+                   in sorted(top_rows.values(), reverse=True)]
+        self.previous, self.previous_time = current, now
+        self.process_count = len(rows)
+        self.samples += 1
+        timestamp = time.time()
+        self.latest = (timestamp, samples)
+        if self.timeline is not None and elapsed > 0: # 첫 샘플(기준값)은 기록하지 않음
+            self.timeline.write(timestamp, samples)
+        self.last_cost = time.thread_time() - begin
+        self.cpu_time += self.last_cost
+        return samples
+
+    def run(self):
+        self.started_at = time.monotonic()
+        next_time = self.started_at
+        while not self.stop_event.is_set():
+            samples = self.sample()
+            if self.on_sample is not None and self.samples > 1: # 첫 샘플은 기준값
+                self.on_sample(self.latest[0], samples)
+            # 평균 샘플 비용이 interval의 max_overhead%를 넘지 않도록 매번 base_interval에서 다시 구한다
+            if self.smoothed_cost is None:
+                self.smoothed_cost = self.last_cost
+            else:
+                self.smoothed_cost += COST_SMOOTHING * (self.last_cost - self.smoothed_cost)
+            self.interval = max(self.base_interval, self.smoothed_cost * 100 / self.max_overhead)
+            next_time = max(next_time + self.interval, time.monotonic())
+            if self.stop_event.wait(max(next_time - time.monotonic(), 0)):
+                break
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+        if self.timeline is not None:
+            self.timeline.close()
+
+    def overhead(self):
+        # 프로파일러가 쓴 CPU 시간 / 경과 시간 (%)
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.cpu_time / elapsed * 100 if elapsed > 0 else 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def print_frame(timestamp, samples):
+    print(f"===== {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))} =====")
+    for sample in samples:
+        print(f'{sample.pid:>7} {sample.name[:24]:<24} {sample.cpu_percent:6.1f}% '
+              f'{sample.rss / 1024 ** 2:9.1f} MB {sample.rss_delta / 1024:+10.0f} KB')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='프로세스별 자원 사용 타임라인 재생')
+    parser.add_argument('timeline')
+    parser.add_argument('--top', type=int, default=None, help='프레임마다 CPU 상위 몇 개만 출력')
+    args = parser.parse_args()
+    if not os.path.exists(args.timeline):
+        print(f'파일을 찾을 수 없습니다: {args.timeline}')
+        exit(1)
+    for timestamp, samples in read_timeline(args.timeline):
+        print_frame(timestamp, samples[:args.top] if args.top else samples)